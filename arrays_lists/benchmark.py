@@ -0,0 +1,58 @@
+# DynamicArrays Benchmark
+# Run from the repository root: python -m arrays_lists.benchmark
+import time
+import tracemalloc
+
+from arrays_lists.dynamic_arrays import DynamicArrays
+
+N = 1_000_000
+LOAD_N = 10_000_000
+
+
+# Append n float samples and return the memory (bytes) still held afterwards
+def measure_memory(typecode, n):
+    tracemalloc.start()
+    arr = DynamicArrays(typecode)
+    for item in range(n):
+        arr.append(item * 0.5)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del arr
+    return current
+
+
+# Memory: list storage vs typed storage
+print(f"# Memory for {N:,} float samples")
+untyped = measure_memory(None, N)
+typed = measure_memory("d", N)
+print(f"list storage:        {untyped / 1e6:8.1f} MB")
+print(f"typed storage ('d'): {typed / 1e6:8.1f} MB")
+print(f"reduction:           {untyped / typed:8.1f}x")
+
+
+# Load n items one append at a time, return (seconds, reallocations)
+def load_with_append(n):
+    arr = DynamicArrays()
+    resizes = 0
+    start = time.perf_counter()
+    for item in range(n):
+        if arr.length == arr.capacity:
+            resizes += 1
+        arr.append(item)
+    return time.perf_counter() - start, resizes
+
+
+# Load n items with a single extend call, return seconds
+def load_with_extend(n):
+    arr = DynamicArrays()
+    start = time.perf_counter()
+    arr.extend(range(n))
+    return time.perf_counter() - start
+
+
+# Load path: append loop vs bulk extend
+print(f"\n# Loading {LOAD_N:,} items")
+elapsed, resizes = load_with_append(LOAD_N)
+print(f"append loop: {elapsed:8.3f}s  ({resizes} reallocations)")
+elapsed = load_with_extend(LOAD_N)
+print(f"extend:      {elapsed:8.3f}s  (1 reallocation)")
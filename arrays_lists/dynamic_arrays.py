@@ -1,10 +1,34 @@
 # Dynamic Arrays
+import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Numeric array.array typecodes ("u" and "w" hold characters)
+_TYPECODES = frozenset(array.typecodes) - {"u", "w"}
+
+
 class DynamicArrays:
     # Initializes the dynamic array with a fixed starting capacity, zero length, and an underlying list.
-    def __init__(self):
+    # If a numeric typecode is given (e.g. "d", "i", "q"), storage is a typed array.array instead of a list.
+    # Typed storage keeps raw machine values (no boxed objects) and supports the buffer protocol.
+    # growth_factor: capacity multiplier when the array is full (default doubles).
+    # shrink_threshold: shrink when length drops to this fraction of capacity (default one quarter).
+    def __init__(self, typecode=None, growth_factor=2, shrink_threshold=0.25):
+        if typecode is not None and (not isinstance(typecode, str) or typecode not in _TYPECODES):
+            raise ValueError(f"Unsupported typecode: {typecode!r}")
+        if growth_factor <= 1:
+            raise ValueError("Growth factor must be greater than 1.")
+        if not 0 <= shrink_threshold < 1 / growth_factor:
+            raise ValueError("Shrink threshold must be between 0 and 1 / growth_factor.")
+        self.typecode = typecode
+        self.growth_factor = growth_factor
+        self.shrink_threshold = shrink_threshold
         self.capacity = 4
         self.length = 0
-        self.arr = [None] * self.capacity
+        self.arr = self._new_storage(self.capacity)
 
     # Returns the number of elements currently stored in the array.
     def __len__(self):
@@ -14,11 +38,144 @@ class DynamicArrays:
     def __str__(self):
         return f"Array: {self.arr}"
 
+    # Exposes the live [:length] region through the buffer protocol (Python 3.12+).
+    def __buffer__(self, flags):
+        return self.view()
+
+    # Returns the element at an index, or a new DynamicArrays for a slice.
+    # Negative indices count from the end, like a list.
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            result = DynamicArrays(self.typecode, self.growth_factor, self.shrink_threshold)
+            if step == 1:
+                result.extend(self.arr[start:max(start, stop)])
+            else:
+                result.extend(self.arr[:self.length][index])
+            return result
+        return self.access_element_by_index(self._normalize_index(index))
+
+    # Replaces the element at an index, or the elements covered by a slice.
+    # A plain slice may be replaced by any number of values (the array grows or shrinks),
+    # an extended slice (step != 1) needs exactly as many values as it covers.
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step == 1:
+                self._replace(start, max(start, stop), value)
+                return
+            positions = range(start, stop, step)
+            items = self._to_storage(value)
+            if len(items) != len(positions):
+                raise ValueError(f"Attempt to assign {len(items)} values to extended slice of size {len(positions)}.")
+            for position, item in zip(positions, items):
+                self.arr[position] = item
+            return
+        index = self._normalize_index(index)
+        if not 0 <= index < self.length:
+            raise IndexError("Index entered is out of bounds.")
+        self._check_value(value)
+        self.arr[index] = value
+
+    # Creates empty underlying storage of a given capacity.
+    # Lists are filled with None, typed arrays with zeros.
+    def _new_storage(self, capacity):
+        if self.typecode is None:
+            return [None] * capacity
+        return array.array(self.typecode, bytes(capacity * array.array(self.typecode).itemsize))
+
+    # Value written into slots that are no longer in use.
+    def _empty_value(self):
+        if self.typecode is None:
+            return None
+        return 0
+
+    # Raises TypeError/OverflowError if a value cannot be stored in typed mode.
+    # Checked before any resizing so a rejected value leaves the array unchanged.
+    def _check_value(self, element):
+        if self.typecode is not None:
+            array.array(self.typecode, (element,))
+
+    # Materializes an iterable in the same form as the underlying storage,
+    # so it can be slice-assigned (and is fully type-checked up front in typed mode).
+    def _to_storage(self, iterable):
+        if isinstance(iterable, DynamicArrays):
+            iterable = iterable.arr[:iterable.length]
+        if self.typecode is None:
+            return list(iterable)
+        return array.array(self.typecode, iterable)
+
+    # Converts a negative index into its positive equivalent.
+    def _normalize_index(self, index):
+        if index < 0:
+            return index + self.length
+        return index
+
+    # Smallest capacity reached by repeated growth that can hold a given number of elements.
+    def _grown_capacity(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity = max(capacity + 1, int(capacity * self.growth_factor))
+        return capacity
+
+    # Capacity reached by repeated shrinking for a given number of elements (never below 4).
+    def _shrunk_capacity(self, length):
+        capacity = self.capacity
+        while (length <= int(capacity * self.shrink_threshold)) and (capacity > 4):
+            capacity = max(4, int(capacity / self.growth_factor))
+        return capacity
+
+    # Replaces arr[start:stop] with the given values, shifting the tail with one slice move.
+    # Performs at most one reallocation (grow or shrink).
+    def _replace(self, start, stop, values):
+        items = self._to_storage(values)
+        new_length = self.length - (stop - start) + len(items)
+        end = start + len(items)
+        if new_length > self.capacity:
+            # Build the grown array directly: head, new items, tail
+            capacity = self._grown_capacity(new_length)
+            new_arr = self._new_storage(capacity)
+            new_arr[:start] = self.arr[:start]
+            new_arr[start:end] = items
+            new_arr[end:new_length] = self.arr[stop:self.length]
+            self.arr = new_arr
+            self.capacity = capacity
+            self.length = new_length
+            return
+        if end != stop:
+            self.arr[end:new_length] = self.arr[stop:self.length]
+        self.arr[start:end] = items
+        if new_length >= self.length:
+            self.length = new_length
+            return
+        # Only removals shrink, so appends into reserved capacity keep the reservation
+        self.arr[new_length:self.length] = self._new_storage(self.length - new_length)
+        self.length = new_length
+        capacity = self._shrunk_capacity(new_length)
+        if capacity != self.capacity:
+            self.capacity = capacity
+            self.arr = self.resize(capacity)
+
     # Reset current array to default values
     def reset(self):
         self.capacity = 4
         self.length = 0
-        self.arr = [None] * self.capacity
+        self.arr = self._new_storage(self.capacity)
+
+    # Returns a zero-copy memoryview of the live [:length] region.
+    # Only available in typed mode. The view refers to the current storage,
+    # so it goes stale once the array resizes; take a new view after growing or shrinking.
+    def view(self):
+        if self.typecode is None:
+            raise TypeError("view() requires a typed array (pass a typecode).")
+        return memoryview(self.arr)[:self.length]
+
+    # Returns a zero-copy NumPy array over the live [:length] region.
+    # Same staleness rule as view(). Requires NumPy.
+    def to_numpy(self):
+        if numpy is None:
+            raise ImportError("to_numpy() requires NumPy.")
+        return numpy.asarray(self.view())
 
     # Returns the element at a given index if it’s within bounds.
     def access_element_by_index(self, index):
@@ -29,22 +186,38 @@ class DynamicArrays:
 
     # Creates and returns a new underlying array with a specified capacity, copying existing elements.
     def resize(self, capacity):
-        new_arr = [None] * capacity
-        for i in range(self.length):
-            new_arr[i] = self.arr[i]
+        new_arr = self._new_storage(capacity)
+        new_arr[:self.length] = self.arr[:self.length]
         return new_arr
 
+    # Grows capacity to at least n in a single reallocation.
+    # Appends, extends and inserts keep the reserved capacity; removals may still shrink it.
+    def reserve(self, n):
+        if n > self.capacity:
+            self.arr = self.resize(n)
+            self.capacity = n
+
+    # Shrinks capacity down to the current length (never below 4).
+    def shrink_to_fit(self):
+        capacity = max(4, self.length)
+        if capacity != self.capacity:
+            self.arr = self.resize(capacity)
+            self.capacity = capacity
+
     # Adds an element to the end of the array, resizing if capacity is reached.
     def append(self, element):
+        self._check_value(element)
         if self.length == self.capacity:
-            self.capacity *= 2
-            new_arr = self.resize(self.capacity)
-            new_arr[self.length] = element
-            self.arr = new_arr
-        else:
-            self.arr[self.length] = element
+            self.capacity = self._grown_capacity(self.length + 1)
+            self.arr = self.resize(self.capacity)
+        self.arr[self.length] = element
         self.length += 1
 
+    # Adds every element of an iterable to the end of the array.
+    # Grows at most once, then copies the new elements in with one slice assignment.
+    def extend(self, iterable):
+        self._replace(self.length, self.length, iterable)
+
     # Removes and returns the last element, shrinking the array if usage drops too low.
     def pop(self):
         if self.length > 0:
@@ -52,29 +225,26 @@ class DynamicArrays:
             self.length -= 1
         else:
             raise IndexError("Array is empty, pop is not possible.")
-        if (self.length <= (self.capacity // 4)) and (self.capacity > 4):
-            self.capacity //= 2
-            new_arr = self.resize(self.capacity)
-            self.arr = new_arr
-        else:
-            self.arr[self.length] = None
+        self.arr[self.length] = self._empty_value()
+        capacity = self._shrunk_capacity(self.length)
+        if capacity != self.capacity:
+            self.capacity = capacity
+            self.arr = self.resize(self.capacity)
         return last_element
 
     # Inserts an element at a specific index, shifting elements right and resizing if needed.
     def insert_at_index(self, index, element):
         if 0 <= index <= self.length:
-            if self.length == self.capacity:
-                self.capacity *= 2
-                new_arr = self.resize(self.capacity)
-                for i in range(self.length, index, -1):
-                    new_arr[i] = new_arr[i - 1]
-                new_arr[index] = element
-                self.arr = new_arr
-            else:
-                for i in range(self.length, index, -1):
-                    self.arr[i] = self.arr[i - 1]
-                self.arr[index] = element
-            self.length += 1
+            self._check_value(element)
+            self._replace(index, index, (element,))
+        else:
+            raise IndexError("Index entered is out of bounds.")
+
+    # Inserts every element of an iterable starting at a specific index.
+    # Elements after the index are shifted right once, with at most one reallocation.
+    def insert_many(self, index, iterable):
+        if 0 <= index <= self.length:
+            self._replace(index, index, iterable)
         else:
             raise IndexError("Index entered is out of bounds.")
 
@@ -82,19 +252,14 @@ class DynamicArrays:
     def remove_at_index(self, index):
         if 0 <= index < self.length:
             value = self.arr[index]
-
-            # Shift elements LEFT inside the existing array
-            for i in range(index, self.length - 1):
-                self.arr[i] = self.arr[i + 1]
-
-            self.length -= 1
-            self.arr[self.length] = None
-
-            # Shrink if necessary
-            if (self.length <= (self.capacity // 4)) and (self.capacity > 4):
-                self.capacity //= 2
-                self.arr = self.resize(self.capacity)
-
+            self._replace(index, index + 1, ())
             return value
         else:
             raise IndexError("Index entered is out of bounds.")
+
+    # Removes the elements in [start, stop), shifting the tail left once and shrinking at most once.
+    def remove_range(self, start, stop):
+        if 0 <= start <= stop <= self.length:
+            self._replace(start, stop, ())
+        else:
+            raise IndexError("Range entered is out of bounds.")
@@ -0,0 +1,135 @@
+# Batched BFS
+# Hop distances from many start vertices at once, computed over the CSR form of a
+# Graph or DiGraph with NumPy array operations instead of one vertex at a time.
+#
+# Bit-parallel multi-source BFS: sources are processed in batches of up to 64.
+# Every vertex gets a 64-bit mask per batch, bit b meaning "reached from source b".
+#   frontier[v] > sources whose BFS reached v in the last step
+#   visited[v]  > sources whose BFS has reached v at all
+# One step for the whole batch is:
+#   next[v] = OR of frontier[u] over all neighbours u of v, minus visited[v]
+# which is a gather over the CSR indices followed by bitwise_or.reduceat per row.
+# For a DiGraph the rows are built from the incoming edges, since v is reached from u
+# only over an edge u > v.
+#
+# Batches can be spread over a ProcessPoolExecutor. The CSR arrays and the
+# result matrix live in shared memory, so workers neither copy the graph nor
+# pickle their results.
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from graphs.graph import CSRGraph, DiGraph, Graph
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BATCH_BITS = 64
+
+
+def bfs_many(sources, graph, workers=None):
+    # Returns a NumPy int32 matrix of hop distances, shape (len(sources), V).
+    # Row i holds the distances from sources[i]; columns follow the CSR vertex order
+    # (graph.freeze().vertices, which is the adjacency list order). Unreachable is -1.
+    # graph may be a Graph (frozen here), a DiGraph (distances follow edge direction)
+    # or an already frozen CSRGraph. Anything else raises TypeError.
+    # workers > number of processes to spread source batches over (None or 1 runs in-process).
+    if numpy is None:
+        raise ImportError("bfs_many() requires NumPy.")
+    if isinstance(graph, Graph):
+        csr = graph.freeze()
+    elif isinstance(graph, DiGraph):
+        # Same vertex order as adj_list: both dicts gain and lose vertices together
+        csr = CSRGraph(graph.reverse_adj_list)
+    elif isinstance(graph, CSRGraph):
+        csr = graph
+    else:
+        raise TypeError(f"bfs_many() requires a Graph, DiGraph or CSRGraph, not {type(graph).__name__}.")
+    source_ids = numpy.array([csr.vertex_id(source) for source in sources], dtype=numpy.int64)
+    offsets, indices = csr.to_numpy()
+    batches = [(start, min(start + BATCH_BITS, len(source_ids))) for start in range(0, len(source_ids), BATCH_BITS)]
+    if workers is None or workers <= 1 or len(batches) <= 1:
+        result = numpy.empty((len(source_ids), len(csr)), dtype=numpy.int32)
+        for start, stop in batches:
+            _bfs_batch(offsets, indices, source_ids[start:stop], result[start:stop])
+        return result
+    return _bfs_many_parallel(offsets, indices, source_ids, len(csr), batches, workers)
+
+
+# Run one batch of up to 64 sources, writing distances into out (shape (k, V)).
+def _bfs_batch(offsets, indices, source_ids, out):
+    vertex_count = len(offsets) - 1
+    k = len(source_ids)
+    out.fill(-1)
+    if k == 0:
+        return
+    bits = numpy.left_shift(numpy.uint64(1), numpy.arange(k, dtype=numpy.uint64))
+    frontier = numpy.zeros(vertex_count, dtype=numpy.uint64)
+    numpy.bitwise_or.at(frontier, source_ids, bits)
+    visited = frontier.copy()
+    out[numpy.arange(k), source_ids] = 0
+    # reduceat needs one start position per non-empty row
+    nonempty = offsets[1:] > offsets[:-1]
+    row_starts = offsets[:-1][nonempty]
+    if len(indices) == 0:
+        return
+    depth = 0
+    while True:
+        depth += 1
+        gathered = frontier[indices]
+        reached = numpy.zeros(vertex_count, dtype=numpy.uint64)
+        reached[nonempty] = numpy.bitwise_or.reduceat(gathered, row_starts)
+        reached &= ~visited
+        rows = numpy.flatnonzero(reached)
+        if rows.size == 0:
+            return
+        visited |= reached
+        frontier = reached
+        # Unpack each reached mask into k booleans (bit b > source b)
+        masks = reached[rows].astype("<u8").view(numpy.uint8).reshape(-1, 8)
+        flags = numpy.unpackbits(masks, axis=1, bitorder="little")[:, :k]
+        row_index, source_index = numpy.nonzero(flags)
+        out[source_index, rows[row_index]] = depth
+
+
+# Copy an array into a new shared memory block, return the block.
+def _share(array):
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    numpy.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block
+
+
+# Worker entry point: attach to the shared arrays and run a range of batches.
+def _worker(spec, start, stop):
+    blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in spec]
+    try:
+        offsets, indices, source_ids, result = (
+            numpy.ndarray(shape, dtype=dtype, buffer=block.buf) for block, (_, shape, dtype) in zip(blocks, spec)
+        )
+        _bfs_batch(offsets, indices, source_ids[start:stop], result[start:stop])
+        # Drop the views before closing the blocks
+        del offsets, indices, source_ids, result
+    finally:
+        for block in blocks:
+            block.close()
+
+
+# Spread batches over a process pool, sharing the CSR arrays and the result matrix.
+def _bfs_many_parallel(offsets, indices, source_ids, vertex_count, batches, workers):
+    shape = (len(source_ids), vertex_count)
+    arrays = [offsets, indices, source_ids]
+    blocks = [_share(array) for array in arrays]
+    result_block = shared_memory.SharedMemory(create=True, size=max(shape[0] * shape[1] * 4, 1))
+    blocks.append(result_block)
+    spec = [(block.name, array.shape, array.dtype.str) for block, array in zip(blocks, arrays)]
+    spec.append((result_block.name, shape, numpy.dtype(numpy.int32).str))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(_worker, spec, start, stop) for start, stop in batches]:
+                future.result()
+        return numpy.ndarray(shape, dtype=numpy.int32, buffer=result_block.buf).copy()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
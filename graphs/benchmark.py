@@ -0,0 +1,65 @@
+# Graph Benchmark
+# Run from the repository root: python -m graphs.benchmark
+# Hop distances from many sources: looping over bfs_layers vs bfs_many.
+# Memory of the adjacency dicts vs the frozen CSR snapshot.
+import os
+import random
+import sys
+import time
+
+from graphs.batch_bfs import bfs_many
+from graphs.bfs_dfs import bfs_layers
+from graphs.graph import Graph
+
+VERTICES = 50_000
+EDGES = 200_000
+SOURCES = 256
+# The loop is slow, so it runs on fewer sources and is scaled up
+LOOP_SOURCES = 32
+
+# Random undirected graph
+random.seed(0)
+g = Graph()
+for vertex in range(VERTICES):
+    g.add_vertex(vertex)
+for _ in range(EDGES):
+    v1, v2 = random.randrange(VERTICES), random.randrange(VERTICES)
+    if v1 != v2:
+        g.add_edge(v1, v2)
+sources = random.sample(range(VERTICES), SOURCES)
+csr = g.freeze()
+
+print(f"# Hop distances from {SOURCES} sources, {VERTICES:,} vertices, {EDGES:,} edges")
+
+start = time.perf_counter()
+for source in sources[:LOOP_SOURCES]:
+    distances = {}
+    for depth, layer in enumerate(bfs_layers(source, g)):
+        for vertex in layer:
+            distances[vertex] = depth
+loop_time = (time.perf_counter() - start) * SOURCES / LOOP_SOURCES
+print(f"loop over bfs_layers:   {loop_time:8.3f}s  (estimated from {LOOP_SOURCES} sources)")
+
+start = time.perf_counter()
+bfs_many(sources, csr)
+batch_time = time.perf_counter() - start
+print(f"bfs_many:               {batch_time:8.3f}s  ({loop_time / batch_time:.1f}x)")
+
+workers = min(4, os.cpu_count() or 1)
+start = time.perf_counter()
+bfs_many(sources, csr, workers=workers)
+parallel_time = time.perf_counter() - start
+label = f"bfs_many, workers={workers}:"
+print(f"{label:<24}{parallel_time:8.3f}s  ({loop_time / parallel_time:.1f}x)")
+
+print()
+print(f"# Memory, {VERTICES:,} vertices, {EDGES:,} edges (vertex objects themselves excluded)")
+adjacency_bytes = sys.getsizeof(g.adj_list) + sum(sys.getsizeof(neighbours) for neighbours in g.adj_list.values())
+csr_bytes = sum(column.itemsize * len(column) for column in (csr.offsets, csr.indices))
+if csr.weights is not None:
+    csr_bytes += csr.weights.itemsize * len(csr.weights)
+table_bytes = sys.getsizeof(csr.vertices) + sys.getsizeof(csr.ids)
+print(f"adjacency dicts:        {adjacency_bytes / 2 ** 20:8.1f} MB")
+print(f"CSR arrays:             {csr_bytes / 2 ** 20:8.1f} MB  ({adjacency_bytes / csr_bytes:.1f}x less)")
+print(f"CSR + vertex table:     {(csr_bytes + table_bytes) / 2 ** 20:8.1f} MB  "
+      f"({adjacency_bytes / (csr_bytes + table_bytes):.1f}x less)")
@@ -1,66 +1,177 @@
 # Breadth-First Search (BFS) and Depth-First Search (DFS)
 # Implemented using custom Queue and Stack classes.
-# Both functions return a list representing traversal order.
+# bfs and dfs return a list representing traversal order.
+# iter_bfs and iter_dfs yield the same order lazily, so callers can stop early.
 # Assumes graph is represented as an adjacency list:
-# graph.adj_list = { vertex: [neighbors] }
+# graph.adj_list = { vertex: { neighbour: weight } }
+# Only the neighbours are read (weights are ignored), in the order the edges were added.
 from queues.queue import Queue
 from stacks.stack import Stack
 
 
 def bfs(start, graph):
+    # Eager version: the full traversal order as a list
+    return list(iter_bfs(start, graph))
+
+
+def dfs(start, graph):
+    # Eager version: the full traversal order as a list
+    return list(iter_dfs(start, graph))
+
+
+def iter_bfs(start, graph, max_depth=None, visit=None, target=None):
+    # Yields vertices in BFS order without building the full result.
+    #   max_depth > do not go further than this many edges from start
+    #   visit     > predicate; neighbours for which visit(vertex) is False are skipped
+    #   target    > stop right after yielding this vertex
+    # The start vertex is checked here, before the first vertex is requested.
+    if start not in graph.adj_list:
+        raise ValueError("Start node does not exist. ")
+    return _iter_bfs(start, graph, max_depth, visit, target)
+
+
+def _iter_bfs(start, graph, max_depth, visit, target):
     # Set to track discovered vertices (prevents cycles)
-    visited = set()
+    visited = {start}
     # Queue controls FIFO traversal (level-by-level exploration)
+    # Each entry is (vertex, depth)
     traversal_que = Queue()
-    # Stores final traversal order
-    result = []
-    if start not in graph.adj_list:
-        raise ValueError("Start node does not exist. ")
-    # Begin traversal from the starting vertex
-    traversal_que.enqueue(start)
-    # Mark as visited immediately to avoid duplicate enqueues
-    visited.add(start)
+    traversal_que.enqueue((start, 0))
     # Continue processing while there are vertices to explore
     while not traversal_que.is_empty():
         # Remove next vertex in FIFO order
-        current = traversal_que.dequeue()
-        # Record visit order
-        result.append(current)
+        current, depth = traversal_que.dequeue()
+        yield current
+        if current == target:
+            return
+        if max_depth is not None and depth >= max_depth:
+            continue
         # Explore all adjacent vertices
         for neighbour in graph.adj_list[current]:
             # Only enqueue vertices not yet discovered
             # Prevents infinite loops in cyclic graphs
             if neighbour not in visited:
-                traversal_que.enqueue(neighbour)
                 visited.add(neighbour)
-    return result
+                if visit is None or visit(neighbour):
+                    traversal_que.enqueue((neighbour, depth + 1))
 
 
-def dfs(start, graph):
+def iter_dfs(start, graph, max_depth=None, visit=None, target=None):
+    # Yields vertices in DFS order without building the full result.
+    # Same options as iter_bfs. With max_depth, depth is measured along the DFS tree.
+    if start not in graph.adj_list:
+        raise ValueError("Start node does not exist. ")
+    return _iter_dfs(start, graph, max_depth, visit, target)
+
+
+def _iter_dfs(start, graph, max_depth, visit, target):
     # Tracks visited vertices to prevent revisiting
     visited = set()
     # Stack controls LIFO traversal (deep exploration first)
+    # Each entry is (vertex, depth)
     traversal_stack = Stack()
-    # Stores traversal order
-    result = []
-    if start not in graph.adj_list:
-        raise ValueError("Start node does not exist. ")
-    # Initialize traversal by pushing start vertex onto stack
-    traversal_stack.push(start)
+    traversal_stack.push((start, 0))
     # Process vertices until stack is empty
     while not traversal_stack.is_empty():
         # Pop most recently added vertex (LIFO behavior)
-        current = traversal_stack.pop()
+        current, depth = traversal_stack.pop()
         # Only process vertex if it hasn't been visited
-        if current not in visited:
-            # Mark as visited and record traversal
-            visited.add(current)
-            result.append(current)
-            # Push neighbors onto stack for further exploration
-            # Reversed to preserve natural left-to-right traversal order
-            # (matches recursive DFS behavior)
-            for neighbour in reversed(graph.adj_list[current]):
-                # Only push unvisited vertices to avoid redundant processing
+        if current in visited:
+            continue
+        visited.add(current)
+        yield current
+        if current == target:
+            return
+        if max_depth is not None and depth >= max_depth:
+            continue
+        # Push neighbors onto stack for further exploration
+        # Reversed to preserve natural left-to-right traversal order
+        # (matches recursive DFS behavior)
+        for neighbour in reversed(graph.adj_list[current]):
+            # Only push unvisited (and allowed) vertices to avoid redundant processing
+            if neighbour not in visited and (visit is None or visit(neighbour)):
+                traversal_stack.push((neighbour, depth + 1))
+
+
+def bfs_layers(start, graph):
+    # Yields the BFS frontier one layer at a time, as sets:
+    # {start}, then every vertex 1 edge away, then 2 edges away, ...
+    if start not in graph.adj_list:
+        raise ValueError("Start node does not exist. ")
+    return _bfs_layers(start, graph)
+
+
+def _bfs_layers(start, graph):
+    visited = {start}
+    frontier = [start]
+    while frontier:
+        yield set(frontier)
+        next_frontier = []
+        for current in frontier:
+            for neighbour in graph.adj_list[current]:
                 if neighbour not in visited:
-                    traversal_stack.push(neighbour)
-    return result
+                    visited.add(neighbour)
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+
+
+def shortest_path(start, graph, target):
+    # Bidirectional BFS: returns a path with the fewest edges from start to target,
+    # or [] if target is unreachable.
+    # Searches forward from start and backward from target, always expanding the
+    # smaller frontier by one full layer, until the two searches meet. Only the
+    # vertices within about half the distance of each end are touched.
+    # Directed graphs (DiGraph) are searched backward along reverse_adj_list.
+    if start not in graph.adj_list:
+        raise ValueError("Start node does not exist. ")
+    if target not in graph.adj_list:
+        raise ValueError("Target node does not exist. ")
+    if start == target:
+        return [start]
+    reverse_adj_list = getattr(graph, "reverse_adj_list", graph.adj_list)
+    # parent and depth maps for each direction
+    forward = {start: None}
+    backward = {target: None}
+    forward_depth = {start: 0}
+    backward_depth = {target: 0}
+    forward_frontier = [start]
+    backward_frontier = [target]
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meet = _expand_layer(forward_frontier, graph.adj_list, forward, forward_depth, backward_depth)
+        else:
+            backward_frontier, meet = _expand_layer(backward_frontier, reverse_adj_list, backward, backward_depth, forward_depth)
+        if meet is not None:
+            path = []
+            vertex = meet
+            while vertex is not None:
+                path.append(vertex)
+                vertex = forward[vertex]
+            path.reverse()
+            vertex = backward[meet]
+            while vertex is not None:
+                path.append(vertex)
+                vertex = backward[vertex]
+            return path
+    return []
+
+
+def _expand_layer(frontier, adj_list, parents, depth, other_depth):
+    # Expands one full layer of one side of the bidirectional search.
+    # Returns the next frontier and the meeting vertex with the shortest total
+    # distance found in this layer (or None if the searches have not met).
+    next_frontier = []
+    meet = None
+    best = None
+    for current in frontier:
+        for neighbour in adj_list[current]:
+            if neighbour not in parents:
+                parents[neighbour] = current
+                depth[neighbour] = depth[current] + 1
+                next_frontier.append(neighbour)
+                if neighbour in other_depth:
+                    total = depth[neighbour] + other_depth[neighbour]
+                    if best is None or total < best:
+                        best = total
+                        meet = neighbour
+    return next_frontier, meet
@@ -1,42 +1,70 @@
 # Graph
+import array
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class Graph:
     # Initializes an empty graph using an adjacency list representation.
     # The adjacency list is a dictionary:
     #   key   > vertex
-    #   value > list of connected vertices (neighbours)
+    #   value > insertion-ordered map of connected vertices (neighbours) to edge weights
+    # The neighbour maps are dicts: O(1) membership, add and remove,
+    # while iteration keeps the order edges were added (so traversals stay deterministic).
+    # Connected components are tracked with a union-find that is updated as edges are added.
+    # Removals cannot be undone in a union-find, so they mark it dirty and the next
+    # component query rebuilds it from the adjacency list.
     def __init__(self):
         self.adj_list = {}
+        self.components = DisjointSet()
+        self.components_dirty = False
 
     # Returns a readable string representation of the graph.
     # Each line shows a vertex and its list of connected neighbours.
     def __str__(self):
         list_string = ""
         for item in self.adj_list:
-            list_string += f"{item}: {self.adj_list[item]}\n"
+            list_string += f"{item}: {list(self.adj_list[item])}\n"
         return list_string.strip()
 
     # Adds a new vertex to the graph.
     # If the vertex already exists, duplicates are not allowed.
     def add_vertex(self, vertex):
         if vertex not in self.adj_list:
-            self.adj_list[vertex] = []
+            self.adj_list[vertex] = {}
+            if not self.components_dirty:
+                self.components.add(vertex)
         else:
             print("Cannot add duplicates")
 
-    # Adds an undirected edge between two vertices.
+    # Adds an undirected edge between two vertices, with an optional weight (default 1).
     # Both vertices must already exist.
-    # Ensures no duplicate edges are created.
-    def add_edge(self, v1, v2):
+    # Ensures no duplicate edges are created (adding an existing edge updates its weight).
+    def add_edge(self, v1, v2, weight=1):
         if v1 == v2:
             raise ValueError("Self-loops are not allowed. ")
         if v1 not in self.adj_list or v2 not in self.adj_list:
             raise ValueError("One or more vertices do not currently exist.")
-        if v2 not in self.adj_list[v1]:
-            self.adj_list[v1].append(v2)
-        if v1 not in self.adj_list[v2]:
-            self.adj_list[v2].append(v1)
+        self.adj_list[v1][v2] = weight
+        self.adj_list[v2][v1] = weight
+        if not self.components_dirty:
+            self.components.union(v1, v2)
+
+    # Returns the weight of the edge between two vertices.
+    # Raises an error if the edge does not exist.
+    def weight(self, v1, v2):
+        if v1 not in self.adj_list or v2 not in self.adj_list[v1]:
+            raise ValueError("Edge does not exist")
+        return self.adj_list[v1][v2]
 
     # Removes an undirected edge between two vertices.
     # Raises an error if either vertex does not exist or the edge is missing.
@@ -44,8 +72,9 @@ class Graph:
         if v1 not in self.adj_list or v2 not in self.adj_list:
             raise ValueError("Missing vertex/vertices. ")
         if v1 in self.adj_list[v2] and v2 in self.adj_list[v1]:
-            self.adj_list[v2].remove(v1)
-            self.adj_list[v1].remove(v2)
+            del self.adj_list[v2][v1]
+            del self.adj_list[v1][v2]
+            self.components_dirty = True
         else:
             raise ValueError("Edge does not exist")
 
@@ -56,6 +85,430 @@ class Graph:
         if vertex not in self.adj_list:
             raise ValueError("Missing vertex. ")
         for neighbour in self.adj_list[vertex]:
-            if vertex in self.adj_list[neighbour]:
-                self.adj_list[neighbour].remove(vertex)
+            self.adj_list[neighbour].pop(vertex, None)
+        del self.adj_list[vertex]
+        self.components_dirty = True
+
+    # Rebuilds the union-find from the adjacency list if a removal made it stale.
+    def _fresh_components(self):
+        if self.components_dirty:
+            components = DisjointSet()
+            for vertex in self.adj_list:
+                components.add(vertex)
+            for vertex, neighbours in self.adj_list.items():
+                for neighbour in neighbours:
+                    components.union(vertex, neighbour)
+            self.components = components
+            self.components_dirty = False
+        return self.components
+
+    # Returns True if a path exists between two vertices.
+    # Raises an error if either vertex does not exist.
+    def connected(self, v1, v2):
+        if v1 not in self.adj_list or v2 not in self.adj_list:
+            raise ValueError("Missing vertex/vertices. ")
+        return self._fresh_components().connected(v1, v2)
+
+    # Returns a representative vertex of the component containing vertex.
+    # Two vertices are connected exactly when they have the same representative.
+    def component_of(self, vertex):
+        if vertex not in self.adj_list:
+            raise ValueError("Missing vertex. ")
+        return self._fresh_components().find(vertex)
+
+    # Returns the number of connected components.
+    def component_count(self):
+        return self._fresh_components().count
+
+    # Returns an immutable compressed sparse row (CSR) snapshot of the graph.
+    # Later changes to this graph do not affect the snapshot.
+    def freeze(self):
+        return CSRGraph(self.adj_list)
+
+    # Builds a graph from an edge list, streaming it chunk_size edges at a time.
+    # source is a file path or an iterable of (v1, v2) / (v1, v2, weight) tuples.
+    # File lines are "v1 v2" or "v1 v2 weight" (whitespace separated); blank lines and
+    # lines starting with # are skipped, and vertex_type converts the vertex fields.
+    # Vertices are created as they appear, duplicate edges collapse into one, and the
+    # file is never held in memory as a whole. Self-loops raise ValueError.
+    @classmethod
+    def from_edge_list(cls, source, chunk_size=100_000, vertex_type=str):
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1.")
+        graph = cls()
+        # Components are rebuilt on the first query instead of per edge
+        graph.components_dirty = True
+        if isinstance(source, (str, os.PathLike)):
+            with open(source) as f:
+                while True:
+                    lines = list(itertools.islice(f, chunk_size))
+                    if not lines:
+                        break
+                    graph._add_edges(_parse_edge_lines(lines, vertex_type))
+        else:
+            edges = iter(source)
+            while True:
+                chunk = list(itertools.islice(edges, chunk_size))
+                if not chunk:
+                    break
+                graph._add_edges(chunk)
+        return graph
+
+    # Adds a batch of (v1, v2) / (v1, v2, weight) edges straight into the adjacency list.
+    def _add_edges(self, edges):
+        adj_list = self.adj_list
+        for edge in edges:
+            v1, v2 = edge[0], edge[1]
+            weight = edge[2] if len(edge) > 2 else 1
+            if v1 == v2:
+                raise ValueError("Self-loops are not allowed. ")
+            neighbours = adj_list.get(v1)
+            if neighbours is None:
+                neighbours = adj_list[v1] = {}
+            neighbours[v2] = weight
+            neighbours = adj_list.get(v2)
+            if neighbours is None:
+                neighbours = adj_list[v2] = {}
+            neighbours[v1] = weight
+
+    # Writes the graph to a binary file (see CSRGraph.save_binary).
+    def save_binary(self, path):
+        self.freeze().save_binary(path)
+
+    # Reads a binary file written by save_binary into a new, mutable Graph.
+    # For read-only use, CSRGraph.load_binary is much faster: it maps the file instead.
+    @classmethod
+    def load_binary(cls, path):
+        csr = CSRGraph.load_binary(path)
+        graph = cls()
+        graph.components_dirty = True
+        vertices = csr.vertices
+        for i, vertex in enumerate(vertices):
+            start, stop = csr.offsets[i], csr.offsets[i + 1]
+            if csr.weights is None:
+                graph.adj_list[vertex] = {vertices[j]: 1 for j in csr.indices[start:stop]}
+            else:
+                graph.adj_list[vertex] = {
+                    vertices[j]: weight for j, weight in zip(csr.indices[start:stop], csr.weights[start:stop])
+                }
+        return graph
+
+
+# Parses edge list lines into (v1, v2) / (v1, v2, weight) tuples.
+def _parse_edge_lines(lines, vertex_type):
+    edges = []
+    for line in lines:
+        parts = line.split()
+        if not parts or parts[0].startswith("#"):
+            continue
+        if len(parts) == 2:
+            edges.append((vertex_type(parts[0]), vertex_type(parts[1])))
+        elif len(parts) == 3:
+            edges.append((vertex_type(parts[0]), vertex_type(parts[1]), float(parts[2])))
+        else:
+            raise ValueError(f"Invalid edge line: {line.strip()!r}")
+    return edges
+
+
+class DiGraph:
+    # Initializes an empty directed, weighted graph.
+    #   adj_list         > {vertex: {target: weight}} for outgoing edges
+    #   reverse_adj_list > {vertex: {source: weight}} for incoming edges
+    # Keeping both directions lets remove_vertex run in O(in-degree + out-degree).
+    # Self-loops are allowed.
+    def __init__(self):
+        self.adj_list = {}
+        self.reverse_adj_list = {}
+
+    # Returns a readable string representation of the graph.
+    # Each line shows a vertex and its outgoing edges with their weights.
+    def __str__(self):
+        list_string = ""
+        for item in self.adj_list:
+            list_string += f"{item}: {self.adj_list[item]}\n"
+        return list_string.strip()
+
+    # Adds a new vertex to the graph.
+    # If the vertex already exists, duplicates are not allowed.
+    def add_vertex(self, vertex):
+        if vertex not in self.adj_list:
+            self.adj_list[vertex] = {}
+            self.reverse_adj_list[vertex] = {}
+        else:
+            print("Cannot add duplicates")
+
+    # Adds a directed edge from source to target, with an optional weight (default 1).
+    # Both vertices must already exist. Adding an existing edge updates its weight.
+    def add_edge(self, source, target, weight=1):
+        if source not in self.adj_list or target not in self.adj_list:
+            raise ValueError("One or more vertices do not currently exist.")
+        self.adj_list[source][target] = weight
+        self.reverse_adj_list[target][source] = weight
+
+    # Returns the weight of the edge from source to target.
+    # Raises an error if the edge does not exist.
+    def weight(self, source, target):
+        if source not in self.adj_list or target not in self.adj_list[source]:
+            raise ValueError("Edge does not exist")
+        return self.adj_list[source][target]
+
+    # Removes the directed edge from source to target.
+    # Raises an error if either vertex does not exist or the edge is missing.
+    def remove_edge(self, source, target):
+        if source not in self.adj_list or target not in self.adj_list:
+            raise ValueError("Missing vertex/vertices. ")
+        if target not in self.adj_list[source]:
+            raise ValueError("Edge does not exist")
+        del self.adj_list[source][target]
+        del self.reverse_adj_list[target][source]
+
+    # Removes a vertex and every edge into or out of it.
+    def remove_vertex(self, vertex):
+        if vertex not in self.adj_list:
+            raise ValueError("Missing vertex. ")
+        for target in self.adj_list[vertex]:
+            self.reverse_adj_list[target].pop(vertex, None)
+        for source in self.reverse_adj_list[vertex]:
+            self.adj_list[source].pop(vertex, None)
         del self.adj_list[vertex]
+        del self.reverse_adj_list[vertex]
+
+
+# Union-Find (Disjoint Set)
+# Keeps vertices partitioned into disjoint sets (connected components).
+#   parent > dict, vertex > parent vertex (a root is its own parent)
+#   rank   > dict, root > upper bound on the height of its tree
+# Path compression (find) and union by rank keep every operation at
+# O(α(n)) amortized, which is effectively constant.
+class DisjointSet:
+    # Initializes an empty disjoint set.
+    def __init__(self):
+        self.parent = {}
+        self.rank = {}
+        self.count = 0
+
+    # Returns the number of elements.
+    def __len__(self):
+        return len(self.parent)
+
+    # Returns True if the element has been added.
+    def __contains__(self, item):
+        return item in self.parent
+
+    # Adds an element as its own single-element set.
+    # Adding an existing element does nothing.
+    def add(self, item):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.rank[item] = 0
+            self.count += 1
+
+    # Returns the representative (root) of the set containing item.
+    # Iterative, so long chains cannot hit the recursion limit.
+    def find(self, item):
+        if item not in self.parent:
+            raise ValueError("Missing element. ")
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression: point every element on the path straight at the root
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    # Merges the sets containing a and b. Returns True if they were separate.
+    def union(self, a, b):
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return False
+        # Union by rank: attach the shorter tree under the taller one
+        if self.rank[root_a] < self.rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if self.rank[root_a] == self.rank[root_b]:
+            self.rank[root_a] += 1
+        self.count -= 1
+        return True
+
+    # Returns True if a and b are in the same set.
+    def connected(self, a, b):
+        return self.find(a) == self.find(b)
+
+
+# Immutable graph in compressed sparse row (CSR) form.
+# Vertices are interned to integer ids 0..V-1 (in adjacency list order):
+#   vertices > list, id > vertex
+#   ids      > dict, vertex > id
+#   offsets  > array of V + 1 positions into indices
+#   indices  > array of neighbour ids; the neighbours of id i are indices[offsets[i]:offsets[i + 1]]
+#   weights  > array of edge weights parallel to indices, or None if every weight is 1
+# Each neighbour costs one machine integer instead of a dict entry, and the
+# neighbours of a vertex sit next to each other in memory.
+#
+# Binary file layout (save_binary / load_binary), all little-endian:
+#   header   > magic, version, flags, vertex count, index count, vertex table size
+#   offsets  > int64 * (V + 1)
+#   indices  > int32 or int64 * index count (padded to 8 bytes)
+#   weights  > float64 * index count (only if the graph is weighted)
+#   vertices > JSON list of vertex labels (str or int)
+# The arrays are used straight from a memory map, so loading only reads the vertex table.
+_CSR_MAGIC = b"CSRGRPH1"
+_CSR_HEADER = struct.Struct("<8sIIQQQ")
+_CSR_WEIGHTED = 1
+_CSR_WIDE_INDEX = 2
+
+
+class CSRGraph:
+    # Builds the CSR arrays from an adjacency list ({vertex: {neighbour: weight}}).
+    def __init__(self, adj_list):
+        vertices = list(adj_list)
+        ids = {vertex: i for i, vertex in enumerate(vertices)}
+        index_type = "i" if len(vertices) < 2 ** 31 else "q"
+        offsets = array.array("q", [0])
+        indices = array.array(index_type)
+        weights = array.array("d")
+        for vertex in vertices:
+            neighbours = adj_list[vertex]
+            indices.extend([ids[neighbour] for neighbour in neighbours])
+            weights.extend(neighbours.values())
+            offsets.append(len(indices))
+        if all(weight == 1 for weight in weights):
+            weights = None
+        self._set_arrays(vertices, ids, offsets, indices, weights)
+
+    # Stores the vertex table and CSR arrays (shared by __init__ and load_binary).
+    def _set_arrays(self, vertices, ids, offsets, indices, weights):
+        self.vertices = vertices
+        self.ids = ids
+        self.offsets = offsets
+        self.indices = indices
+        self.weights = weights
+        self.adj_list = _CSRAdjacency(self)
+
+    # Writes the graph to a binary file that load_binary can memory-map.
+    # Vertex labels must be str or int.
+    def save_binary(self, path):
+        for vertex in self.vertices:
+            if not isinstance(vertex, (str, int)) or isinstance(vertex, bool):
+                raise ValueError("Only str and int vertices can be saved. ")
+        table = json.dumps(self.vertices).encode("utf-8")
+        index_bytes = self._little_endian(self.indices)
+        flags = _CSR_WIDE_INDEX if self.indices.itemsize == 8 else 0
+        if self.weights is not None:
+            flags |= _CSR_WEIGHTED
+        with open(path, "wb") as f:
+            f.write(_CSR_HEADER.pack(_CSR_MAGIC, 1, flags, len(self.vertices), len(self.indices), len(table)))
+            f.write(self._little_endian(self.offsets))
+            f.write(index_bytes)
+            f.write(bytes(-len(index_bytes) % 8))
+            if self.weights is not None:
+                f.write(self._little_endian(self.weights))
+            f.write(table)
+
+    # Returns the raw bytes of an array in little-endian order.
+    @staticmethod
+    def _little_endian(values):
+        values = array.array(values.typecode if isinstance(values, array.array) else values.format, values)
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values.tobytes()
+
+    # Opens a file written by save_binary. The CSR arrays stay in a read-only memory map,
+    # so only the vertex table is read up front and the OS pages arrays in on demand.
+    @classmethod
+    def load_binary(cls, path):
+        if sys.byteorder != "little":
+            raise ValueError("load_binary() memory-maps little-endian data and needs a little-endian machine.")
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, vertex_count, index_count, table_size = _CSR_HEADER.unpack_from(mapped, 0)
+        if magic != _CSR_MAGIC or version != 1:
+            raise ValueError(f"{path} is not a CSR graph file.")
+        view = memoryview(mapped)
+        position = _CSR_HEADER.size
+        offsets = view[position:position + (vertex_count + 1) * 8].cast("q")
+        position += (vertex_count + 1) * 8
+        index_size = 8 if flags & _CSR_WIDE_INDEX else 4
+        indices = view[position:position + index_count * index_size].cast("q" if index_size == 8 else "i")
+        position += index_count * index_size
+        position += -position % 8
+        weights = None
+        if flags & _CSR_WEIGHTED:
+            weights = view[position:position + index_count * 8].cast("d")
+            position += index_count * 8
+        vertices = json.loads(bytes(view[position:position + table_size]))
+        graph = cls.__new__(cls)
+        graph._set_arrays(vertices, {vertex: i for i, vertex in enumerate(vertices)}, offsets, indices, weights)
+        # Keep the map alive for as long as the graph uses it
+        graph._mapped = mapped
+        return graph
+
+    # Returns the number of vertices.
+    def __len__(self):
+        return len(self.vertices)
+
+    # Returns True if the vertex exists.
+    def __contains__(self, vertex):
+        return vertex in self.ids
+
+    # Returns a readable string representation of the graph (same format as Graph).
+    def __str__(self):
+        list_string = ""
+        for vertex in self.vertices:
+            list_string += f"{vertex}: {list(self.neighbours(vertex))}\n"
+        return list_string.strip()
+
+    # Returns the number of undirected edges.
+    def edge_count(self):
+        return len(self.indices) // 2
+
+    # Returns the id of a vertex.
+    # Raises ValueError if the vertex does not exist.
+    def vertex_id(self, vertex):
+        if vertex not in self.ids:
+            raise ValueError("Missing vertex. ")
+        return self.ids[vertex]
+
+    # Returns the neighbour ids of a vertex id as a zero-copy memoryview.
+    def neighbour_ids(self, i):
+        return memoryview(self.indices)[self.offsets[i]:self.offsets[i + 1]]
+
+    # Returns the neighbours of a vertex, in the order the edges were added.
+    def neighbours(self, vertex):
+        i = self.vertex_id(vertex)
+        vertices = self.vertices
+        return [vertices[j] for j in self.indices[self.offsets[i]:self.offsets[i + 1]]]
+
+    # Returns the number of neighbours of a vertex.
+    def degree(self, vertex):
+        i = self.vertex_id(vertex)
+        return self.offsets[i + 1] - self.offsets[i]
+
+    # Returns (offsets, indices) as zero-copy NumPy arrays. Requires NumPy.
+    def to_numpy(self):
+        if numpy is None:
+            raise ImportError("to_numpy() requires NumPy.")
+        return numpy.frombuffer(self.offsets, dtype=numpy.int64), numpy.asarray(memoryview(self.indices))
+
+
+# Read-only {vertex: neighbours} view over a CSRGraph,
+# so code written against Graph.adj_list (e.g. bfs and dfs) also runs on a frozen graph.
+class _CSRAdjacency:
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, vertex):
+        if vertex not in self.graph.ids:
+            raise KeyError(vertex)
+        return self.graph.neighbours(vertex)
+
+    def __contains__(self, vertex):
+        return vertex in self.graph.ids
+
+    def __iter__(self):
+        return iter(self.graph.vertices)
+
+    def __len__(self):
+        return len(self.graph.vertices)
@@ -0,0 +1,116 @@
+# Shortest Paths
+# Weighted shortest-path searches over Graph (undirected) and DiGraph (directed).
+# Both store edges as graph.adj_list = { vertex: {neighbour: weight} }.
+#
+# With a target, each function returns (cost, path) and stops as soon as the
+# target's distance is final; an unreachable target gives (math.inf, []).
+# Without a target, it returns (distances, previous) for every reachable vertex,
+# where previous maps each vertex to the vertex before it on its shortest path.
+import heapq
+import itertools
+import math
+
+from queues.queue import Queue
+
+
+# Follow previous links back from the target to rebuild the path.
+def _build_path(previous, target):
+    path = [target]
+    while path[-1] in previous:
+        path.append(previous[path[-1]])
+    path.reverse()
+    return path
+
+
+# Shape the result: (cost, path) for a target, (distances, previous) otherwise.
+def _result(distances, previous, target):
+    if target is None:
+        return distances, previous
+    if target not in distances:
+        return math.inf, []
+    return distances[target], _build_path(previous, target)
+
+
+def _check_vertices(graph, start, target):
+    if start not in graph.adj_list:
+        raise ValueError("Start node does not exist. ")
+    if target is not None and target not in graph.adj_list:
+        raise ValueError("Target node does not exist. ")
+
+
+def dijkstra(start, graph, target=None):
+    # Dijkstra's algorithm with a binary heap and lazy deletion:
+    # a shorter distance pushes a new heap entry instead of updating the old one,
+    # and stale entries are skipped when popped.
+    # Raises ValueError on a negative edge weight (use bellman_ford instead).
+    return astar(start, graph, target, None)
+
+
+def astar(start, graph, target, heuristic):
+    # A* search: like Dijkstra, but the heap is ordered by distance + heuristic(vertex).
+    # heuristic(vertex) estimates the remaining cost to the target. It must be consistent
+    # (never overestimates, and never drops by more than an edge's weight along that edge),
+    # otherwise the returned path may not be the shortest.
+    # With heuristic=None this is plain Dijkstra (and target may be None).
+    _check_vertices(graph, start, target)
+    distances = {start: 0}
+    previous = {}
+    done = set()
+    # The counter breaks ties so vertices themselves are never compared
+    counter = itertools.count()
+    heap = [(0, next(counter), start)]
+    # Local names keep the inner loop fast on large graphs
+    adj_list = graph.adj_list
+    push = heapq.heappush
+    pop = heapq.heappop
+    while heap:
+        _, _, current = pop(heap)
+        if current in done:
+            continue
+        done.add(current)
+        if current == target:
+            break
+        current_distance = distances[current]
+        for neighbour, weight in adj_list[current].items():
+            if weight < 0:
+                raise ValueError("Negative edge weights are not supported, use bellman_ford. ")
+            distance = current_distance + weight
+            if distance < distances.get(neighbour, math.inf):
+                distances[neighbour] = distance
+                previous[neighbour] = current
+                priority = distance if heuristic is None else distance + heuristic(neighbour)
+                push(heap, (priority, next(counter), neighbour))
+    return _result(distances, previous, target)
+
+
+def bellman_ford(start, graph, target=None):
+    # Queue-based Bellman-Ford (SPFA): supports negative edge weights.
+    # Only vertices whose distance just improved are re-examined.
+    # A shortest path with V or more edges means a negative cycle is reachable,
+    # and a ValueError is raised.
+    # Negative edges make early exit unsafe, so the whole reachable graph is processed.
+    _check_vertices(graph, start, target)
+    vertex_count = len(graph.adj_list)
+    distances = {start: 0}
+    previous = {}
+    # Number of edges on the current best path to each vertex
+    path_edges = {start: 0}
+    queued = {start}
+    pending = Queue()
+    pending.enqueue(start)
+    while not pending.is_empty():
+        current = pending.dequeue()
+        queued.discard(current)
+        current_distance = distances[current]
+        for neighbour, weight in graph.adj_list[current].items():
+            distance = current_distance + weight
+            if neighbour not in distances or distance < distances[neighbour]:
+                distances[neighbour] = distance
+                previous[neighbour] = current
+                path_edges[neighbour] = path_edges[current] + 1
+                if path_edges[neighbour] >= vertex_count:
+                    raise ValueError("Graph contains a negative cycle. ")
+                if neighbour not in queued:
+                    queued.add(neighbour)
+                    pending.enqueue(neighbour)
+    return _result(distances, previous, target)
@@ -0,0 +1,66 @@
+# Hash Table Benchmark
+# Run from the repository root: python -m hash_tables.benchmark
+# Contention benchmark: N threads doing a mixed read/update workload against
+#   - a HashTable guarded by one global lock
+#   - a ConcurrentHashTable with 16 shards
+# On CPython with the GIL only one thread runs Python code at a time, so total
+# throughput cannot scale with threads; the numbers show how much time is lost
+# to lock contention on top of that.
+import random
+import threading
+import time
+
+from hash_tables.concurrent_hash_table import ConcurrentHashTable
+from hash_tables.hash_table import HashTable
+
+KEYS = 10_000
+OPS_PER_RUN = 200_000
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+
+
+# HashTable behind one lock, exposing the same operations the benchmark uses.
+class SingleLockHashTable:
+    def __init__(self):
+        self.table = HashTable(expected_size=KEYS)
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            return self.table.get(key, default)
+
+    def update(self, key, func, default):
+        with self.lock:
+            value = func(self.table.get(key, default))
+            self.table[key] = value
+            return value
+
+
+# 80% reads, 20% atomic increments on random keys
+def worker(table, ops, seed):
+    rng = random.Random(seed)
+    keys = [rng.randrange(KEYS) for _ in range(ops)]
+    for i, key in enumerate(keys):
+        if i % 5 == 0:
+            table.update(key, lambda n: n + 1, 0)
+        else:
+            table.get(key)
+
+
+# Run the workload split across a number of threads, return ops per second
+def run(table, threads):
+    ops = OPS_PER_RUN // threads
+    pool = [threading.Thread(target=worker, args=(table, ops, seed)) for seed in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return ops * threads / (time.perf_counter() - start)
+
+
+print(f"# Mixed workload, {OPS_PER_RUN:,} ops per run")
+print(f"{'threads':>7}  {'single lock':>14}  {'16 shards':>14}")
+for threads in THREAD_COUNTS:
+    single = run(SingleLockHashTable(), threads)
+    sharded = run(ConcurrentHashTable(shards=16, expected_size=KEYS), threads)
+    print(f"{threads:>7}  {single:>10,.0f} op/s  {sharded:>10,.0f} op/s")
@@ -0,0 +1,508 @@
+# Caches
+# Bounded caches built on HashTable, with O(1) get, set and eviction.
+#   LRUCache > evicts the least recently used entry
+#   LFUCache > evicts the least frequently used entry (oldest first on ties)
+#   TTLCache > entries expire a fixed number of seconds after they were written
+# Every cache can be bounded by number of entries, total bytes, or both.
+# Byte limits use sys.getsizeof by default, which is shallow: a list or dict counts
+# its own slots but not the objects in them. Pass sizeof=deep_sizeof (or your own
+# function) when values are containers.
+# HashTable maps each key to a node; the nodes are kept in doubly linked lists
+# that record the eviction order.
+import contextlib
+import functools
+import sys
+import threading
+import time
+import types
+import weakref
+
+from hash_tables.hash_table import HashTable
+
+_MISSING = object()
+_KWARGS_MARK = object()
+
+
+# One cached entry, stored in the HashTable and linked into an eviction list.
+class _Node:
+    __slots__ = ("key", "value", "size", "prev", "next")
+
+    def __init__(self, key=None, value=None, size=0):
+        self.key = key
+        self.value = value
+        self.size = size
+        self.prev = self
+        self.next = self
+
+
+# LFU entry: also knows the frequency bucket it lives in.
+class _LFUNode(_Node):
+    __slots__ = ("bucket",)
+
+
+# TTL entry: also knows when it expires.
+class _TTLNode(_Node):
+    __slots__ = ("expires",)
+
+
+# Circular doubly linked list with a sentinel root node.
+# Oldest node is root.next, newest is root.prev.
+class _LinkedList:
+    __slots__ = ("root",)
+
+    def __init__(self):
+        self.root = _Node()
+
+    # Return True if the list contains no nodes.
+    def is_empty(self):
+        return self.root.next is self.root
+
+    # Add a node at the newest end.
+    def append(self, node):
+        last = self.root.prev
+        node.prev = last
+        node.next = self.root
+        last.next = node
+        self.root.prev = node
+
+    # Unlink a node from the list.
+    def remove(self, node):
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+    # Return the oldest node, or None if the list is empty.
+    def first(self):
+        if self.is_empty():
+            return None
+        return self.root.next
+
+    # Return the node after a given node, or None at the end of the list.
+    def after(self, node):
+        if node.next is self.root:
+            return None
+        return node.next
+
+
+# LFU frequency bucket: every entry with the same use count, oldest first.
+# Buckets form their own linked list in increasing frequency order.
+class _Bucket:
+    __slots__ = ("freq", "entries", "prev", "next")
+
+    def __init__(self, freq=0):
+        self.freq = freq
+        self.entries = _LinkedList()
+        self.prev = self
+        self.next = self
+
+
+# Shared bookkeeping for all caches: limits, byte accounting and counters.
+# Subclasses decide the eviction order through the _link/_unlink/_on_hit/_on_update/_oldest/_next_oldest hooks.
+class _Cache:
+    # max_entries: maximum number of entries (None for no limit).
+    # max_bytes: maximum total size of the cached values (None for no limit).
+    # sizeof: function returning the size of a value in bytes, used with max_bytes.
+    def __init__(self, max_entries=128, max_bytes=None, sizeof=sys.getsizeof):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("Max entries must be at least 1.")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("Max bytes must be at least 1.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.reset()
+
+    # Return the number of entries currently cached.
+    def __len__(self):
+        return len(self.table)
+
+    # Return True if the key is cached. Does not count as a hit or miss.
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    # Return the cached value for a key.
+    # Raises KeyError (and counts a miss) if the key is not cached.
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    # Insert or update a cached value, evicting other entries if a limit is exceeded.
+    # Raises ValueError if the value alone is larger than max_bytes.
+    def __setitem__(self, key, value):
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise ValueError("Value is larger than the cache's max bytes.")
+        node = self._find(key)
+        if node is None:
+            node = self._new_node(key, value, size)
+            self.table[key] = node
+            self._link(node)
+        else:
+            self.total_bytes -= node.size
+            node.value = value
+            node.size = size
+            self._on_update(node)
+        self.total_bytes += size
+        self._evict(node)
+
+    # Remove a cached entry.
+    # Raises KeyError if the key is not cached.
+    def __delitem__(self, key):
+        node = self._find(key)
+        if node is None:
+            raise KeyError(key)
+        self._remove(node)
+
+    # Return a readable string representation of the cache.
+    def __str__(self):
+        return f"{type(self).__name__}({len(self)} entries, {self.stats()['hit_rate']:.0%} hit rate)"
+
+    # Return the cached value for a key, or default if it is not cached.
+    # Counts a hit or a miss.
+    def get(self, key, default=None):
+        node = self._find(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._on_hit(node)
+        return node.value
+
+    # Return the counters and current usage as a dictionary.
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self),
+            "bytes": self.total_bytes,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    # Remove every entry and reset all counters.
+    def reset(self):
+        self.table = HashTable()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # Return the node for a key, or None if it is not cached.
+    def _find(self, key):
+        return self.table.get(key)
+
+    # Create the node type used by this cache.
+    def _new_node(self, key, value, size):
+        return _Node(key, value, size)
+
+    # Return True while the cache is over one of its limits.
+    def _over_limit(self):
+        if self.max_entries is not None and len(self.table) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
+
+    # Evict entries in eviction order until the cache is within its limits.
+    # The entry that was just written is skipped.
+    def _evict(self, protected):
+        while self._over_limit():
+            victim = self._oldest()
+            if victim is protected:
+                victim = self._next_oldest(victim)
+            self._remove(victim)
+            self.evictions += 1
+
+    # Remove a node from both the HashTable and the eviction order.
+    def _remove(self, node):
+        self._unlink(node)
+        del self.table[node.key]
+        self.total_bytes -= node.size
+
+
+# Least Recently Used cache.
+# Entries are kept in one list from least to most recently used.
+class LRUCache(_Cache):
+    def reset(self):
+        super().reset()
+        self.order = _LinkedList()
+
+    def _link(self, node):
+        self.order.append(node)
+
+    def _unlink(self, node):
+        self.order.remove(node)
+
+    # A hit or an update makes the entry the most recently used
+    def _on_hit(self, node):
+        self.order.remove(node)
+        self.order.append(node)
+
+    def _on_update(self, node):
+        self._on_hit(node)
+
+    def _oldest(self):
+        return self.order.first()
+
+    def _next_oldest(self, node):
+        return self.order.after(node)
+
+
+# Least Frequently Used cache.
+# Entries live in frequency buckets; buckets are linked in increasing frequency order,
+# so the least frequently used entry is always the oldest entry of the first bucket.
+# Moving an entry to the next frequency only touches neighbouring buckets, so every operation is O(1).
+class LFUCache(_Cache):
+    def reset(self):
+        super().reset()
+        self.buckets = _Bucket()
+
+    def _new_node(self, key, value, size):
+        node = _LFUNode(key, value, size)
+        node.bucket = None
+        return node
+
+    # Insert a new bucket for a frequency directly after another bucket.
+    def _add_bucket_after(self, bucket, freq):
+        new_bucket = _Bucket(freq)
+        new_bucket.prev = bucket
+        new_bucket.next = bucket.next
+        bucket.next.prev = new_bucket
+        bucket.next = new_bucket
+        return new_bucket
+
+    # Move a node into a bucket (removing it from its old bucket, which is dropped if empty).
+    def _move(self, node, bucket):
+        if node.bucket is not None:
+            self._unlink(node)
+        bucket.entries.append(node)
+        node.bucket = bucket
+
+    # New entries start with a use count of 1
+    def _link(self, node):
+        first = self.buckets.next
+        if first is self.buckets or first.freq != 1:
+            first = self._add_bucket_after(self.buckets, 1)
+        self._move(node, first)
+
+    def _unlink(self, node):
+        bucket = node.bucket
+        bucket.entries.remove(node)
+        node.bucket = None
+        if bucket.entries.is_empty():
+            bucket.prev.next = bucket.next
+            bucket.next.prev = bucket.prev
+
+    # A hit or an update increases the use count by one
+    def _on_hit(self, node):
+        bucket = node.bucket
+        target = bucket.next
+        if target is self.buckets or target.freq != bucket.freq + 1:
+            target = self._add_bucket_after(bucket, bucket.freq + 1)
+        self._move(node, target)
+
+    def _on_update(self, node):
+        self._on_hit(node)
+
+    def _oldest(self):
+        return self.buckets.next.entries.first()
+
+    def _next_oldest(self, node):
+        following = node.bucket.entries.after(node)
+        if following is None:
+            following = node.bucket.next.entries.first()
+        return following
+
+
+# Time-To-Live cache.
+# Every entry expires ttl seconds after it was last written.
+# Because all entries share one ttl, write order is also expiry order, so every
+# lookup, write and len() purges expired entries from the oldest end (amortized O(1):
+# each entry is removed once). Read-only workloads therefore free memory too.
+# An idle cache keeps its expired entries until the next call, unless periodic expiry
+# is turned on with sweep_interval: a daemon thread then calls expire() every
+# sweep_interval seconds, and every operation takes a lock shared with that thread.
+# close() stops the thread (it also stops once the cache is garbage collected).
+# When a size limit is hit, the entry closest to expiry is evicted first.
+class TTLCache(_Cache):
+    # ttl: lifetime of an entry in seconds.
+    # timer: clock returning seconds (time.monotonic by default).
+    # sweep_interval: seconds between background expire() calls (None: only on access).
+    def __init__(self, ttl, max_entries=128, max_bytes=None, sizeof=sys.getsizeof, timer=time.monotonic,
+                 sweep_interval=None):
+        if ttl <= 0:
+            raise ValueError("TTL must be greater than 0.")
+        if sweep_interval is not None and sweep_interval <= 0:
+            raise ValueError("Sweep interval must be greater than 0.")
+        self.ttl = ttl
+        self.timer = timer
+        # Without a sweeper there is only one thread to guard against: no locking cost
+        self.lock = threading.RLock() if sweep_interval is not None else contextlib.nullcontext()
+        super().__init__(max_entries, max_bytes, sizeof)
+        self._stop = threading.Event()
+        self._sweeper = None
+        if sweep_interval is not None:
+            self._sweeper = threading.Thread(target=_sweep, args=(weakref.ref(self), self._stop, sweep_interval),
+                                             name="TTLCache sweeper", daemon=True)
+            self._sweeper.start()
+
+    # Return the number of unexpired entries.
+    def __len__(self):
+        with self.lock:
+            self.expire()
+            return len(self.table)
+
+    def __contains__(self, key):
+        with self.lock:
+            return super().__contains__(key)
+
+    # Insert or update a value and restart its lifetime.
+    def __setitem__(self, key, value):
+        with self.lock:
+            self.expire()
+            super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        with self.lock:
+            super().__delitem__(key)
+
+    def get(self, key, default=None):
+        with self.lock:
+            return super().get(key, default)
+
+    def stats(self):
+        with self.lock:
+            return super().stats()
+
+    def reset(self):
+        with self.lock:
+            super().reset()
+            self.order = _LinkedList()
+
+    # Stop the background sweeper, if any. The cache itself stays usable.
+    def close(self):
+        self._stop.set()
+        if self._sweeper is not None and self._sweeper is not threading.current_thread():
+            self._sweeper.join()
+        self._sweeper = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Remove every expired entry, oldest first. Returns the number removed.
+    def expire(self):
+        with self.lock:
+            now = self.timer()
+            removed = 0
+            node = self.order.first()
+            while node is not None and node.expires <= now:
+                self._remove(node)
+                removed += 1
+                node = self.order.first()
+            self.expirations += removed
+            return removed
+
+    # Purges expired entries first, so an expired key is already gone when it is looked up.
+    def _find(self, key):
+        self.expire()
+        return self.table.get(key)
+
+    def _new_node(self, key, value, size):
+        return _TTLNode(key, value, size)
+
+    def _link(self, node):
+        node.expires = self.timer() + self.ttl
+        self.order.append(node)
+
+    def _unlink(self, node):
+        self.order.remove(node)
+
+    # Reads do not extend the lifetime
+    def _on_hit(self, node):
+        pass
+
+    # A write restarts the lifetime, so the entry moves to the newest end
+    def _on_update(self, node):
+        self.order.remove(node)
+        self._link(node)
+
+    def _oldest(self):
+        return self.order.first()
+
+    def _next_oldest(self, node):
+        return self.order.after(node)
+
+
+# Background loop of a TTLCache sweeper. Holds the cache only through a weak reference,
+# so an unreferenced cache can still be garbage collected.
+def _sweep(cache_ref, stop, interval):
+    while not stop.wait(interval):
+        cache = cache_ref()
+        if cache is None:
+            return
+        cache.expire()
+        del cache
+
+
+# Size of a value in bytes including the objects it contains (recursively through
+# lists, tuples, sets, dicts and instance __dict__s; classes, functions and modules are
+# not followed). Objects reachable twice count once.
+# Slower than sys.getsizeof; use it as sizeof= when cached values are containers.
+def deep_sizeof(value):
+    seen = set()
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__") and not callable(item) and not isinstance(item, types.ModuleType):
+            stack.append(item.__dict__)
+    return size
+
+
+# Build a cache key from call arguments.
+def _make_key(args, kwargs):
+    if not kwargs:
+        return args
+    return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+
+
+# Decorator that caches a function's results in a given cache.
+# key: optional function taking the call arguments and returning the cache key.
+# A result larger than the cache's max_bytes is returned without being cached.
+# The cache is available as wrapper.cache.
+#
+#   @cached(LRUCache(max_entries=1000))
+#   def load_user(user_id): ...
+def cached(cache, key=None):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key is not None else _make_key(args, kwargs)
+            value = cache.get(cache_key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                try:
+                    cache[cache_key] = value
+                except ValueError:
+                    # The result alone is larger than max_bytes: return it uncached
+                    pass
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
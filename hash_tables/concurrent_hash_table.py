@@ -0,0 +1,140 @@
+# Concurrent Hash Table
+# Thread-safe hash table split into independently locked shards.
+# Each key belongs to one shard (chosen by its hash), and each shard is a
+# HashTable with its own lock, so threads working on different shards never wait
+# for each other. Compound operations (get_or_set, compute_if_absent, update)
+# run entirely under the shard lock, so they are atomic.
+#
+# Reads also take the shard lock. HashTable moves entries around during
+# Robin Hood insertion and rebuilds, so an unlocked read could miss a key or
+# see a half-rebuilt table. The critical sections are a single lookup each,
+# and sharding keeps contention low.
+import threading
+
+from hash_tables.hash_table import HashTable, mixed_hash
+
+_MISSING = object()
+
+
+class ConcurrentHashTable:
+    # Initialize an empty table with a number of shards.
+    # expected_size is spread across the shards to pre-size them.
+    def __init__(self, shards=16, expected_size=0):
+        if shards < 1:
+            raise ValueError("Shard count must be at least 1.")
+        self.shard_count = shards
+        per_shard = -(-expected_size // shards)
+        self.shards = [HashTable(expected_size=per_shard) for _ in range(shards)]
+        # RLocks so a callback passed to compute_if_absent/update may touch the same shard
+        self.locks = [threading.RLock() for _ in range(shards)]
+
+    # Return an unambiguous string representation of the ConcurrentHashTable object.
+    def __repr__(self):
+        return f"ConcurrentHashTable{self}"
+
+    # Return a user-friendly string representation (built from a snapshot).
+    def __str__(self):
+        pairs = ", ".join(f"{key!r}: {value!r}" for key, value in self.snapshot())
+        return "{" + pairs + "}"
+
+    # Return the shard number a key belongs to.
+    # Uses the high 32 bits of the mixed hash, scaled to the shard count. Raw hash() % shards
+    # would put every int key that is a multiple of the shard count in one shard, and the
+    # shards' own tables pick buckets from the low bits, so the two choices stay independent.
+    def _shard(self, key):
+        return ((mixed_hash(key) >> 32) * self.shard_count) >> 32
+
+    # Insert or update a key-value pair.
+    def __setitem__(self, key, value):
+        i = self._shard(key)
+        with self.locks[i]:
+            self.shards[i][key] = value
+
+    # Retrieve the value associated with a key.
+    # Raises KeyError if the key does not exist.
+    def __getitem__(self, key):
+        i = self._shard(key)
+        with self.locks[i]:
+            return self.shards[i][key]
+
+    # Remove a key-value pair.
+    # Raises KeyError if the key does not exist.
+    def __delitem__(self, key):
+        i = self._shard(key)
+        with self.locks[i]:
+            del self.shards[i][key]
+
+    # Return True if the key exists.
+    def __contains__(self, key):
+        i = self._shard(key)
+        with self.locks[i]:
+            return key in self.shards[i]
+
+    # Return the number of key-value pairs.
+    # Shards are counted one at a time, so concurrent writes may be partly included.
+    def __len__(self):
+        total = 0
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                total += len(shard)
+        return total
+
+    # Return the value for a key if it exists.
+    def get(self, key, default=None):
+        i = self._shard(key)
+        with self.locks[i]:
+            return self.shards[i].get(key, default)
+
+    # Return the value for a key, storing default first if the key is missing.
+    def get_or_set(self, key, default):
+        i = self._shard(key)
+        with self.locks[i]:
+            shard = self.shards[i]
+            value = shard.get(key, _MISSING)
+            if value is _MISSING:
+                shard[key] = default
+                value = default
+            return value
+
+    # Return the value for a key, computing it with factory(key) and storing it if the key is missing.
+    # factory runs under the shard lock, so it is called at most once per missing key.
+    def compute_if_absent(self, key, factory):
+        i = self._shard(key)
+        with self.locks[i]:
+            shard = self.shards[i]
+            value = shard.get(key, _MISSING)
+            if value is _MISSING:
+                value = factory(key)
+                shard[key] = value
+            return value
+
+    # Atomically replace the value for a key with func(old value) and return the new value.
+    # If the key is missing, func receives default; without a default a KeyError is raised.
+    #
+    #   counts.update("hits", lambda n: n + 1, default=0)
+    def update(self, key, func, default=_MISSING):
+        i = self._shard(key)
+        with self.locks[i]:
+            shard = self.shards[i]
+            value = shard.get(key, default)
+            if value is _MISSING:
+                raise KeyError(key)
+            value = func(value)
+            shard[key] = value
+            return value
+
+    # Yield (key, value) pairs one shard at a time.
+    # Each shard is copied under its lock and then released before its pairs are yielded,
+    # so writers are only blocked for the copy of a single shard.
+    # The result is consistent per shard, not across the whole table.
+    def snapshot(self):
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                pairs = list(shard.items())
+            yield from pairs
+
+    # Remove all key-value pairs.
+    def reset(self):
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                shard.reset()
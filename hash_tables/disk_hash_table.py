@@ -0,0 +1,383 @@
+# Disk Hash Table
+# Persistent hash table stored in two files and accessed through mmap.
+#   <path>.idx > fixed-width open-addressing index (header + slots of (hash, log offset))
+#   <path>.log > append-only log of (key, value) records
+# Opening a table only maps the two files, so it costs the same for 10 entries or
+# 50 million. Lookups read the index slot and the record straight from the
+# page cache; nothing is loaded up front.
+#
+# Keys and values are bytes or bytes-like (str is encoded as UTF-8; anything else is a TypeError);
+# values are returned as bytes.
+# Hashes are 64-bit BLAKE2b digests, so they are stable across processes
+# (Python's built-in hash() of str/bytes is randomized per process).
+#
+# Updates and deletes never rewrite the log: updates append a new record and
+# point the slot at it, deletes clear the slot (backward shift, no tombstones).
+# compact() rewrites the log with only live records.
+#
+# One process may write at a time. Any number of processes may open the same
+# table read-only ("r") and share its pages. Growing and compacting swap in new
+# files; the writer then stamps the old index header as moved, and open readers
+# see the stamp through their shared mapping and re-map the new files.
+import hashlib
+import mmap
+import os
+import struct
+
+_INDEX_MAGIC = b"PHTIDX01"
+_LOG_MAGIC = b"PHTLOG01"
+# Written over the magic of an index file that has been replaced by a new one
+_MOVED_MAGIC = b"PHTMOVED"
+# magic, generation, capacity, count, live log bytes
+_INDEX_HEADER = struct.Struct("<8sQQQQ")
+# magic, generation
+_LOG_HEADER = struct.Struct("<8sQ")
+# key hash, log offset (0 means empty)
+_SLOT = struct.Struct("<QQ")
+# key length, value length
+_RECORD = struct.Struct("<II")
+
+
+# Stable 64-bit hash of a key.
+def _hash(key):
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+# Convert a key or value (str, or bytes-like) to bytes.
+def _to_bytes(data):
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, (bytearray, memoryview)):
+        return bytes(memoryview(data))
+    raise TypeError("Keys and values must be str or bytes.")
+
+
+class DiskHashTable:
+    # Open or create a table.
+    # mode: "r" read-only (files must exist), "w" read-write (created if missing),
+    #       "n" read-write, always starting from an empty table.
+    # expected_size pre-sizes the index of a newly created table.
+    # max_load_factor is the fraction of index slots used before the index doubles.
+    def __init__(self, path, mode="r", expected_size=0, max_load_factor=0.7):
+        if mode not in ("r", "w", "n"):
+            raise ValueError("Mode must be 'r', 'w' or 'n'.")
+        if not 0 < max_load_factor < 1:
+            raise ValueError("Max load factor must be between 0 and 1.")
+        self.path = path
+        self.mode = mode
+        self.max_load_factor = max_load_factor
+        self.index_path = path + ".idx"
+        self.log_path = path + ".log"
+        exists = os.path.exists(self.index_path) and os.path.exists(self.log_path)
+        if mode == "n" or (mode == "w" and not exists):
+            capacity = 8
+            while expected_size > capacity * max_load_factor:
+                capacity *= 2
+            self._create_files(self.index_path, self.log_path, capacity, generation=1)
+        self._open_files()
+
+    # Create an empty index and log with a given capacity and generation.
+    @staticmethod
+    def _create_files(index_path, log_path, capacity, generation):
+        with open(index_path, "wb") as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, generation, capacity, 0, 0))
+            f.truncate(_INDEX_HEADER.size + capacity * _SLOT.size)
+        with open(log_path, "wb") as f:
+            f.write(_LOG_HEADER.pack(_LOG_MAGIC, generation))
+
+    # Map both files and check that they belong together.
+    def _open_files(self):
+        writable = self.mode != "r"
+        self._index_file = open(self.index_path, "r+b" if writable else "rb")
+        self.index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        magic, generation, self.capacity, _, _ = _INDEX_HEADER.unpack_from(self.index, 0)
+        if magic != _INDEX_MAGIC:
+            raise ValueError(f"{self.index_path} is not a DiskHashTable index.")
+        self._log_reader = open(self.log_path, "rb")
+        self.log = mmap.mmap(self._log_reader.fileno(), 0, access=mmap.ACCESS_READ)
+        log_magic, log_generation = _LOG_HEADER.unpack_from(self.log, 0)
+        if log_magic != _LOG_MAGIC or log_generation != generation:
+            raise ValueError(f"{self.log_path} does not match {self.index_path}.")
+        self._log_writer = open(self.log_path, "ab", buffering=0) if writable else None
+
+    # Unmap and close both files.
+    def close(self):
+        if self.index is None:
+            return
+        self.index.close()
+        self.log.close()
+        self._index_file.close()
+        self._log_reader.close()
+        if self._log_writer is not None:
+            self._log_writer.close()
+        self.index = None
+
+    # Flush index changes to disk (log records are written unbuffered).
+    def flush(self):
+        if self.mode != "r":
+            self.index.flush()
+            os.fsync(self._log_writer.fileno())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Return the number of key-value pairs stored in the table.
+    def __len__(self):
+        self._check_current()
+        return _INDEX_HEADER.unpack_from(self.index, 0)[3]
+
+    # Return the value for a key as bytes.
+    # Raises KeyError if the key does not exist.
+    def __getitem__(self, key):
+        self._check_current()
+        key = _to_bytes(key)
+        _, offset = self._find(key, _hash(key))
+        if offset == 0:
+            raise KeyError(key)
+        return self._read_value(offset)
+
+    # Return True if the key exists.
+    def __contains__(self, key):
+        self._check_current()
+        key = _to_bytes(key)
+        return self._find(key, _hash(key))[1] != 0
+
+    # Insert or update a key-value pair.
+    # The record is appended to the log and the index slot points at it.
+    def __setitem__(self, key, value):
+        self._check_writable()
+        key = _to_bytes(key)
+        value = _to_bytes(value)
+        h = _hash(key)
+        slot, old_offset = self._find(key, h)
+        if old_offset == 0 and len(self) + 1 > self.capacity * self.max_load_factor:
+            self._grow()
+            slot, old_offset = self._find(key, h)
+        offset = self._append_record(key, value)
+        _SLOT.pack_into(self.index, self._slot_position(slot), h, offset)
+        count, live_bytes = self._counts()
+        if old_offset == 0:
+            count += 1
+        else:
+            live_bytes -= self._record_size(old_offset)
+        self._set_counts(count, live_bytes + _RECORD.size + len(key) + len(value))
+
+    # Remove a key-value pair.
+    # Raises KeyError if the key does not exist.
+    def __delitem__(self, key):
+        self._check_writable()
+        key = _to_bytes(key)
+        slot, offset = self._find(key, _hash(key))
+        if offset == 0:
+            raise KeyError(key)
+        count, live_bytes = self._counts()
+        self._set_counts(count - 1, live_bytes - self._record_size(offset))
+        # Backward shift deletion for linear probing:
+        # move later entries of the probe run into the hole unless their home slot lies after it
+        mask = self.capacity - 1
+        hole = slot
+        current = slot
+        while True:
+            current = (current + 1) & mask
+            h, entry_offset = _SLOT.unpack_from(self.index, self._slot_position(current))
+            if entry_offset == 0:
+                break
+            home = h & mask
+            if (current - home) & mask >= (current - hole) & mask:
+                _SLOT.pack_into(self.index, self._slot_position(hole), h, entry_offset)
+                hole = current
+        _SLOT.pack_into(self.index, self._slot_position(hole), 0, 0)
+
+    # Iterate over keys (in index slot order).
+    def __iter__(self):
+        return self.keys()
+
+    # Return an unambiguous string representation of the DiskHashTable object.
+    def __repr__(self):
+        return f"DiskHashTable({self.path!r}, mode={self.mode!r}, {len(self)} entries)"
+
+    # Return the value for a key if it exists.
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    # Yield the log offsets of all live records, in index slot order.
+    def _offsets(self):
+        self._check_current()
+        for slot in range(self.capacity):
+            offset = _SLOT.unpack_from(self.index, self._slot_position(slot))[1]
+            if offset != 0:
+                yield offset
+
+    # Return an iterator over all keys.
+    def keys(self):
+        return (self._read_key(offset) for offset in self._offsets())
+
+    # Return an iterator over all values.
+    def values(self):
+        return (self._read_value(offset) for offset in self._offsets())
+
+    # Return an iterator over all (key, value) pairs.
+    def items(self):
+        return ((self._read_key(offset), self._read_value(offset)) for offset in self._offsets())
+
+    # Return diagnostics: size, capacity, load_factor, log_bytes, live_bytes, garbage_ratio.
+    # A high garbage_ratio means compact() would reclaim a lot of space.
+    def stats(self):
+        self._check_current()
+        count, live_bytes = self._counts()
+        log_bytes = os.path.getsize(self.log_path) - _LOG_HEADER.size
+        return {
+            "size": count,
+            "capacity": self.capacity,
+            "load_factor": count / self.capacity,
+            "log_bytes": log_bytes,
+            "live_bytes": live_bytes,
+            "garbage_ratio": 1 - live_bytes / log_bytes if log_bytes else 0.0,
+        }
+
+    # Rewrite the log with only live records and rebuild the index to match.
+    # Readers that are open during compaction keep reading the old files (they stay valid
+    # until closed) and switch to the compacted table on their next call.
+    def compact(self):
+        self._check_writable()
+        generation = _INDEX_HEADER.unpack_from(self.index, 0)[1] + 1
+        index_tmp = self.index_path + ".tmp"
+        log_tmp = self.log_path + ".tmp"
+        capacity = 8
+        while len(self) > capacity * self.max_load_factor:
+            capacity *= 2
+        self._create_files(index_tmp, log_tmp, capacity, generation)
+        count = 0
+        live_bytes = 0
+        with open(index_tmp, "r+b") as index_file, open(log_tmp, "ab") as log_file:
+            new_index = mmap.mmap(index_file.fileno(), 0)
+            position = _LOG_HEADER.size
+            for offset in self._offsets():
+                key = self._read_key(offset)
+                value = self._read_value(offset)
+                record = _RECORD.pack(len(key), len(value)) + key + value
+                log_file.write(record)
+                self._insert_slot(new_index, capacity, _hash(key), position)
+                position += len(record)
+                count += 1
+                live_bytes += len(record)
+            _INDEX_HEADER.pack_into(new_index, 0, _INDEX_MAGIC, generation, capacity, count, live_bytes)
+            new_index.flush()
+            new_index.close()
+        os.replace(log_tmp, self.log_path)
+        os.replace(index_tmp, self.index_path)
+        # Both new files are in place, so readers may now follow the stamp
+        self.index[:len(_MOVED_MAGIC)] = _MOVED_MAGIC
+        self.close()
+        self._open_files()
+
+    # Re-map the files if another process has replaced the index (grow or compact).
+    # The old file stays mapped until then, so a stale reader still sees a consistent table.
+    def _check_current(self):
+        if self.index[:len(_MOVED_MAGIC)] == _MOVED_MAGIC:
+            self.close()
+            self._open_files()
+
+    # Raise an error if the table was opened read-only.
+    def _check_writable(self):
+        if self.mode == "r":
+            raise PermissionError("DiskHashTable was opened read-only.")
+
+    # Byte position of a slot inside the index file.
+    def _slot_position(self, slot):
+        return _INDEX_HEADER.size + slot * _SLOT.size
+
+    # Return (count, live log bytes) from the index header.
+    def _counts(self):
+        return _INDEX_HEADER.unpack_from(self.index, 0)[3:5]
+
+    # Store count and live log bytes in the index header.
+    def _set_counts(self, count, live_bytes):
+        struct.pack_into("<QQ", self.index, 24, count, live_bytes)
+
+    # Return (slot, log offset) for a key.
+    # If the key is missing the offset is 0 and the slot is the empty slot where it would go.
+    def _find(self, key, h):
+        mask = self.capacity - 1
+        slot = h & mask
+        while True:
+            slot_hash, offset = _SLOT.unpack_from(self.index, self._slot_position(slot))
+            if offset == 0:
+                return slot, 0
+            if slot_hash == h and self._read_key(offset) == key:
+                return slot, offset
+            slot = (slot + 1) & mask
+
+    # Put (hash, offset) into the first free slot of an index map (used when rebuilding).
+    def _insert_slot(self, index, capacity, h, offset):
+        mask = capacity - 1
+        slot = h & mask
+        while _SLOT.unpack_from(index, self._slot_position(slot))[1] != 0:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(index, self._slot_position(slot), h, offset)
+
+    # Double the index capacity by writing a new index file and swapping it in.
+    def _grow(self):
+        capacity = self.capacity * 2
+        header = _INDEX_HEADER.unpack_from(self.index, 0)
+        index_tmp = self.index_path + ".tmp"
+        with open(index_tmp, "wb") as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, header[1], capacity, header[3], header[4]))
+            f.truncate(_INDEX_HEADER.size + capacity * _SLOT.size)
+        with open(index_tmp, "r+b") as f:
+            new_index = mmap.mmap(f.fileno(), 0)
+            for slot in range(self.capacity):
+                h, offset = _SLOT.unpack_from(self.index, self._slot_position(slot))
+                if offset != 0:
+                    self._insert_slot(new_index, capacity, h, offset)
+            new_index.flush()
+            new_index.close()
+        os.replace(index_tmp, self.index_path)
+        self.index[:len(_MOVED_MAGIC)] = _MOVED_MAGIC
+        self.index.close()
+        self._index_file.close()
+        self._index_file = open(self.index_path, "r+b")
+        self.index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_WRITE)
+        self.capacity = capacity
+
+    # Append a record to the log and return its offset.
+    def _append_record(self, key, value):
+        offset = os.fstat(self._log_writer.fileno()).st_size
+        self._log_writer.write(_RECORD.pack(len(key), len(value)) + key + value)
+        return offset
+
+    # Make sure the log map covers a byte range, remapping if the log has grown.
+    def _log_view(self, end):
+        if end > len(self.log):
+            self.log.close()
+            self.log = mmap.mmap(self._log_reader.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.log
+
+    # Return the key stored in the record at an offset.
+    def _read_key(self, offset):
+        log = self._log_view(offset + _RECORD.size)
+        key_length, value_length = _RECORD.unpack_from(log, offset)
+        start = offset + _RECORD.size
+        log = self._log_view(start + key_length + value_length)
+        return log[start:start + key_length]
+
+    # Return the value stored in the record at an offset.
+    def _read_value(self, offset):
+        log = self._log_view(offset + _RECORD.size)
+        key_length, value_length = _RECORD.unpack_from(log, offset)
+        start = offset + _RECORD.size + key_length
+        log = self._log_view(start + value_length)
+        return log[start:start + value_length]
+
+    # Total size of the record at an offset.
+    def _record_size(self, offset):
+        key_length, value_length = _RECORD.unpack_from(self._log_view(offset + _RECORD.size), offset)
+        return _RECORD.size + key_length + value_length
@@ -1,55 +1,275 @@
 # Hash Table
+# Open addressing with Robin Hood hashing.
+# The table is split into two parts (like CPython's compact dict):
+#   index   > array.array of slots, each holding an entry number or -1 (empty)
+#   entries > parallel lists of hashes, keys and values in insertion order
+# Robin Hood insertion keeps probe lengths even by letting the entry that is
+# further from its home slot take the slot. Deletion shifts the following
+# entries back one slot, so the index never needs tombstones.
+import array
+import collections.abc
+
+_EMPTY = -1
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+# Marks a deleted entry in the entries lists until the next compaction
+_DELETED = object()
+
+
+# Scramble hash(key) so the low bits used for the home slot depend on every bit.
+# Python's int hashes are the ints themselves, so keys like i * 1024 would all share
+# a home slot without this. Both steps are bijective, so equal mixed hashes still
+# mean equal hash() values. ConcurrentHashTable picks shards from the same mixed hash.
+def mixed_hash(key):
+    h = (hash(key) * 0x9E3779B97F4A7C15) & _MASK_64
+    return h ^ (h >> 32)
+
 
 class HashTable:
     # Initialize an empty hash table.
-    def __init__(self):
-        self.table = {}
+    # expected_size pre-sizes the index so that many keys fit without resizing.
+    # max_load_factor is the fraction of index slots that may be used before growing.
+    def __init__(self, expected_size=0, max_load_factor=0.75):
+        if not 0 < max_load_factor < 1:
+            raise ValueError("Max load factor must be between 0 and 1.")
+        if expected_size < 0:
+            raise ValueError("Expected size cannot be negative.")
+        self.max_load_factor = max_load_factor
+        self.resize_count = 0
+        self._build(self._capacity_for(expected_size))
 
     # Return an unambiguous string representation of the HashTable object.
     def __repr__(self):
-        return f"HashTable{self.table}"
+        return f"HashTable{self}"
 
     # Insert or update a key-value pair in the hash table.
     def __setitem__(self, key, value):
-        self.table[key] = value
+        h = mixed_hash(key)
+        entry = self._lookup(key, h)
+        if entry != _EMPTY:
+            self._values[entry] = value
+            return
+        if self._size + 1 > self.capacity * self.max_load_factor:
+            self._rebuild(self.capacity * 2)
+            self.resize_count += 1
+        elif len(self._keys) >= self.capacity:
+            # Too many deleted entries: compact them away without growing
+            self._rebuild(self.capacity)
+        self._hashes.append(h)
+        self._keys.append(key)
+        self._values.append(value)
+        self._insert_index(len(self._keys) - 1, h)
+        self._size += 1
 
     # Retrieve the value associated with a key.
+    # Raises KeyError if the key does not exist.
     def __getitem__(self, key):
-        return self.table[key]
+        entry = self._lookup(key, mixed_hash(key))
+        if entry == _EMPTY:
+            raise KeyError(key)
+        return self._values[entry]
 
     # Remove a key-value pair from the hash table.
+    # Raises KeyError if the key does not exist.
     def __delitem__(self, key):
-        del self.table[key]
+        h = mixed_hash(key)
+        slot = self._find_slot(key, h)
+        if slot == _EMPTY:
+            raise KeyError(key)
+        entry = self.index[slot]
+        self._hashes[entry] = None
+        self._keys[entry] = _DELETED
+        self._values[entry] = None
+        self._size -= 1
+        # Backward shift: pull following entries one slot closer to home
+        mask = self.capacity - 1
+        nxt = (slot + 1) & mask
+        while self.index[nxt] != _EMPTY and self._distance(self.index[nxt], nxt) > 0:
+            self.index[slot] = self.index[nxt]
+            slot = nxt
+            nxt = (nxt + 1) & mask
+        self.index[slot] = _EMPTY
 
     # Return True if the key exists in the hash table.
     def __contains__(self, key):
-        return key in self.table
+        return self._lookup(key, mixed_hash(key)) != _EMPTY
 
     # Return the number of key-value pairs stored in the hash table.
     def __len__(self):
-        return len(self.table)
+        return self._size
+
+    # Iterate over keys in insertion order.
+    def __iter__(self):
+        return (self._keys[entry] for entry in self._live_entries())
 
     # Return a user-friendly string representation of the hash table.
     # Intended for readable display output.
     def __str__(self):
-        return str(self.table)
+        pairs = ", ".join(f"{key!r}: {value!r}" for key, value in self.items())
+        return "{" + pairs + "}"
+
+    # Smallest power-of-two index size that holds n keys under the max load factor.
+    def _capacity_for(self, n):
+        capacity = 8
+        while n > capacity * self.max_load_factor:
+            capacity *= 2
+        return capacity
+
+    # Create an empty index of a given capacity and empty entries.
+    def _build(self, capacity):
+        self.capacity = capacity
+        self.index = self._new_index(capacity)
+        self._hashes = []
+        self._keys = []
+        self._values = []
+        self._size = 0
+
+    # Create an index array filled with empty slots.
+    # Uses the smallest integer type that can hold every entry number.
+    def _new_index(self, capacity):
+        if capacity <= 2 ** 7:
+            typecode = "b"
+        elif capacity <= 2 ** 15:
+            typecode = "h"
+        elif capacity <= 2 ** 31:
+            typecode = "i"
+        else:
+            typecode = "q"
+        return array.array(typecode, [_EMPTY]) * capacity
+
+    # Rebuild the index at a new capacity, dropping deleted entries.
+    def _rebuild(self, capacity):
+        live = [i for i, key in enumerate(self._keys) if key is not _DELETED]
+        self._hashes = [self._hashes[i] for i in live]
+        self._keys = [self._keys[i] for i in live]
+        self._values = [self._values[i] for i in live]
+        self.capacity = capacity
+        self.index = self._new_index(capacity)
+        for entry, h in enumerate(self._hashes):
+            self._insert_index(entry, h)
+
+    # Distance between an entry's home slot and the slot it currently sits in.
+    def _distance(self, entry, slot):
+        return (slot - self._hashes[entry]) & (self.capacity - 1)
+
+    # Place an entry number into the index using Robin Hood displacement.
+    def _insert_index(self, entry, h):
+        mask = self.capacity - 1
+        slot = h & mask
+        dist = 0
+        while True:
+            current = self.index[slot]
+            if current == _EMPTY:
+                self.index[slot] = entry
+                return
+            current_dist = self._distance(current, slot)
+            if current_dist < dist:
+                # The resident is closer to home: take its slot and carry it on
+                self.index[slot] = entry
+                entry = current
+                dist = current_dist
+            slot = (slot + 1) & mask
+            dist += 1
+
+    # Return the index slot holding a key, or -1 if the key is missing.
+    # Stops early once the probe passes entries that are closer to home than the key would be.
+    def _find_slot(self, key, h):
+        mask = self.capacity - 1
+        slot = h & mask
+        dist = 0
+        while True:
+            entry = self.index[slot]
+            if entry == _EMPTY or self._distance(entry, slot) < dist:
+                return _EMPTY
+            if self._hashes[entry] == h:
+                stored = self._keys[entry]
+                if stored is key or stored == key:
+                    return slot
+            slot = (slot + 1) & mask
+            dist += 1
+
+    # Return the entry number holding a key, or -1 if the key is missing.
+    def _lookup(self, key, h):
+        slot = self._find_slot(key, h)
+        if slot == _EMPTY:
+            return _EMPTY
+        return self.index[slot]
+
+    # Yield the entry numbers of live entries in insertion order.
+    # Raises RuntimeError if the table changes size during iteration.
+    def _live_entries(self):
+        size = self._size
+        keys = self._keys
+        for entry in range(len(keys)):
+            if self._size != size or self._keys is not keys:
+                raise RuntimeError("HashTable changed size during iteration.")
+            if keys[entry] is not _DELETED:
+                yield entry
 
     # Return the value for a key if it exists.
     def get(self, key, default=None):
-        return self.table.get(key, default)
+        entry = self._lookup(key, mixed_hash(key))
+        if entry == _EMPTY:
+            return default
+        return self._values[entry]
 
-    # Return a dynamic view of all keys in the hash table.
+    # Return a dynamic view of all keys in the hash table, in insertion order.
     def keys(self):
-        return self.table.keys()
+        return _KeysView(self)
 
-    # Return a dynamic view of all values in the hash table.
+    # Return a dynamic view of all values in the hash table, in insertion order.
     def values(self):
-        return self.table.values()
+        return _ValuesView(self)
 
-    # Return a dynamic view of all key-value pairs as (key, value) tuples.
+    # Return a dynamic view of all key-value pairs as (key, value) tuples, in insertion order.
     def items(self):
-        return self.table.items()
+        return _ItemsView(self)
+
+    # Return diagnostics about the table:
+    #   size, capacity, load_factor, resize_count, deleted (entries awaiting compaction),
+    #   max_probe, mean_probe and probe_histogram ({probe length: number of keys}).
+    # Long probes concentrated in a few keys point to clustering on hot hashes.
+    def stats(self):
+        histogram = {}
+        for slot in range(self.capacity):
+            entry = self.index[slot]
+            if entry != _EMPTY:
+                dist = self._distance(entry, slot)
+                histogram[dist] = histogram.get(dist, 0) + 1
+        total = sum(dist * count for dist, count in histogram.items())
+        return {
+            "size": self._size,
+            "capacity": self.capacity,
+            "load_factor": self._size / self.capacity,
+            "resize_count": self.resize_count,
+            "deleted": len(self._keys) - self._size,
+            "max_probe": max(histogram, default=0),
+            "mean_probe": total / self._size if self._size else 0.0,
+            "probe_histogram": dict(sorted(histogram.items())),
+        }
 
     # Remove all key-value pairs from the hash table.
+    # The index keeps its current capacity.
     def reset(self):
-        self.table.clear()
+        self._build(self.capacity)
+
+
+# Views returned by keys(), values() and items(). Like dict views they reflect later
+# changes and support len(), in and repeated iteration; keys and items also support
+# set operations. Iteration reads the entry lists directly instead of looking up
+# every key again.
+class _KeysView(collections.abc.KeysView):
+    def __iter__(self):
+        table = self._mapping
+        return (table._keys[entry] for entry in table._live_entries())
+
+
+class _ValuesView(collections.abc.ValuesView):
+    def __iter__(self):
+        table = self._mapping
+        return (table._values[entry] for entry in table._live_entries())
+
+
+class _ItemsView(collections.abc.ItemsView):
+    def __iter__(self):
+        table = self._mapping
+        return ((table._keys[entry], table._values[entry]) for entry in table._live_entries())
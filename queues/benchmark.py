@@ -0,0 +1,44 @@
+# Queue Benchmark
+# Run from the repository root: python -m queues.benchmark
+# Drains queues of increasing size and prints the cost per item.
+# With the circular buffer the cost per item stays flat (linear total time).
+# The old DynamicArrays approach (remove_at_index(0)) is shown for comparison at small sizes only.
+import time
+
+from arrays_lists.dynamic_arrays import DynamicArrays
+from queues.queue import Queue
+
+
+# Fill and drain a ring-buffer Queue, return the drain time in seconds
+def drain_queue(n):
+    q = Queue()
+    for item in range(n):
+        q.enqueue(item)
+    start = time.perf_counter()
+    while not q.is_empty():
+        q.dequeue()
+    return time.perf_counter() - start
+
+
+# Fill and drain a DynamicArrays by removing index 0 (previous Queue behaviour)
+def drain_shifting(n):
+    arr = DynamicArrays()
+    for item in range(n):
+        arr.append(item)
+    start = time.perf_counter()
+    while len(arr) > 0:
+        arr.remove_at_index(0)
+    return time.perf_counter() - start
+
+
+# Ring buffer: 125k to 1M items
+print("# Ring-buffer Queue drain")
+for n in (125_000, 250_000, 500_000, 1_000_000):
+    elapsed = drain_queue(n)
+    print(f"n={n:>9,}  total={elapsed:8.3f}s  per item={elapsed / n * 1e9:8.1f}ns")
+
+# Shifting DynamicArrays: quadratic, so only small sizes
+print("\n# Shifting DynamicArrays drain (old behaviour)")
+for n in (2_000, 4_000, 8_000):
+    elapsed = drain_shifting(n)
+    print(f"n={n:>9,}  total={elapsed:8.3f}s  per item={elapsed / n * 1e9:8.1f}ns")
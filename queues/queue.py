@@ -1,33 +1,80 @@
 # Queue
-import arrays_lists.dynamic_arrays as da
+# Implemented as a circular buffer (ring buffer).
+# head points at the front element, the back slot is found by wrapping
+# (head + length) around the capacity, so no element is ever shifted.
 
 
 class Queue:
-    # Initialize an empty queue using DynamicArrays for storage
-    def __init__(self):
-        self.data = da.DynamicArrays()
+    # Initialize an empty queue with a fixed starting capacity.
+    # max_capacity optionally bounds the queue; enqueue on a full bounded queue raises IndexError.
+    def __init__(self, max_capacity=None):
+        if max_capacity is not None and max_capacity < 1:
+            raise ValueError("Maximum capacity must be at least 1.")
+        self.max_capacity = max_capacity
+        self.capacity = self._initial_capacity()
+        self.head = 0
+        self.length = 0
+        self.arr = [None] * self.capacity
 
     # Return the number of elements currently in the queue
     def __len__(self):
-        return len(self.data)
+        return self.length
 
     # Return a readable string representation of the queue
+    # Elements are shown front to back (no None padding)
     def __str__(self):
-        return f"Queue: {self.data.arr}"
+        return f"Queue: {self._ordered()}"
+
+    # Starting capacity, never larger than the optional maximum
+    def _initial_capacity(self):
+        if self.max_capacity is None:
+            return 4
+        return min(4, self.max_capacity)
+
+    # Return the active elements in FIFO order
+    def _ordered(self):
+        end = self.head + self.length
+        if end <= self.capacity:
+            return self.arr[self.head:end]
+        return self.arr[self.head:] + self.arr[:end - self.capacity]
+
+    # Copy the active elements into a new underlying list of the given capacity.
+    # The front element moves back to index 0, which unwraps the buffer.
+    def resize(self, capacity):
+        new_arr = self._ordered()
+        new_arr.extend([None] * (capacity - self.length))
+        self.arr = new_arr
+        self.capacity = capacity
+        self.head = 0
 
     # Add a value to the back of the queue (FIFO insertion)
+    # Doubles the capacity when full (up to max_capacity)
+    # Raises IndexError if a bounded queue is full
     def enqueue(self, value):
-        self.data.append(value)
+        if self.length == self.capacity:
+            if self.max_capacity is not None and self.capacity >= self.max_capacity:
+                raise IndexError("Cannot add to full queue.")
+            new_capacity = self.capacity * 2
+            if self.max_capacity is not None:
+                new_capacity = min(new_capacity, self.max_capacity)
+            self.resize(new_capacity)
+        tail = (self.head + self.length) % self.capacity
+        self.arr[tail] = value
+        self.length += 1
 
     # Remove and return the value at the front of the queue
+    # Halves the capacity when usage drops to one quarter
     # Raises IndexError if the queue is empty
     def dequeue(self):
-        if not self.is_empty():
-            value = self.data.access_element_by_index(0)
-            self.data.remove_at_index(0)
-            return value
-        else:
+        if self.is_empty():
             raise IndexError("Cannot remove from empty queue.")
+        value = self.arr[self.head]
+        self.arr[self.head] = None
+        self.head = (self.head + 1) % self.capacity
+        self.length -= 1
+        if (self.length <= (self.capacity // 4)) and (self.capacity > 4):
+            self.resize(self.capacity // 2)
+        return value
 
     # Return the value at the front without removing it
     # Raises IndexError if the queue is empty
@@ -35,12 +82,19 @@ class Queue:
         if self.is_empty():
             raise IndexError("Cannot peek on empty queue. ")
         else:
-            return self.data.access_element_by_index(0)
+            return self.arr[self.head]
 
     # Return True if the queue contains no elements
     def is_empty(self):
         return len(self) == 0
 
-    # Reset all values to default
+    # Return True if a bounded queue cannot accept another element
+    def is_full(self):
+        return self.max_capacity is not None and self.length == self.max_capacity
+
+    # Reset all values to default (max_capacity is kept)
     def reset(self):
-        self.data.reset()
+        self.capacity = self._initial_capacity()
+        self.head = 0
+        self.length = 0
+        self.arr = [None] * self.capacity
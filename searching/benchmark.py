@@ -0,0 +1,94 @@
+# Searching Benchmark
+# Run from the repository root: python -m searching.benchmark
+# Many lookups against one large sorted array, then full scans of a large unsorted buffer.
+import bisect
+import time
+
+import numpy
+
+from searching.binary_search import EytzingerArray, bisect_left, search_many
+from searching.linear_search import find_each, linear_search
+
+N = 20_000_000
+QUERIES = 2_000_000
+# The Python loops are slow, so they run on fewer queries and are scaled up
+LOOP_QUERIES = 20_000
+SCAN_N = 32_000_000
+LOOP_SCAN = 1_000_000
+NEEDLES = 16
+
+rng = numpy.random.default_rng(0)
+values = numpy.sort(rng.integers(0, 2 ** 40, N))
+queries = rng.integers(0, 2 ** 40, QUERIES)
+values_list = values.tolist()
+loop_queries = queries[:LOOP_QUERIES].tolist()
+
+print(f"# {QUERIES:,} lookups in {N:,} sorted int64 values")
+
+start = time.perf_counter()
+for query in loop_queries:
+    bisect_left(values_list, query)
+loop_time = (time.perf_counter() - start) * QUERIES / LOOP_QUERIES
+print(f"loop over bisect_left:       {loop_time:8.3f}s  (estimated from {LOOP_QUERIES:,} queries)")
+
+start = time.perf_counter()
+for query in loop_queries:
+    bisect.bisect_left(values_list, query)
+stdlib_time = (time.perf_counter() - start) * QUERIES / LOOP_QUERIES
+print(f"loop over bisect (C):        {stdlib_time:8.3f}s  (estimated from {LOOP_QUERIES:,} queries)")
+
+start = time.perf_counter()
+expected = numpy.searchsorted(values, queries)
+plain_time = time.perf_counter() - start
+print(f"numpy.searchsorted:          {plain_time:8.3f}s")
+
+start = time.perf_counter()
+positions = search_many(values, queries)
+many_time = time.perf_counter() - start
+print(f"search_many:                 {many_time:8.3f}s  ({plain_time / many_time:.1f}x)")
+assert (positions == expected).all()
+
+start = time.perf_counter()
+layout = EytzingerArray(values)
+build_time = time.perf_counter() - start
+start = time.perf_counter()
+positions = layout.search_many(queries)
+eytzinger_time = time.perf_counter() - start
+print(f"EytzingerArray.search_many:  {eytzinger_time:8.3f}s  ({plain_time / eytzinger_time:.1f}x, built in {build_time:.3f}s)")
+assert (positions == expected).all()
+
+print()
+scan = rng.integers(0, 10 ** 9, SCAN_N)
+scan_list = scan.tolist()
+missing = -1
+print(f"# Scan {SCAN_N:,} unsorted int64 values ({scan.nbytes / 1e9:.2f} GB) for a missing value")
+
+start = time.perf_counter()
+for item in scan_list[:LOOP_SCAN]:
+    if item == missing:
+        break
+loop_time = (time.perf_counter() - start) * SCAN_N / LOOP_SCAN
+print(f"Python loop:                 {loop_time:8.3f}s  (estimated from {LOOP_SCAN:,} items)")
+
+start = time.perf_counter()
+linear_search(scan_list, missing)
+index_time = time.perf_counter() - start
+print(f"list.index:                  {index_time:8.3f}s")
+
+start = time.perf_counter()
+linear_search(scan, missing)
+chunked_time = time.perf_counter() - start
+print(f"linear_search:               {chunked_time:8.3f}s  ({scan.nbytes / chunked_time / 1e9:.1f} GB/s)")
+
+needles = list(range(-NEEDLES, 0))
+start = time.perf_counter()
+for needle in needles:
+    linear_search(scan, needle)
+separate_time = time.perf_counter() - start
+label = f"{NEEDLES} x linear_search:"
+print(f"{label:<29}{separate_time:8.3f}s")
+start = time.perf_counter()
+find_each(scan, needles)
+each_time = time.perf_counter() - start
+label = f"find_each, {NEEDLES} needles:"
+print(f"{label:<29}{each_time:8.3f}s")
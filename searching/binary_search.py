@@ -0,0 +1,262 @@
+# Binary Search
+# Searches over sorted sequences (lists, DynamicArrays, array.array, NumPy arrays).
+#   bisect_left / bisect_right > insertion points, with an optional key
+#   binary_search              > index of a value, or -1
+#   search_many / find_many    > many queries at once, vectorized with NumPy
+#   EytzingerArray             > cache-friendly layout for very large arrays
+#   interpolation_search       > for uniformly distributed numeric keys
+#   exponential_search         > for targets near the start, or unknown length
+import array
+import operator
+
+from arrays_lists.dynamic_arrays import DynamicArrays
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# search_many sorts the queries first once both sides are at least this large
+SORT_QUERIES_ARRAY = 2 ** 16
+SORT_QUERIES_COUNT = 2 ** 10
+
+
+def bisect_left(arr, x, lo=0, hi=None, key=None):
+    # Returns the first index where x could be inserted keeping arr sorted
+    # (before any items equal to x). key, if given, is applied to the items of arr, not to x.
+    if lo < 0:
+        raise ValueError("lo must be non-negative.")
+    if hi is None:
+        hi = len(arr)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        item = arr[mid] if key is None else key(arr[mid])
+        if item < x:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def bisect_right(arr, x, lo=0, hi=None, key=None):
+    # Returns the last index where x could be inserted keeping arr sorted
+    # (after any items equal to x). key, if given, is applied to the items of arr, not to x.
+    if lo < 0:
+        raise ValueError("lo must be non-negative.")
+    if hi is None:
+        hi = len(arr)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        item = arr[mid] if key is None else key(arr[mid])
+        if x < item:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def binary_search(arr, x, key=None):
+    # Returns the index of the first item equal to x (compared through key), or -1.
+    i = bisect_left(arr, x, key=key)
+    if i < len(arr) and (arr[i] if key is None else key(arr[i])) == x:
+        return i
+    return -1
+
+
+def search_many(sorted_arr, queries, side="left"):
+    # Returns the insertion point of every query as a NumPy int64 array, like calling
+    # bisect_left (side="left") or bisect_right (side="right") once per query. Requires NumPy.
+    # Queries are answered in sorted order: consecutive searches then walk nearby
+    # paths and the array stays in cache, which is many times faster on large arrays.
+    if side not in ("left", "right"):
+        raise ValueError("side must be 'left' or 'right'.")
+    values = _as_array(sorted_arr, "search_many")
+    queries = _as_array(queries, "search_many")
+    if len(values) < SORT_QUERIES_ARRAY or len(queries) < SORT_QUERIES_COUNT:
+        return numpy.searchsorted(values, queries, side=side).astype(numpy.int64)
+    order = numpy.argsort(queries)
+    positions = numpy.empty(len(queries), dtype=numpy.int64)
+    positions[order] = numpy.searchsorted(values, queries[order], side=side)
+    return positions
+
+
+def find_many(sorted_arr, queries):
+    # Returns, for every query, the index of the first equal item or -1, as a NumPy int64 array.
+    values = _as_array(sorted_arr, "find_many")
+    queries = _as_array(queries, "find_many")
+    positions = search_many(values, queries)
+    found = positions < len(values)
+    found[found] = values[positions[found]] == queries[found]
+    return numpy.where(found, positions, -1)
+
+
+# Returns data as a NumPy array, without copying NumPy arrays, array.array or typed DynamicArrays.
+def _as_array(data, name):
+    if numpy is None:
+        raise ImportError(f"{name}() requires NumPy.")
+    if isinstance(data, array.array):
+        return numpy.asarray(memoryview(data))
+    if isinstance(data, DynamicArrays):
+        if data.typecode is None:
+            return numpy.asarray(data.arr[:data.length])
+        return numpy.asarray(data.view())
+    return numpy.asarray(data)
+
+
+# Sorted values stored in Eytzinger (BFS) order: the root at index 1, and the
+# children of node k at 2k and 2k + 1, like a binary heap.
+# A plain binary search jumps across the whole array, so on 100M entries almost
+# every step is a cache miss. In this layout the first levels of every search share
+# the same few cache lines, and the next nodes to visit sit next to each other.
+# The search is branchless: k = 2k + (tree[k] < x) at every level.
+# The array is padded with its largest value up to a complete tree of 2^depth - 1
+# nodes, so every search takes exactly depth steps, and after the last step
+# k - 2^depth is the number of values < x.
+class EytzingerArray:
+    # Builds the layout from sorted values (any sequence search_many accepts). Requires NumPy.
+    def __init__(self, sorted_values):
+        values = _as_array(sorted_values, "EytzingerArray")
+        if values.ndim != 1:
+            raise ValueError("Values must be 1-D.")
+        self.n = len(values)
+        self.depth = self.n.bit_length()
+        size = 2 ** self.depth - 1
+        padded = numpy.empty(size, dtype=values.dtype)
+        padded[:self.n] = values
+        if size > self.n:
+            padded[self.n:] = values[-1]
+        # Node k sits at level l = floor(log2 k), position p = k - 2^l within the level,
+        # and holds in-order (sorted) index (2p + 1) * 2^(depth - 1 - l) - 1
+        nodes = numpy.arange(1, size + 1, dtype=numpy.int64)
+        levels = numpy.frexp(nodes)[1].astype(numpy.int64) - 1
+        positions = nodes - (numpy.int64(1) << levels)
+        in_order = (2 * positions + 1) * (numpy.int64(1) << (self.depth - 1 - levels)) - 1
+        self.tree = numpy.empty(size + 1, dtype=values.dtype)
+        self.tree[1:] = padded[in_order]
+        if size:
+            self.tree[0] = self.tree[1]
+
+    # Returns the number of values (without padding).
+    def __len__(self):
+        return self.n
+
+    # Returns True if x is one of the values.
+    def __contains__(self, x):
+        i = self.bisect_left(x)
+        return i < self.n and self.value_at(i) == x
+
+    # Returns the value at a sorted index.
+    def value_at(self, i):
+        if not 0 <= i < self.n:
+            raise IndexError("Index entered is out of bounds.")
+        # The in-order index i + 1 has t trailing zeros: the node is t levels above the leaves
+        t = ((i + 1) & -(i + 1)).bit_length() - 1
+        return self.tree[2 ** (self.depth - 1 - t) + ((i + 1) >> (t + 1))]
+
+    # Returns the number of values < x (same as bisect_left on the sorted values).
+    def bisect_left(self, x):
+        tree = self.tree
+        k = 1
+        for _ in range(self.depth):
+            k = 2 * k + (tree[k] < x)
+        return int(min(k - 2 ** self.depth, self.n))
+
+    # Returns the number of values <= x (same as bisect_right on the sorted values).
+    def bisect_right(self, x):
+        tree = self.tree
+        k = 1
+        for _ in range(self.depth):
+            k = 2 * k + (not x < tree[k])
+        return int(min(k - 2 ** self.depth, self.n))
+
+    # Vectorized search of many queries: every query takes one step per level together.
+    # Returns the insertion points as a NumPy int64 array (side as in search_many).
+    def search_many(self, queries, side="left"):
+        if side not in ("left", "right"):
+            raise ValueError("side must be 'left' or 'right'.")
+        queries = _as_array(queries, "search_many")
+        k = numpy.ones(len(queries), dtype=numpy.int64)
+        for _ in range(self.depth):
+            nodes = self.tree[k]
+            k <<= 1
+            k += (nodes < queries) if side == "left" else (nodes <= queries)
+        return numpy.minimum(k - 2 ** self.depth, self.n)
+
+
+def interpolation_search(arr, x):
+    # Returns the index of the first item equal to x, or -1. arr holds sorted numbers.
+    # Guesses the position from the value, like looking up a name in a phone book:
+    # O(log log n) probes on uniformly distributed keys.
+    # Skewed data could make it O(n), so after log2(n) guesses that do not finish,
+    # it falls back to binary search on the remaining range.
+    lo, hi = 0, len(arr) - 1
+    guesses = max(1, len(arr).bit_length())
+    while lo <= hi and arr[lo] <= x <= arr[hi]:
+        if guesses == 0:
+            i = bisect_left(arr, x, lo, hi + 1)
+            return i if i <= hi and arr[i] == x else -1
+        guesses -= 1
+        if arr[hi] == arr[lo]:
+            return lo
+        # Python ints/floats: NumPy int64 products could overflow and pick a wrong probe
+        low, high, target = _plain_number(arr[lo]), _plain_number(arr[hi]), _plain_number(x)
+        if isinstance(low, int) and isinstance(high, int) and isinstance(target, int):
+            mid = lo + (target - low) * (hi - lo) // (high - low)
+        else:
+            mid = lo + int((target - low) * (hi - lo) / (high - low))
+        mid = min(max(mid, lo), hi)
+        if arr[mid] < x:
+            lo = mid + 1
+        elif x < arr[mid]:
+            hi = mid - 1
+        else:
+            # Step back to the first of several equal items
+            return bisect_left(arr, x, lo, mid + 1)
+    return -1
+
+
+# Converts a number (including a NumPy scalar) to a Python int, or a float if it is not integral.
+def _plain_number(value):
+    try:
+        return operator.index(value)
+    except TypeError:
+        return float(value)
+
+
+def exponential_search(arr, x, key=None):
+    # Returns the index of the first item equal to x (compared through key), or -1.
+    # Probes indices 1, 2, 4, 8, ... until an item >= x is found, then binary searches
+    # that last gap: O(log i) for a target at index i, however long arr is.
+    # len(arr) is never called: arr may be any sorted object with indexing that raises
+    # IndexError past its end (e.g. a lazily computed or unbounded sequence).
+    def item(i):
+        return arr[i] if key is None else key(arr[i])
+
+    try:
+        if not item(0) < x:
+            return 0 if item(0) == x else -1
+    except IndexError:
+        return -1
+    # Invariant: item(lo) < x, and item(hi) >= x or hi is past the end
+    lo, hi = 0, 1
+    while True:
+        try:
+            if not item(hi) < x:
+                break
+        except IndexError:
+            break
+        lo, hi = hi, hi * 2
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        try:
+            below = item(mid) < x
+        except IndexError:
+            below = False
+        if below:
+            lo = mid
+        else:
+            hi = mid
+    try:
+        return hi if item(hi) == x else -1
+    except IndexError:
+        return -1
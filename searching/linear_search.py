@@ -0,0 +1,182 @@
+# Linear Search
+# Scans unsorted data from the front.
+#   linear_search > index of the first item equal to x
+#   find_all      > indices of every item equal to x
+#   find_any      > index of the first item that is one of several needles
+#   find_each     > first index of every needle, in a single pass
+#   search_stream > items of a stream (e.g. a generator) that match a predicate
+#   search_blocks > indices in a stream of NumPy blocks where a vectorized predicate holds
+#
+# Buffers (NumPy arrays, array.array, typed DynamicArrays, bytes, bytearray, memoryview)
+# are scanned CHUNK_SIZE items at a time with NumPy comparisons. Each chunk is compared
+# in C at close to memory speed, and the scan stops at the first chunk with a match.
+# Chunking also keeps the temporary comparison masks small and in cache.
+# Other sequences (lists, untyped DynamicArrays) are scanned item by item.
+import array
+import itertools
+
+from arrays_lists.dynamic_arrays import DynamicArrays
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CHUNK_SIZE = 2 ** 16
+
+
+def linear_search(data, x, start=0):
+    # Returns the index of the first item equal to x at or after start, or -1.
+    # A negative start counts from the end, as in list.index.
+    # For bytes and bytearray, x may also be a byte string: its first position is returned.
+    if isinstance(data, (bytes, bytearray)) and isinstance(x, (int, bytes, bytearray)):
+        # bytes.find is a memchr / substring search in C
+        return data.find(x, start)
+    start = _normalize_start(data, start)
+    buffer = _as_buffer(data)
+    if buffer is None:
+        items = _items(data)
+        if isinstance(items, list):
+            # list.index compares in C
+            try:
+                return items.index(x, start)
+            except ValueError:
+                return -1
+        return _first_index(items, lambda item: item == x, start)
+    for offset in range(start, len(buffer), CHUNK_SIZE):
+        mask = buffer[offset:offset + CHUNK_SIZE] == x
+        if mask.any():
+            return offset + int(mask.argmax())
+    return -1
+
+
+def find_all(data, x):
+    # Returns the indices of every item equal to x: a NumPy int64 array for buffers,
+    # a list otherwise.
+    buffer = _as_buffer(data)
+    if buffer is None:
+        return [i for i, item in enumerate(_items(data)) if item == x]
+    hits = [
+        offset + numpy.flatnonzero(buffer[offset:offset + CHUNK_SIZE] == x)
+        for offset in range(0, len(buffer), CHUNK_SIZE)
+    ]
+    return numpy.concatenate(hits).astype(numpy.int64) if hits else numpy.empty(0, dtype=numpy.int64)
+
+
+def find_any(data, needles, start=0):
+    # Returns the index of the first item (at or after start) that equals any of the
+    # needles, or -1. All needles are checked in the same pass.
+    # A negative start counts from the end, as in list.index.
+    needles = list(needles)
+    start = _normalize_start(data, start)
+    buffer = _as_buffer(data)
+    if buffer is None:
+        needle_set = set(needles)
+        return _first_index(_items(data), needle_set.__contains__, start)
+    if not needles:
+        return -1
+    for offset in range(start, len(buffer), CHUNK_SIZE):
+        mask = numpy.isin(buffer[offset:offset + CHUNK_SIZE], needles)
+        if mask.any():
+            return offset + int(mask.argmax())
+    return -1
+
+
+def find_each(data, needles):
+    # Returns {needle: index of its first occurrence, or -1} for every needle,
+    # in one pass over data. The scan stops once every needle has been found.
+    result = {needle: -1 for needle in needles}
+    missing = len(result)
+    if not missing:
+        return result
+    buffer = _as_buffer(data)
+    if buffer is None:
+        for i, item in enumerate(_items(data)):
+            if item in result and result[item] == -1:
+                result[item] = i
+                missing -= 1
+                if not missing:
+                    break
+        return result
+    needle_values = list(result)
+    for offset in range(0, len(buffer), CHUNK_SIZE):
+        chunk = buffer[offset:offset + CHUNK_SIZE]
+        positions = numpy.flatnonzero(numpy.isin(chunk, needle_values))
+        if positions.size == 0:
+            continue
+        # First position of each distinct value found in this chunk
+        values, first = numpy.unique(chunk[positions], return_index=True)
+        for value, i in zip(values.tolist(), first.tolist()):
+            if result.get(value) == -1:
+                result[value] = offset + int(positions[i])
+                missing -= 1
+        if not missing:
+            break
+    return result
+
+
+def search_stream(stream, predicate):
+    # Yields (index, item) for every item of an iterable for which predicate(item) is true.
+    # Items are pulled one at a time, so a generator is never materialized, and
+    # next(search_stream(...), None) stops at the first match.
+    for i, item in enumerate(stream):
+        if predicate(item):
+            yield i, item
+
+
+def search_blocks(blocks, predicate):
+    # Yields the global index of every match in a stream of blocks (e.g. log blocks read
+    # from disk), where predicate(block) returns a boolean mask, e.g. lambda b: b > 500.
+    # Blocks may be NumPy arrays, array.array, bytes, or anything numpy.asarray accepts.
+    # Each block is tested in one vectorized call. Requires NumPy.
+    if numpy is None:
+        raise ImportError("search_blocks() requires NumPy.")
+    offset = 0
+    for block in blocks:
+        buffer = _as_buffer(block)
+        if buffer is None:
+            buffer = numpy.asarray(block)
+        for i in numpy.flatnonzero(predicate(buffer)).tolist():
+            yield offset + i
+        offset += len(buffer)
+
+
+# Returns data as a 1-D NumPy array without copying it, or None if data is not a
+# numeric buffer (or NumPy is not installed).
+def _as_buffer(data):
+    if numpy is None:
+        return None
+    if isinstance(data, numpy.ndarray):
+        return data.ravel()
+    if isinstance(data, (bytes, bytearray)):
+        return numpy.frombuffer(data, dtype=numpy.uint8)
+    if isinstance(data, (array.array, memoryview)):
+        return numpy.asarray(memoryview(data)).ravel()
+    if isinstance(data, DynamicArrays) and data.typecode is not None:
+        return numpy.asarray(data.view())
+    return None
+
+
+# Returns the items of a non-buffer sequence or iterable.
+def _items(data):
+    if isinstance(data, DynamicArrays):
+        return data.arr[:data.length]
+    return data
+
+
+# Converts a negative start into an index from the end (clamped at 0), like list.index.
+# Raises ValueError for a negative start on an iterable without a length.
+def _normalize_start(data, start):
+    if start >= 0:
+        return start
+    if not hasattr(data, "__len__"):
+        raise ValueError("A negative start requires a sequence with a length.")
+    return max(0, start + len(data))
+
+
+# Index of the first item at or after start that matches, or -1.
+def _first_index(items, matches, start):
+    for i, item in enumerate(itertools.islice(items, start, None), start):
+        if matches(item):
+            return i
+    return -1
@@ -0,0 +1,106 @@
+# Sorting Benchmark
+# Run from the repository root: python -m sorting.benchmark
+import os
+import random
+import time
+
+import numpy
+
+from arrays_lists.dynamic_arrays import DynamicArrays
+from sorting.counting_sort import choose_layout, counting_sort
+from sorting.merge_sort import merge_sort
+from sorting.parallel_sort import parallel_sort
+from sorting.quick_sort import quick_sort, quickselect
+from sorting.radix_sort import radix_argsort, radix_sort
+
+N = 200_000
+KEYS_N = 10_000_000
+PARALLEL_N = 20_000_000
+
+
+# Textbook top-down merge sort (new lists at every level), for comparison
+def textbook_merge_sort(items):
+    if len(items) <= 1:
+        return items
+    mid = len(items) // 2
+    left = textbook_merge_sort(items[:mid])
+    right = textbook_merge_sort(items[mid:])
+    merged = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if right[j] < left[i]:
+            merged.append(right[j])
+            j += 1
+        else:
+            merged.append(left[i])
+            i += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged
+
+
+def timed(func, data):
+    start = time.perf_counter()
+    func(data)
+    return time.perf_counter() - start
+
+
+random.seed(0)
+random_data = [random.random() for _ in range(N)]
+nearly_sorted = sorted(random_data)
+for _ in range(N // 100):
+    i, j = random.randrange(N), random.randrange(N)
+    nearly_sorted[i], nearly_sorted[j] = nearly_sorted[j], nearly_sorted[i]
+reversed_data = sorted(random_data, reverse=True)
+duplicates = [float(random.randrange(100)) for _ in range(N)]
+
+print(f"# Sorting {N:,} floats (DynamicArrays column: merge_sort on typed storage)")
+print(f"{'input':<16}{'textbook':>10}{'merge_sort':>12}{'quick_sort':>12}{'DynamicArrays':>15}{'list.sort':>11}")
+inputs = [("random", random_data), ("nearly sorted", nearly_sorted), ("reversed", reversed_data), ("100 distinct", duplicates)]
+for name, data in inputs:
+    textbook = timed(textbook_merge_sort, list(data))
+    hybrid = timed(merge_sort, list(data))
+    intro = timed(quick_sort, list(data))
+    typed = DynamicArrays("d")
+    typed.extend(data)
+    dynamic = timed(merge_sort, typed)
+    builtin = timed(list.sort, list(data))
+    print(f"{name:<16}{textbook:>9.3f}s{hybrid:>11.3f}s{intro:>11.3f}s{dynamic:>14.3f}s{builtin:>10.3f}s")
+
+print()
+print(f"# Median of {N:,} random floats")
+start = time.perf_counter()
+quick_sort(list(random_data))[N // 2]
+print(f"quick_sort()[n // 2]: {time.perf_counter() - start:8.3f}s")
+start = time.perf_counter()
+sorted(random_data)[N // 2]
+print(f"sorted()[n // 2]:     {time.perf_counter() - start:8.3f}s")
+start = time.perf_counter()
+quickselect(random_data, N // 2)
+print(f"quickselect():        {time.perf_counter() - start:8.3f}s")
+
+print()
+print(f"# {KEYS_N:,} integer keys (NumPy int64)")
+rng = numpy.random.default_rng(0)
+ids = rng.integers(-2 ** 62, 2 ** 62, KEYS_N)
+timestamps = rng.integers(1_700_000_000, 1_700_000_000 + 86_400, KEYS_N)
+# 1,000 distinct ids spread over the whole 64-bit range: the sparse counting layout
+repeated_ids = rng.choice(rng.integers(-2 ** 62, 2 ** 62, 1_000), KEYS_N)
+print(f"{'keys':<16}{'sorted()':>10}{'radix_sort':>12}{'radix_argsort':>15}{'counting_sort':>15}")
+for name, keys in [("random 64-bit", ids), ("one day of ts", timestamps), ("1k sparse ids", repeated_ids)]:
+    builtin = timed(sorted, keys.tolist())
+    radix = timed(radix_sort, keys.copy())
+    argsort = timed(radix_argsort, keys)
+    counting = timed(counting_sort, keys.copy())
+    layout = choose_layout(keys)
+    print(f"{name:<16}{builtin:>9.3f}s{radix:>11.3f}s{argsort:>14.3f}s{counting:>14.3f}s ({layout})")
+
+print()
+print(f"# parallel_sort scaling, {PARALLEL_N:,} float64 keys, {os.cpu_count()} CPU cores")
+values = rng.standard_normal(PARALLEL_N)
+sequential = timed(radix_sort, values.copy())
+print(f"radix_sort (sequential): {sequential:8.3f}s")
+for workers in [w for w in (1, 2, 4, 8, 16, 32) if w <= max(2, os.cpu_count() or 1)]:
+    elapsed = timed(lambda data: parallel_sort(data, workers=workers), values.copy())
+    label = f"workers={workers}:"
+    print(f"{label:<25}{elapsed:8.3f}s  ({sequential / elapsed:.1f}x)")
@@ -0,0 +1,60 @@
+# Counting Sort
+# Sorts integer keys by counting how often each value occurs, then writing every
+# value out as many times as it was counted. The dense layout makes no comparisons.
+#
+# Two bucket layouts, picked from the key range (max - min + 1):
+#   dense  > one counter per value in the range, in a NumPy array (bincount).
+#            O(n + range) time and O(range) memory, best when the range is small.
+#   sparse > one counter per distinct value, from numpy.unique(return_counts=True),
+#            so a huge range costs nothing extra. O(n log n), all in C.
+# The dense layout is used when the range is at most DENSE_FACTOR * n.
+from sorting.radix_sort import as_numpy_keys, numpy, store_sorted
+
+DENSE_FACTOR = 4
+
+
+def counting_sort(data, layout=None):
+    # Sorts integers in place and returns data. Requires NumPy.
+    # data is a NumPy array, an array.array, a DynamicArrays or a list of ints.
+    # layout: "dense", "sparse", or None to choose from the key range.
+    keys = as_numpy_keys(data, "counting_sort")
+    if keys.dtype.kind not in "iu":
+        raise TypeError("counting_sort() sorts integer keys.")
+    if layout not in (None, "dense", "sparse"):
+        raise ValueError(f"Unknown layout: {layout!r}")
+    if len(keys) < 2:
+        return data
+    if layout is None:
+        layout = choose_layout(keys)
+    if layout == "dense":
+        result = _dense(keys)
+    else:
+        result = _sparse(keys)
+    store_sorted(data, keys, result)
+    return data
+
+
+def choose_layout(keys):
+    # Returns "dense" if the key range is at most DENSE_FACTOR * len(keys), else "sparse".
+    low, high = int(keys.min()), int(keys.max())
+    return "dense" if high - low + 1 <= DENSE_FACTOR * len(keys) else "sparse"
+
+
+# One counter per value between min and max.
+def _dense(keys):
+    low = keys.min()
+    span = int(keys.max()) - int(low) + 1
+    # Offsets from the minimum, in a type that cannot overflow
+    if keys.dtype.kind == "i":
+        offsets = keys.astype(numpy.int64) - int(low)
+    else:
+        offsets = keys - low
+    counts = numpy.bincount(offsets.astype(numpy.intp), minlength=span)
+    values = (numpy.arange(span, dtype=offsets.dtype) + offsets.dtype.type(low)).astype(keys.dtype)
+    return numpy.repeat(values, counts)
+
+
+# One counter per distinct value, with the distinct values in sorted order.
+def _sparse(keys):
+    distinct, counts = numpy.unique(keys, return_counts=True)
+    return numpy.repeat(distinct, counts)
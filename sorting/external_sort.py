@@ -0,0 +1,210 @@
+# External Sort
+# Sorts record streams that do not fit in memory.
+#   1. Run formation: records are read into a chunk until the chunk reaches the
+#      memory budget. The chunk is sorted with merge_sort and written to a temp
+#      file as one sorted run.
+#   2. Merging: up to fan_in runs are merged at a time with a heap (heapq.merge).
+#      While there are more runs than fan_in, groups of adjacent runs are merged into
+#      longer runs, but only as many as it takes to bring the count down to fan_in;
+#      the other runs are left on disk as they are. The last merge is not written
+#      out: it is yielded record by record.
+# If the whole input fits in the budget, nothing touches the disk.
+#
+# Runs are written as pickled blocks of records through buffered files, optionally
+# gzip-compressed. The sort is stable, like merge_sort: ties go to the earlier run.
+import gzip
+import heapq
+import io
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+
+from sorting.merge_sort import merge_sort
+
+BLOCK_RECORDS = 1024
+COMPRESS_LEVEL = 1
+
+
+class ExternalSorter:
+    # key, reverse  > as in merge_sort
+    # memory_limit  > bytes of records held in memory while forming a run
+    # fan_in        > number of runs merged at once (each needs one read buffer)
+    # temp_dir      > where run files go (default: the system temp directory)
+    # compress      > gzip the run files (less disk I/O, more CPU)
+    # buffer_size   > bytes buffered per run file
+    # sizeof        > function used to measure a record (default sys.getsizeof)
+    # progress      > optional function called with stats() after each run is written
+    def __init__(self, key=None, reverse=False, memory_limit=64 * 2 ** 20, fan_in=64, temp_dir=None,
+                 compress=False, buffer_size=2 ** 16, sizeof=sys.getsizeof, progress=None):
+        if memory_limit <= 0:
+            raise ValueError("Memory limit must be positive.")
+        if fan_in < 2:
+            raise ValueError("Fan-in must be at least 2.")
+        if buffer_size <= 0:
+            raise ValueError("Buffer size must be positive.")
+        self.key = key
+        self.reverse = reverse
+        self.memory_limit = memory_limit
+        self.fan_in = fan_in
+        self.temp_dir = temp_dir
+        self.compress = compress
+        self.buffer_size = buffer_size
+        self.sizeof = sizeof
+        self.progress = progress
+        self._reset_stats()
+
+    # Returns the progress and I/O counters of the current (or last) sort.
+    def stats(self):
+        return {
+            "records_in": self.records_in,
+            "records_out": self.records_out,
+            "initial_runs": self.initial_runs,
+            "runs_written": self.runs_written,
+            "merge_passes": self.merge_passes,
+            "bytes_written": self.bytes_written,
+            "bytes_read": self.bytes_read,
+            "sort_seconds": self.sort_seconds,
+            "merge_seconds": self.merge_seconds,
+        }
+
+    # Zeroes every counter (at the start of each sort).
+    def _reset_stats(self):
+        self.records_in = 0
+        self.records_out = 0
+        self.initial_runs = 0
+        self.runs_written = 0
+        self.merge_passes = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.sort_seconds = 0.0
+        self.merge_seconds = 0.0
+
+    # Sorts an iterable of records and yields them in order.
+    # Records must be picklable once the input is larger than the memory budget.
+    # Temp files are removed when the generator finishes or is closed early.
+    def sort(self, records):
+        self._reset_stats()
+        directory = None
+        try:
+            runs = []
+            for chunk in self._chunks(records):
+                start = time.perf_counter()
+                merge_sort(chunk, key=self.key, reverse=self.reverse)
+                self.sort_seconds += time.perf_counter() - start
+                # Everything fit in one chunk: no need for the disk
+                if not runs and chunk is self._last_chunk:
+                    self.records_out = len(chunk)
+                    yield from chunk
+                    return
+                if directory is None:
+                    directory = tempfile.mkdtemp(prefix="external_sort_", dir=self.temp_dir)
+                runs.append(self._write_run(directory, chunk))
+                self.initial_runs += 1
+                self._report()
+            # Intermediate passes until one merge can take every run
+            while len(runs) > self.fan_in:
+                self.merge_passes += 1
+                runs = self._reduce_runs(directory, runs)
+                self._report()
+            self.merge_passes += 1
+            for record in self._merge(runs):
+                self.records_out += 1
+                yield record
+        finally:
+            if directory is not None:
+                shutil.rmtree(directory, ignore_errors=True)
+
+    # One intermediate pass: merges groups of adjacent runs from the front, each group
+    # removing (size - 1) runs, and stops once the count is down to fan_in (or every run
+    # has been merged once). Merged runs stay in front of the untouched ones, so ties
+    # still go to the earlier run.
+    def _reduce_runs(self, directory, runs):
+        merged = []
+        excess = len(runs) - self.fan_in
+        i = 0
+        while excess > 0 and i < len(runs):
+            size = min(self.fan_in, excess + 1, len(runs) - i)
+            merged.append(self._write_run(directory, self._merge(runs[i:i + size])))
+            i += size
+            excess -= size - 1
+        return merged + runs[i:]
+
+    # Splits records into lists that each fit in the memory budget.
+    # The final chunk is remembered in _last_chunk.
+    def _chunks(self, records):
+        self._last_chunk = None
+        chunk = []
+        size = 0
+        for record in records:
+            chunk.append(record)
+            self.records_in += 1
+            # 8 bytes for the list slot that holds the record
+            size += self.sizeof(record) + 8
+            if size >= self.memory_limit:
+                yield chunk
+                chunk = []
+                size = 0
+        self._last_chunk = chunk
+        if chunk or self.records_in == 0:
+            yield chunk
+
+    # Writes records (already in order) to a new run file and returns its path.
+    def _write_run(self, directory, records):
+        fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+        raw = os.fdopen(fd, "wb", buffering=0)
+        if self.compress:
+            f = io.BufferedWriter(gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=COMPRESS_LEVEL), self.buffer_size)
+        else:
+            f = io.BufferedWriter(raw, self.buffer_size)
+        with raw, f:
+            block = []
+            for record in records:
+                block.append(record)
+                if len(block) == BLOCK_RECORDS:
+                    pickle.dump(block, f, pickle.HIGHEST_PROTOCOL)
+                    block = []
+            if block:
+                pickle.dump(block, f, pickle.HIGHEST_PROTOCOL)
+        self.bytes_written += os.path.getsize(path)
+        self.runs_written += 1
+        return path
+
+    # Yields the records of a run file in order, then deletes the file.
+    def _read_run(self, path):
+        self.bytes_read += os.path.getsize(path)
+        raw = open(path, "rb", buffering=0)
+        if self.compress:
+            f = io.BufferedReader(gzip.GzipFile(fileobj=raw, mode="rb"), self.buffer_size)
+        else:
+            f = io.BufferedReader(raw, self.buffer_size)
+        with raw, f:
+            while True:
+                try:
+                    block = pickle.load(f)
+                except EOFError:
+                    break
+                yield from block
+        os.remove(path)
+
+    # Heap-based k-way merge of run files. Ties go to the earlier run.
+    def _merge(self, runs):
+        start = time.perf_counter()
+        merged = heapq.merge(*[self._read_run(path) for path in runs], key=self.key, reverse=self.reverse)
+        for record in merged:
+            yield record
+        self.merge_seconds += time.perf_counter() - start
+
+    # Passes the current stats to the progress function, if there is one.
+    def _report(self):
+        if self.progress is not None:
+            self.progress(self.stats())
+
+
+def external_sort(records, key=None, reverse=False, memory_limit=64 * 2 ** 20, fan_in=64, temp_dir=None,
+                  compress=False, buffer_size=2 ** 16):
+    # Yields the records in sorted order, using temp files when they exceed memory_limit bytes.
+    # Shortcut for ExternalSorter(...).sort(records); use ExternalSorter for stats and progress.
+    return ExternalSorter(key, reverse, memory_limit, fan_in, temp_dir, compress, buffer_size).sort(records)
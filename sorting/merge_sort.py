@@ -0,0 +1,247 @@
+# Merge Sort
+# Stable, bottom-up (non-recursive) merge sort in the style of Timsort:
+#   1. The input is split into natural runs: stretches that are already ascending,
+#      or strictly descending (those are reversed in place).
+#   2. Runs shorter than min_run are extended with binary insertion sort.
+#   3. Adjacent runs are merged pass by pass until a single run is left.
+# Each merge copies the shorter of the two runs into one temp buffer, allocated
+# once per sort and reused by every merge. When one run keeps winning, the merge
+# switches to galloping: bisect finds the whole block that goes next and it is
+# moved with one slice copy, so ordered input is merged in blocks, not item by item.
+#
+# Only < is used to compare keys, like list.sort.
+import bisect
+
+from arrays_lists.dynamic_arrays import DynamicArrays
+
+MIN_MERGE = 64
+MIN_GALLOP = 7
+
+
+def merge_sort(data, key=None, reverse=False):
+    # Sorts data in place and returns it. data is a list or a DynamicArrays.
+    # key and reverse work like list.sort: key is called once per item, and
+    # reverse=True sorts in descending order while equal items keep their original order.
+    if isinstance(data, DynamicArrays):
+        items = list(data.arr[:data.length])
+    elif isinstance(data, list):
+        items = data
+    else:
+        raise TypeError("merge_sort() sorts a list or a DynamicArrays.")
+    if len(items) < 2:
+        return data
+    # Reversing before and after an ascending stable sort gives a stable descending sort
+    if reverse:
+        items.reverse()
+    if key is None:
+        _sort(items, None)
+    else:
+        _sort([key(item) for item in items], items)
+    if reverse:
+        items.reverse()
+    if items is not data:
+        data[:] = items
+    return data
+
+
+# Sorts keys in place. If values is not None, it is reordered the same way as keys.
+def _sort(keys, values):
+    n = len(keys)
+    min_run = _min_run(n)
+    # Run boundaries: run i is keys[bounds[i]:bounds[i + 1]]
+    bounds = [0]
+    start = 0
+    while start < n:
+        end = _natural_run(keys, values, start, n)
+        if end - start < min_run:
+            forced = min(start + min_run, n)
+            _insertion_sort(keys, values, start, end, forced)
+            end = forced
+        bounds.append(end)
+        start = end
+    # The shorter run of a merge never holds more than half of the items
+    temp_keys = [None] * (n // 2 + 1)
+    temp_values = None if values is None else [None] * (n // 2 + 1)
+    while len(bounds) > 2:
+        merged = [0]
+        for i in range(0, len(bounds) - 2, 2):
+            _merge(keys, values, bounds[i], bounds[i + 1], bounds[i + 2], temp_keys, temp_values)
+            merged.append(bounds[i + 2])
+        # An odd run out is carried over to the next pass
+        if (len(bounds) - 1) % 2:
+            merged.append(bounds[-1])
+        bounds = merged
+
+
+# Minimum run length, chosen (as in Timsort) so n / min_run is close to a power of two.
+def _min_run(n):
+    extra = 0
+    while n >= MIN_MERGE:
+        extra |= n & 1
+        n >>= 1
+    return n + extra
+
+
+# Returns the end of the natural run starting at lo, reversing it if it is descending.
+# Only strictly descending runs are reversed, so equal items never swap places.
+def _natural_run(keys, values, lo, n):
+    hi = lo + 1
+    if hi == n:
+        return hi
+    if keys[hi] < keys[lo]:
+        while hi + 1 < n and keys[hi + 1] < keys[hi]:
+            hi += 1
+        hi += 1
+        keys[lo:hi] = keys[lo:hi][::-1]
+        if values is not None:
+            values[lo:hi] = values[lo:hi][::-1]
+    else:
+        while hi + 1 < n and not keys[hi + 1] < keys[hi]:
+            hi += 1
+        hi += 1
+    return hi
+
+
+# Binary insertion sort of keys[lo:hi], where keys[lo:start] is already sorted.
+# bisect_right places each item after its equals, which keeps the sort stable.
+def _insertion_sort(keys, values, lo, start, hi):
+    for i in range(start, hi):
+        k = keys[i]
+        position = bisect.bisect_right(keys, k, lo, i)
+        if position == i:
+            continue
+        keys[position + 1:i + 1] = keys[position:i]
+        keys[position] = k
+        if values is not None:
+            v = values[i]
+            values[position + 1:i + 1] = values[position:i]
+            values[position] = v
+
+
+# Merges the sorted runs keys[lo:mid] and keys[mid:hi].
+def _merge(keys, values, lo, mid, hi, temp_keys, temp_values):
+    # Left items that are <= the first right item are already in place
+    lo = bisect.bisect_right(keys, keys[mid], lo, mid)
+    if lo == mid:
+        return
+    # Right items that are >= the last left item are already in place
+    hi = bisect.bisect_left(keys, keys[mid - 1], mid, hi)
+    if mid - lo <= hi - mid:
+        _merge_lo(keys, values, lo, mid, hi, temp_keys, temp_values)
+    else:
+        _merge_hi(keys, values, lo, mid, hi, temp_keys, temp_values)
+
+
+# Merge from the front: the left run is copied to the temp buffer and the
+# output is written over keys[lo:hi] from left to right.
+def _merge_lo(keys, values, lo, mid, hi, temp_keys, temp_values):
+    n1 = mid - lo
+    temp_keys[:n1] = keys[lo:mid]
+    if values is not None:
+        temp_values[:n1] = values[lo:mid]
+    i, j, k = 0, mid, lo
+    while i < n1 and j < hi:
+        # One item at a time, until one side wins MIN_GALLOP times in a row
+        left_wins = right_wins = 0
+        while i < n1 and j < hi:
+            if keys[j] < temp_keys[i]:
+                keys[k] = keys[j]
+                if values is not None:
+                    values[k] = values[j]
+                j += 1
+                right_wins += 1
+                left_wins = 0
+            else:
+                keys[k] = temp_keys[i]
+                if values is not None:
+                    values[k] = temp_values[i]
+                i += 1
+                left_wins += 1
+                right_wins = 0
+            k += 1
+            if left_wins >= MIN_GALLOP or right_wins >= MIN_GALLOP:
+                break
+        # Galloping: move whole blocks while they stay long
+        while i < n1 and j < hi:
+            count = bisect.bisect_right(temp_keys, keys[j], i, n1) - i
+            if count:
+                keys[k:k + count] = temp_keys[i:i + count]
+                if values is not None:
+                    values[k:k + count] = temp_values[i:i + count]
+                i += count
+                k += count
+                if i == n1:
+                    break
+            right_count = bisect.bisect_left(keys, temp_keys[i], j, hi) - j
+            if right_count:
+                keys[k:k + right_count] = keys[j:j + right_count]
+                if values is not None:
+                    values[k:k + right_count] = values[j:j + right_count]
+                j += right_count
+                k += right_count
+            if count < MIN_GALLOP and right_count < MIN_GALLOP:
+                break
+    # Leftover right items are already in place, leftover left items are copied back
+    if i < n1:
+        keys[k:k + n1 - i] = temp_keys[i:n1]
+        if values is not None:
+            values[k:k + n1 - i] = temp_values[i:n1]
+
+
+# Merge from the back: the right run is copied to the temp buffer and the
+# output is written over keys[lo:hi] from right to left.
+def _merge_hi(keys, values, lo, mid, hi, temp_keys, temp_values):
+    n2 = hi - mid
+    temp_keys[:n2] = keys[mid:hi]
+    if values is not None:
+        temp_values[:n2] = values[mid:hi]
+    i, j, k = n2 - 1, mid - 1, hi - 1
+    while i >= 0 and j >= lo:
+        # One item at a time, until one side wins MIN_GALLOP times in a row.
+        # On a tie the right item goes last, which keeps the merge stable.
+        left_wins = right_wins = 0
+        while i >= 0 and j >= lo:
+            if temp_keys[i] < keys[j]:
+                keys[k] = keys[j]
+                if values is not None:
+                    values[k] = values[j]
+                j -= 1
+                left_wins += 1
+                right_wins = 0
+            else:
+                keys[k] = temp_keys[i]
+                if values is not None:
+                    values[k] = temp_values[i]
+                i -= 1
+                right_wins += 1
+                left_wins = 0
+            k -= 1
+            if left_wins >= MIN_GALLOP or right_wins >= MIN_GALLOP:
+                break
+        # Galloping: move whole blocks while they stay long
+        while i >= 0 and j >= lo:
+            start = bisect.bisect_left(temp_keys, keys[j], 0, i + 1)
+            count = i + 1 - start
+            if count:
+                keys[k - count + 1:k + 1] = temp_keys[start:i + 1]
+                if values is not None:
+                    values[k - count + 1:k + 1] = temp_values[start:i + 1]
+                i -= count
+                k -= count
+                if i < 0:
+                    break
+            start = bisect.bisect_right(keys, temp_keys[i], lo, j + 1)
+            left_count = j + 1 - start
+            if left_count:
+                keys[k - left_count + 1:k + 1] = keys[start:j + 1]
+                if values is not None:
+                    values[k - left_count + 1:k + 1] = values[start:j + 1]
+                j -= left_count
+                k -= left_count
+            if count < MIN_GALLOP and left_count < MIN_GALLOP:
+                break
+    # Leftover left items are already in place, leftover right items are copied back
+    if i >= 0:
+        keys[lo:lo + i + 1] = temp_keys[:i + 1]
+        if values is not None:
+            values[lo:lo + i + 1] = temp_values[:i + 1]
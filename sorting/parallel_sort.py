@@ -0,0 +1,180 @@
+# Parallel Sort
+# Sample sort: the data is split into one bucket per worker by value, the buckets
+# are sorted at the same time in separate processes, and the sorted buckets laid
+# end to end are the sorted result.
+#   1. Splitters: a random sample of OVERSAMPLE keys per worker is sorted, and every
+#      OVERSAMPLE-th sample becomes a splitter, so buckets come out about equal in size.
+#   2. Partition: each key's bucket is found with a binary search over the splitters,
+#      and the keys are reordered bucket by bucket (a stable counting sort on the
+#      bucket number), so equal keys keep their order.
+#   3. Sort: each worker sorts its own bucket with radix_sort.
+#
+# Numeric keys are NumPy arrays in shared memory: the partition is written straight
+# into a shared block, and every worker sorts its slice of it in place, so neither
+# the keys nor the results are pickled.
+# Other keys (e.g. str) are bucketed in Python and the buckets are pickled to the
+# workers, which sort them with merge_sort and send back only the order.
+import array
+import bisect
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from arrays_lists.dynamic_arrays import DynamicArrays
+from sorting.merge_sort import merge_sort
+from sorting.radix_sort import as_numpy_keys, numpy, radix_argsort, radix_sort, store_sorted
+
+PARALLEL_THRESHOLD = 1_000_000
+OVERSAMPLE = 64
+
+
+def parallel_sort(data, workers=None, key=None, reverse=False):
+    # Sorts data in place across worker processes and returns it. Stable.
+    # workers > number of processes (default: one per CPU core)
+    # key, reverse > as in merge_sort
+    # Without a key, data may be a list, a DynamicArrays, a NumPy array or an array.array.
+    # With a key, or for non-numeric items, data must be a list or a DynamicArrays.
+    # Inputs under PARALLEL_THRESHOLD items, or workers=1, are sorted sequentially.
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Workers must be at least 1.")
+    if workers > 2 ** 16:
+        raise ValueError("At most 65536 workers are supported.")
+    parallel = workers > 1 and len(data) >= PARALLEL_THRESHOLD
+    if key is None and _is_numeric_array(data):
+        keys = as_numpy_keys(data, "parallel_sort")
+        if parallel:
+            result, _ = _shared_sample_sort(keys, None, workers)
+        else:
+            result = radix_sort(keys.copy())
+        if reverse:
+            result = result[::-1]
+        store_sorted(data, keys, result)
+        return data
+    if not isinstance(data, (list, DynamicArrays)):
+        raise TypeError("With a key, parallel_sort() sorts a list or a DynamicArrays.")
+    if not parallel:
+        return merge_sort(data, key=key, reverse=reverse)
+    items = list(data.arr[:data.length]) if isinstance(data, DynamicArrays) else list(data)
+    # Reversing before and after an ascending stable sort gives a stable descending sort
+    if reverse:
+        items.reverse()
+    keys = items if key is None else [key(item) for item in items]
+    numeric_keys = _numeric_array(keys)
+    if numeric_keys is not None:
+        _, order = _shared_sample_sort(numeric_keys, numpy.arange(len(keys), dtype=numpy.int64), workers)
+        order = order.tolist()
+    else:
+        order = _pickled_sample_sort(keys, workers)
+    items = [items[i] for i in order]
+    if reverse:
+        items.reverse()
+    data[:] = items
+    return data
+
+
+# True for fixed-type numeric storage: NumPy arrays, array.array and typed DynamicArrays.
+# Lists go through the order-based path, so their items are moved, never converted.
+def _is_numeric_array(data):
+    if numpy is not None and isinstance(data, numpy.ndarray):
+        return True
+    return isinstance(data, array.array) or (isinstance(data, DynamicArrays) and data.typecode is not None)
+
+
+# Returns keys as a numeric NumPy array, or None if they are not all numbers
+# (or would lose precision as float64, e.g. large ints mixed with floats).
+def _numeric_array(keys):
+    if numpy is None or not keys or isinstance(keys[0], (str, bytes)):
+        return None
+    try:
+        values = numpy.array(keys)
+    except (ValueError, TypeError, OverflowError):
+        return None
+    if values.ndim != 1 or values.dtype.kind not in "biuf":
+        return None
+    if values.dtype.kind == "f":
+        finite = values[numpy.isfinite(values)]
+        if finite.size and numpy.abs(finite).max() >= 2 ** 53 and not all(isinstance(k, float) for k in keys):
+            return None
+    return values
+
+
+# Picks workers - 1 splitters from a sorted random sample of the keys.
+def _splitters(sample, workers):
+    sample.sort()
+    step = len(sample) // workers
+    return sample[step::step][:workers - 1]
+
+
+# Sample sort of a numeric key array. payload (or None) is reordered along with the keys.
+# Returns (sorted keys, reordered payload) as new arrays.
+def _shared_sample_sort(keys, payload, workers):
+    rng = numpy.random.default_rng(0)
+    splitters = _splitters(keys[rng.integers(0, len(keys), workers * OVERSAMPLE)], workers)
+    buckets = numpy.searchsorted(splitters, keys, side="right").astype(numpy.uint16)
+    order = numpy.argsort(buckets, kind="stable")
+    bounds = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(buckets, minlength=workers))))
+    arrays = [keys] if payload is None else [keys, payload]
+    blocks = [shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1)) for values in arrays]
+    try:
+        shared = [numpy.ndarray(values.shape, dtype=values.dtype, buffer=block.buf) for values, block in zip(arrays, blocks)]
+        # Write the partition straight into shared memory
+        for values, target in zip(arrays, shared):
+            numpy.take(values, order, out=target)
+        spec = [(block.name, values.shape, values.dtype.str) for block, values in zip(blocks, arrays)]
+        ranges = [(int(bounds[i]), int(bounds[i + 1])) for i in range(workers) if bounds[i + 1] - bounds[i] > 1]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(_sort_slice, spec, start, stop) for start, stop in ranges]:
+                future.result()
+        result = [values.copy() for values in shared]
+        # Drop the views before closing the blocks
+        del shared
+        return result[0], (result[1] if payload is not None else None)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+# Worker entry point: sort keys[start:stop] in shared memory (and its payload, if any).
+def _sort_slice(spec, start, stop):
+    blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in spec]
+    try:
+        arrays = [numpy.ndarray(shape, dtype=dtype, buffer=block.buf) for block, (_, shape, dtype) in zip(blocks, spec)]
+        keys = arrays[0][start:stop]
+        if len(arrays) == 1:
+            radix_sort(keys)
+        else:
+            order = radix_argsort(keys)
+            keys[:] = keys[order]
+            payload = arrays[1][start:stop]
+            payload[:] = payload[order]
+            del order, payload
+        del arrays, keys
+    finally:
+        for block in blocks:
+            block.close()
+
+
+# Sample sort of arbitrary (comparable, picklable) keys. Returns the sorted order as indices.
+def _pickled_sample_sort(keys, workers):
+    sample = random.Random(0).choices(keys, k=workers * OVERSAMPLE)
+    splitters = _splitters(sample, workers)
+    buckets = [[] for _ in range(workers)]
+    for i, k in enumerate(keys):
+        buckets[bisect.bisect_right(splitters, k)].append(i)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_sorted_order, [keys[i] for i in bucket]) for bucket in buckets]
+        order = []
+        for bucket, future in zip(buckets, futures):
+            order.extend(bucket[i] for i in future.result())
+    return order
+
+
+# Worker entry point: returns the stable sorted order of a list of keys.
+def _sorted_order(keys):
+    order = list(range(len(keys)))
+    merge_sort(order, key=keys.__getitem__)
+    return order
@@ -0,0 +1,213 @@
+# Quick Sort
+# In-place introsort: quicksort that cannot degrade to O(n^2).
+#   - Pivot: median of three (first, middle, last), or the ninther (median of three
+#     medians of three) on larger ranges, so sorted and reversed input split evenly.
+#   - 3-way (Dutch flag) partitioning into < pivot, == pivot and > pivot, so runs of
+#     equal keys are finished in one pass instead of being partitioned again.
+#   - Ranges of INSERTION_CUTOFF items or fewer are finished with binary insertion sort.
+#   - Once a range has been partitioned more than 2 * log2(n) times, it is heapsorted.
+#   - An explicit stack instead of recursion: the larger side is pushed and the smaller
+#     side is handled next, so the stack never holds more than log2(n) ranges.
+#
+# Not stable. Only < is used to compare keys, like list.sort.
+import bisect
+
+from arrays_lists.dynamic_arrays import DynamicArrays
+
+INSERTION_CUTOFF = 16
+NINTHER_THRESHOLD = 128
+
+
+def quick_sort(data, key=None, reverse=False):
+    # Sorts data in place and returns it. data is a list or a DynamicArrays.
+    # key is called once per item. reverse=True sorts in descending order.
+    items = _items(data)
+    if len(items) < 2:
+        return data
+    if key is None:
+        _introsort(items, None, 0, len(items))
+    else:
+        _introsort([key(item) for item in items], items, 0, len(items))
+    if reverse:
+        items.reverse()
+    if items is not data:
+        data[:] = items
+    return data
+
+
+def nth_element(data, k, key=None):
+    # Partially sorts data in place so that data[k] is the item a full sort would put there,
+    # every item before it is <= it and every item after it is >= it. Returns data.
+    # Runs in O(n) on average (introselect: heapsort caps the worst case at O(n log n)).
+    # Negative k counts from the end. Raises IndexError if k is out of range.
+    items = _items(data)
+    k = _check_k(k, len(items))
+    if key is None:
+        _select(items, None, k)
+    else:
+        _select([key(item) for item in items], items, k)
+    if items is not data:
+        data[:] = items
+    return data
+
+
+def quickselect(data, k, key=None):
+    # Returns the k-th smallest item (0-based) of data without modifying it.
+    # E.g. the median is quickselect(data, len(data) // 2).
+    # Negative k counts from the end. Raises IndexError if k is out of range.
+    items = list(_items(data))
+    nth_element(items, k, key)
+    return items[_check_k(k, len(items))]
+
+
+# Returns the list to work on: data itself for a list, a copy for a DynamicArrays.
+def _items(data):
+    if isinstance(data, DynamicArrays):
+        return list(data.arr[:data.length])
+    if isinstance(data, list):
+        return data
+    raise TypeError("Expected a list or a DynamicArrays.")
+
+
+def _check_k(k, n):
+    if k < 0:
+        k += n
+    if not 0 <= k < n:
+        raise IndexError("Index entered is out of bounds.")
+    return k
+
+
+# Sorts keys[lo:hi] in place. If values is not None, it is reordered the same way as keys.
+def _introsort(keys, values, lo, hi):
+    stack = [(lo, hi, 2 * (hi - lo).bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo > INSERTION_CUTOFF:
+            if depth == 0:
+                _heapsort(keys, values, lo, hi)
+                break
+            depth -= 1
+            lt, gt = _partition(keys, values, lo, hi, _choose_pivot(keys, lo, hi))
+            # Keys in [lt, gt) equal the pivot and are done
+            if lt - lo < hi - gt:
+                stack.append((gt, hi, depth))
+                hi = lt
+            else:
+                stack.append((lo, lt, depth))
+                lo = gt
+        else:
+            _insertion_sort(keys, values, lo, hi)
+
+
+# Moves keys[k] into its sorted position, with smaller keys before it and larger after.
+def _select(keys, values, k):
+    lo, hi = 0, len(keys)
+    depth = 2 * hi.bit_length()
+    while hi - lo > INSERTION_CUTOFF:
+        if depth == 0:
+            _heapsort(keys, values, lo, hi)
+            return
+        depth -= 1
+        lt, gt = _partition(keys, values, lo, hi, _choose_pivot(keys, lo, hi))
+        if k < lt:
+            hi = lt
+        elif k >= gt:
+            lo = gt
+        else:
+            return
+    _insertion_sort(keys, values, lo, hi)
+
+
+# Returns the key of the median of keys[a], keys[b] and keys[c].
+def _median_of_three(keys, a, b, c):
+    x, y, z = keys[a], keys[b], keys[c]
+    if y < x:
+        x, y = y, x
+    if z < y:
+        y = z
+        if y < x:
+            y = x
+    return y
+
+
+# Returns the pivot key for keys[lo:hi]: median of three, or the ninther on large ranges.
+def _choose_pivot(keys, lo, hi):
+    last = hi - 1
+    mid = lo + (hi - lo) // 2
+    if hi - lo <= NINTHER_THRESHOLD:
+        return _median_of_three(keys, lo, mid, last)
+    step = (hi - lo) // 8
+    candidates = [
+        _median_of_three(keys, lo, lo + step, lo + 2 * step),
+        _median_of_three(keys, mid - step, mid, mid + step),
+        _median_of_three(keys, last - 2 * step, last - step, last),
+    ]
+    return _median_of_three(candidates, 0, 1, 2)
+
+
+# Dutch flag partition of keys[lo:hi] around the pivot key.
+# Afterwards keys[lo:lt] < pivot, keys[lt:gt] == pivot and keys[gt:hi] > pivot.
+# Returns (lt, gt).
+def _partition(keys, values, lo, hi, pivot):
+    lt, i, gt = lo, lo, hi
+    while i < gt:
+        k = keys[i]
+        if k < pivot:
+            keys[i], keys[lt] = keys[lt], k
+            if values is not None:
+                values[i], values[lt] = values[lt], values[i]
+            lt += 1
+            i += 1
+        elif pivot < k:
+            gt -= 1
+            keys[i], keys[gt] = keys[gt], k
+            if values is not None:
+                values[i], values[gt] = values[gt], values[i]
+        else:
+            i += 1
+    return lt, gt
+
+
+# Binary insertion sort of keys[lo:hi]: bisect finds the slot, one slice move shifts the rest.
+def _insertion_sort(keys, values, lo, hi):
+    for i in range(lo + 1, hi):
+        k = keys[i]
+        position = bisect.bisect_right(keys, k, lo, i)
+        if position == i:
+            continue
+        keys[position + 1:i + 1] = keys[position:i]
+        keys[position] = k
+        if values is not None:
+            v = values[i]
+            values[position + 1:i + 1] = values[position:i]
+            values[position] = v
+
+
+# Heapsort of keys[lo:hi] (max-heap stored from lo), O(n log n) in the worst case.
+def _heapsort(keys, values, lo, hi):
+    n = hi - lo
+    for root in range(n // 2 - 1, -1, -1):
+        _sift_down(keys, values, lo, root, n)
+    for end in range(n - 1, 0, -1):
+        keys[lo], keys[lo + end] = keys[lo + end], keys[lo]
+        if values is not None:
+            values[lo], values[lo + end] = values[lo + end], values[lo]
+        _sift_down(keys, values, lo, 0, end)
+
+
+# Moves the heap node at root down until both children are not larger.
+# Heap positions are relative to lo, and the heap holds n items.
+def _sift_down(keys, values, lo, root, n):
+    while True:
+        child = 2 * root + 1
+        if child >= n:
+            return
+        if child + 1 < n and keys[lo + child] < keys[lo + child + 1]:
+            child += 1
+        if not keys[lo + root] < keys[lo + child]:
+            return
+        a, b = lo + root, lo + child
+        keys[a], keys[b] = keys[b], keys[a]
+        if values is not None:
+            values[a], values[b] = values[b], values[a]
+        root = child
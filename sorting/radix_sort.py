@@ -0,0 +1,173 @@
+# Radix Sort
+# Sorts fixed-width numeric keys without comparing them.
+#
+# LSD (least significant digit first) for integers and floats, vectorized with NumPy:
+#   1. Keys are mapped to unsigned integers of the same width whose order matches
+#      the key order (bit-twiddling):
+#        unsigned ints > unchanged
+#        signed ints   > sign bit flipped, so negatives come first
+#        floats        > negative: all bits flipped, positive: sign bit flipped
+#   2. One stable pass per 16-bit digit, lowest digit first. A pass takes the digit
+#      as a uint16 array and reorders the keys by it with NumPy's stable argsort,
+#      which NumPy runs as a radix sort in C for 16-bit integers, so each pass is
+#      O(n). Two bytes per pass halve the number of times the keys are moved, which
+#      is the expensive part.
+#   3. A digit that is equal for every key (e.g. the high bytes of small ids or of
+#      timestamps from the same day) is found from a histogram of the digit (bincount)
+#      before the pass, and the pass is skipped.
+#   4. radix_sort maps the sorted unsigned integers back to the key type;
+#      radix_argsort carries the original positions along instead.
+#
+# MSD (most significant digit first) for variable-length bytes / str:
+#   Items are bucketed by the byte at the current depth, and each bucket is then
+#   split on the next byte. An explicit stack replaces recursion, and small buckets
+#   are finished by a comparison sort. str is bucketed by its UTF-8 bytes, which
+#   orders the same way as the code points.
+import array
+
+from arrays_lists.dynamic_arrays import DynamicArrays
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+RADIX_BITS = 16
+MSD_CUTOFF = 64
+
+
+def radix_sort(data):
+    # Sorts data in place and returns it. The sort is stable.
+    # data is a NumPy array, an array.array, a DynamicArrays or a list of
+    # ints / floats (these require NumPy), or a list of bytes / str (MSD, no NumPy needed).
+    # Floats: -0.0 sorts before 0.0, and NaNs go to the ends according to their sign bit.
+    if isinstance(data, list) and data and isinstance(data[0], (bytes, str)):
+        _msd_sort(data)
+        return data
+    keys = as_numpy_keys(data, "radix_sort")
+    if len(keys) < 2:
+        return data
+    ordered, _ = _lsd_passes(_ordered_bits(keys), None)
+    store_sorted(data, keys, _from_ordered_bits(ordered, keys.dtype))
+    return data
+
+
+def radix_argsort(data):
+    # Returns the indices that would sort data, as a NumPy int64 array (stable:
+    # equal keys keep their original order). Same numeric inputs as radix_sort.
+    keys = as_numpy_keys(data, "radix_argsort")
+    _, order = _lsd_passes(_ordered_bits(keys), numpy.arange(len(keys), dtype=numpy.int64))
+    return order
+
+
+# Stable LSD passes over unsigned keys. Returns (sorted keys, order), where order
+# (if given) is permuted along with the keys.
+def _lsd_passes(ordered, order):
+    digit_type = numpy.uint16 if ordered.dtype.itemsize >= 2 else numpy.uint8
+    mask = ordered.dtype.type(min(2 ** RADIX_BITS, 2 ** (ordered.dtype.itemsize * 8)) - 1)
+    for shift in range(0, ordered.dtype.itemsize * 8, RADIX_BITS):
+        digits = ((ordered >> ordered.dtype.type(shift)) & mask).astype(digit_type)
+        histogram = numpy.bincount(digits, minlength=int(mask) + 1)
+        # Every key has the same digit here: the pass would not move anything
+        if len(digits) == 0 or histogram[digits[0]] == len(digits):
+            continue
+        step = numpy.argsort(digits, kind="stable")
+        ordered = ordered[step]
+        if order is not None:
+            order = order[step]
+    return ordered, order
+
+
+# Returns data as a 1-D NumPy array of numeric keys: a zero-copy view for NumPy arrays,
+# array.array and typed DynamicArrays, a new array for lists and untyped DynamicArrays.
+# Shared by the NumPy sorts (counting_sort, parallel_sort); name is used in errors.
+def as_numpy_keys(data, name):
+    if numpy is None:
+        raise ImportError(f"{name}() requires NumPy.")
+    if isinstance(data, numpy.ndarray):
+        keys = data
+    elif isinstance(data, array.array):
+        keys = numpy.asarray(memoryview(data))
+    elif isinstance(data, DynamicArrays):
+        if data.typecode is None:
+            keys = numpy.array(data.arr[:data.length])
+        else:
+            keys = numpy.asarray(data.view())
+    else:
+        keys = numpy.array(data)
+    if keys.ndim != 1:
+        raise ValueError("Only 1-D data can be sorted.")
+    if keys.dtype.kind not in "biuf":
+        raise TypeError(f"Cannot radix sort {keys.dtype} keys.")
+    return keys
+
+
+# Writes the sorted keys back into data (keys is the array as_numpy_keys returned for data).
+def store_sorted(data, keys, result):
+    if isinstance(data, list) or (isinstance(data, DynamicArrays) and data.typecode is None):
+        data[:] = result.tolist()
+    else:
+        keys[:] = result
+
+
+# Maps keys to unsigned integers of the same width whose order matches the key order.
+def _ordered_bits(keys):
+    keys = numpy.ascontiguousarray(keys)
+    if keys.dtype.kind == "b":
+        return keys.view(numpy.uint8)
+    unsigned = numpy.dtype(f"u{keys.dtype.itemsize}")
+    bits = keys.view(unsigned)
+    if keys.dtype.kind == "u":
+        return bits
+    sign = unsigned.type(1 << (keys.dtype.itemsize * 8 - 1))
+    if keys.dtype.kind == "i":
+        return bits ^ sign
+    # Floats: flip every bit of negatives (larger magnitude > smaller), set the sign bit of positives
+    negative = (bits & sign) != 0
+    return numpy.where(negative, ~bits, bits | sign)
+
+
+# Inverse of _ordered_bits: maps the unsigned integers back to keys of the given dtype.
+def _from_ordered_bits(ordered, dtype):
+    if dtype.kind in "bu":
+        return ordered.view(dtype)
+    sign = ordered.dtype.type(1 << (dtype.itemsize * 8 - 1))
+    if dtype.kind == "i":
+        return (ordered ^ sign).view(dtype)
+    # Floats: a set sign bit marks an originally positive key
+    positive = (ordered & sign) != 0
+    return numpy.where(positive, ordered ^ sign, ~ordered).view(dtype)
+
+
+# MSD radix sort of a list of bytes or str, in place and stable.
+def _msd_sort(items):
+    kind = str if isinstance(items[0], str) else bytes
+    for item in items:
+        if not isinstance(item, kind):
+            raise TypeError("All items must be bytes, or all must be str.")
+    if kind is str:
+        keys = [item.encode("utf-8") for item in items]
+    else:
+        keys = list(items)
+    # Each stack entry is (lo, hi, depth): keys[lo:hi] share their first depth bytes
+    stack = [(0, len(keys), 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= MSD_CUTOFF:
+            order = sorted(range(lo, hi), key=keys.__getitem__)
+            keys[lo:hi] = [keys[i] for i in order]
+            items[lo:hi] = [items[i] for i in order]
+            continue
+        # Bucket 0 holds keys that end at this depth, bucket b + 1 those with byte b
+        buckets = [[] for _ in range(257)]
+        for i in range(lo, hi):
+            key = keys[i]
+            buckets[key[depth] + 1 if len(key) > depth else 0].append(i)
+        order = [i for bucket in buckets for i in bucket]
+        keys[lo:hi] = [keys[i] for i in order]
+        items[lo:hi] = [items[i] for i in order]
+        start = lo + len(buckets[0])
+        for bucket in buckets[1:]:
+            if len(bucket) > 1:
+                stack.append((start, start + len(bucket), depth + 1))
+            start += len(bucket)
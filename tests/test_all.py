@@ -0,0 +1,1139 @@
+# Tests
+# Run from the repository root: python -m pytest tests/test_all.py
+import array
+import bisect
+import functools
+import math
+import operator
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+import numpy
+
+from arrays_lists.dynamic_arrays import DynamicArrays
+from graphs.batch_bfs import bfs_many
+from graphs.bfs_dfs import bfs, bfs_layers, dfs, iter_bfs, iter_dfs, shortest_path
+from graphs.graph import CSRGraph, DiGraph, Graph
+from graphs.shortest_paths import astar, bellman_ford, dijkstra
+from hash_tables.cache import LFUCache, LRUCache, TTLCache, cached, deep_sizeof
+from hash_tables.concurrent_hash_table import ConcurrentHashTable
+from hash_tables.disk_hash_table import DiskHashTable
+from hash_tables.hash_table import HashTable
+from queues.queue import Queue
+from searching import binary_search as binary_search_module
+from searching.binary_search import (
+    EytzingerArray, binary_search, bisect_left, bisect_right, exponential_search, find_many, interpolation_search,
+    search_many,
+)
+from searching.linear_search import find_all, find_any, find_each, linear_search, search_blocks, search_stream
+from sorting import parallel_sort as parallel_sort_module
+from sorting import quick_sort as quick_sort_module
+from sorting.counting_sort import choose_layout, counting_sort
+from sorting.external_sort import ExternalSorter
+from sorting.merge_sort import MIN_GALLOP, MIN_MERGE, merge_sort
+from sorting.parallel_sort import parallel_sort
+from sorting.quick_sort import nth_element, quick_sort, quickselect
+from sorting.radix_sort import radix_argsort, radix_sort
+from trees.avl_tree import AVLTree, PackedAVLTree, SortedMap, SortedSet
+from trees.b_plus_tree import BPlusTree, DiskBPlusTree
+from trees.binary_tree import FenwickTree, LazySegmentTree, Node, RangeFenwickTree, SegmentTree
+from trees.bst import BinarySearchTree
+from trees.radix_tree import RadixTree
+from trees.traversals import inorder, level_order, morris_inorder, postorder, preorder
+
+
+# DynamicArrays (arrays_lists/dynamic_arrays.py)
+def test_reserve_survives_bulk_appends():
+    for typecode in (None, "q"):
+        arr = DynamicArrays(typecode)
+        arr.reserve(1_000_000)
+        arr.extend(range(1_000))
+        arr.insert_many(0, range(10))
+        arr.insert_at_index(5, -1)
+        arr.append(7)
+        assert arr.capacity == 1_000_000
+        assert len(arr) == 1_012
+
+
+def test_bulk_operations_match_list():
+    for typecode in (None, "q"):
+        arr = DynamicArrays(typecode)
+        model = []
+        arr.extend(range(100))
+        model.extend(range(100))
+        arr.insert_many(10, [-1, -2, -3])
+        model[10:10] = [-1, -2, -3]
+        arr.remove_range(20, 90)
+        del model[20:90]
+        arr[2:5] = [7] * 6
+        model[2:5] = [7] * 6
+        assert arr.pop() == model.pop()
+        assert list(arr[:len(arr)].arr[:len(arr)]) == model
+        assert [arr[i] for i in range(-len(model), 0)] == model
+        assert arr.capacity < 4 * len(arr) or arr.capacity == 4
+        arr.remove_range(0, len(arr))
+        assert len(arr) == 0 and arr.capacity == 4
+
+
+def test_typed_storage_rejects_bad_values():
+    arr = DynamicArrays("i")
+    arr.extend([1, 2, 3])
+    for bad in ("x", 2 ** 40):
+        try:
+            arr.append(bad)
+        except (TypeError, OverflowError):
+            pass
+        else:
+            raise AssertionError("append accepted a value the typecode cannot hold")
+    assert list(arr.view()) == [1, 2, 3]
+
+
+def test_typed_storage_views_share_memory():
+    arr = DynamicArrays("d")
+    arr.extend([1.5, 2.5])
+    values = arr.to_numpy()
+    values[0] = 9.0
+    assert arr[0] == 9.0 and len(values) == 2
+    for bad in ("u", "z", "bB", "dq", "", 5):
+        try:
+            DynamicArrays(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unsupported typecode accepted")
+    try:
+        DynamicArrays().view()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("view() on list storage did not raise")
+
+
+# bfs_many (graphs/batch_bfs.py)
+def _layer_distances(start, graph, vertices):
+    distances = dict.fromkeys(vertices, -1)
+    for depth, layer in enumerate(bfs_layers(start, graph)):
+        for vertex in layer:
+            distances[vertex] = depth
+    return [distances[vertex] for vertex in vertices]
+
+
+def test_bfs_many_matches_bfs_layers():
+    random.seed(2)
+    for graph in (Graph(), DiGraph()):
+        for vertex in range(150):
+            graph.add_vertex(vertex)
+        for _ in range(300):
+            v1, v2 = random.sample(range(150), 2)
+            graph.add_edge(v1, v2)
+        sources = list(range(0, 150, 2))
+        result = bfs_many(sources, graph)
+        vertices = list(graph.adj_list)
+        for row, source in zip(result, sources):
+            assert row.tolist() == _layer_distances(source, graph, vertices)
+
+
+def test_bfs_many_rejects_other_graphs():
+    try:
+        bfs_many([0], {0: {}})
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("bfs_many accepted a plain dict")
+
+
+# Traversals (graphs/bfs_dfs.py)
+def test_lazy_traversals_respect_limits():
+    graph = _random_graph(Graph(), 300, 500, 11)
+    distances = dict(zip(list(graph.adj_list), _layer_distances(0, graph, list(graph.adj_list))))
+    near = list(iter_bfs(0, graph, max_depth=2))
+    assert near == [vertex for vertex in bfs(0, graph) if 0 <= distances[vertex] <= 2]
+    order = bfs(0, graph)
+    assert list(iter_bfs(0, graph, target=order[10])) == order[:11]
+    assert list(iter_dfs(0, graph, target=dfs(0, graph)[5])) == dfs(0, graph)[:6]
+    evens = list(iter_bfs(0, graph, visit=lambda vertex: vertex % 2 == 0))
+    assert all(vertex % 2 == 0 for vertex in evens)
+    assert len(list(iter_dfs(0, graph, max_depth=0))) == 1
+
+
+def test_bidirectional_shortest_path():
+    for graph in (_random_graph(Graph(), 300, 400, 12), _random_graph(DiGraph(), 300, 700, 13)):
+        vertices = list(graph.adj_list)
+        distances = _layer_distances(0, graph, vertices)
+        for target, distance in zip(vertices, distances):
+            path = shortest_path(0, graph, target)
+            if distance == -1:
+                assert path == []
+                continue
+            assert len(path) == distance + 1 and path[0] == 0 and path[-1] == target
+            assert all(b in graph.adj_list[a] for a, b in zip(path, path[1:]))
+
+
+# Graph and CSRGraph (graphs/graph.py)
+def _random_graph(graph, vertex_count, edge_count, seed, weighted=False):
+    rng = random.Random(seed)
+    for vertex in range(vertex_count):
+        graph.add_vertex(vertex)
+    for _ in range(edge_count):
+        v1, v2 = rng.sample(range(vertex_count), 2)
+        graph.add_edge(v1, v2, rng.randrange(1, 10) if weighted else 1)
+    return graph
+
+
+def test_freeze_snapshot_matches_graph():
+    graph = _random_graph(Graph(), 200, 600, 8)
+    csr = graph.freeze()
+    assert len(csr) == 200
+    assert csr.edge_count() == sum(map(len, graph.adj_list.values())) // 2
+    for vertex, neighbours in graph.adj_list.items():
+        assert csr.neighbours(vertex) == list(neighbours)
+        assert csr.degree(vertex) == len(neighbours)
+    assert bfs(0, csr) == bfs(0, graph) and dfs(0, csr) == dfs(0, graph)
+    offsets, indices = csr.to_numpy()
+    assert offsets[-1] == len(indices) == 2 * csr.edge_count()
+    # The snapshot does not change with the graph
+    graph.remove_vertex(0)
+    assert 0 in csr and len(csr) == 200
+
+
+def test_components_follow_edges_and_removals():
+    graph = Graph()
+    for vertex in range(10):
+        graph.add_vertex(vertex)
+    assert graph.component_count() == 10
+    for v1, v2 in ((0, 1), (1, 2), (3, 4), (5, 6), (6, 7)):
+        graph.add_edge(v1, v2)
+    assert graph.component_count() == 5
+    assert graph.connected(0, 2) and not graph.connected(2, 3)
+    assert graph.component_of(5) == graph.component_of(7)
+    graph.remove_edge(5, 6)
+    assert not graph.connected(5, 7) and graph.connected(6, 7)
+    graph.remove_vertex(1)
+    assert not graph.connected(0, 2)
+    assert graph.component_count() == 7
+    streamed = Graph.from_edge_list([(0, 1), (2, 3), (1, 4)])
+    assert streamed.component_count() == 2 and streamed.connected(0, 4)
+
+
+def test_edge_list_and_binary_round_trip():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "edges.txt")
+        with open(path, "w") as f:
+            f.write("# comment\n1 2\n2 3 2.5\n\n3 1\n1 2\n4 5\n")
+        graph = Graph.from_edge_list(path, chunk_size=2, vertex_type=int)
+        assert graph.adj_list == {1: {2: 1, 3: 1}, 2: {1: 1, 3: 2.5}, 3: {2: 2.5, 1: 1}, 4: {5: 1}, 5: {4: 1}}
+        binary = os.path.join(temp_dir, "graph.csr")
+        graph.save_binary(binary)
+        assert Graph.load_binary(binary).adj_list == graph.adj_list
+        mapped = CSRGraph.load_binary(binary)
+        assert [mapped.neighbours(vertex) for vertex in graph.adj_list] == [list(n) for n in graph.adj_list.values()]
+        assert bfs(1, mapped) == bfs(1, graph)
+        del mapped
+
+
+# Shortest paths (graphs/shortest_paths.py)
+def _floyd_warshall(graph):
+    vertices = list(graph.adj_list)
+    distances = {(u, v): 0 if u == v else float("inf") for u in vertices for v in vertices}
+    for u, neighbours in graph.adj_list.items():
+        for v, weight in neighbours.items():
+            distances[u, v] = min(distances[u, v], weight)
+    for k in vertices:
+        for u in vertices:
+            for v in vertices:
+                if distances[u, k] + distances[k, v] < distances[u, v]:
+                    distances[u, v] = distances[u, k] + distances[k, v]
+    return distances
+
+
+def test_shortest_paths_match_floyd_warshall():
+    for graph in (_random_graph(Graph(), 40, 80, 9, weighted=True), _random_graph(DiGraph(), 40, 120, 10, weighted=True)):
+        expected = _floyd_warshall(graph)
+        for start in range(0, 40, 7):
+            distances, _ = dijkstra(start, graph)
+            assert distances == bellman_ford(start, graph)[0]
+            assert distances == {v: d for (u, v), d in expected.items() if u == start and d != float("inf")}
+            for target in range(40):
+                cost, path = astar(start, graph, target, lambda vertex: 0)
+                assert cost == expected[start, target]
+                if path:
+                    assert path[0] == start and path[-1] == target
+                    assert sum(graph.adj_list[a][b] for a, b in zip(path, path[1:])) == cost
+
+
+def test_negative_weights():
+    graph = DiGraph()
+    for vertex in "abc":
+        graph.add_vertex(vertex)
+    graph.add_edge("a", "b", 4)
+    graph.add_edge("a", "c", 5)
+    graph.add_edge("c", "b", -3)
+    assert bellman_ford("a", graph, "b") == (2, ["a", "c", "b"])
+    for search, error in ((dijkstra, "Negative edge"), (bellman_ford, "negative cycle")):
+        if search is bellman_ford:
+            graph.add_edge("b", "c", 1)
+        try:
+            search("a", graph)
+        except ValueError as e:
+            assert error in str(e)
+        else:
+            raise AssertionError(f"{search.__name__} accepted a negative weight or cycle")
+
+
+# Caches (hash_tables/cache.py)
+def test_lru_and_lfu_eviction_order():
+    lru = LRUCache(max_entries=3)
+    for key in "abc":
+        lru[key] = key
+    lru["a"]
+    lru["d"] = "d"
+    assert "b" not in lru and "a" in lru and len(lru) == 3
+    lfu = LFUCache(max_entries=3)
+    for key in "abc":
+        lfu[key] = key
+    lfu["a"]
+    lfu["a"]
+    lfu["c"]
+    lfu["d"] = "d"
+    assert "b" not in lfu and all(key in lfu for key in "acd")
+    lfu["e"] = "e"
+    assert "d" not in lfu and lfu.stats()["evictions"] == 2
+
+
+def test_ttl_cache_expires_on_reads():
+    now = [0.0]
+    cache = TTLCache(ttl=10, max_entries=None, timer=lambda: now[0])
+    for i in range(100):
+        cache[i] = i
+    now[0] = 5.0
+    cache["late"] = 1
+    now[0] = 12.0
+    # A read-only workload: one lookup purges every expired entry
+    assert cache.get("late") == 1
+    assert len(cache.table) == 1 and cache.stats()["expirations"] == 100
+    now[0] = 20.0
+    assert cache.expire() == 1 and len(cache) == 0
+
+
+def test_ttl_cache_periodic_expiry():
+    with TTLCache(ttl=0.05, max_entries=None, sweep_interval=0.01) as cache:
+        for i in range(100):
+            cache[i] = i
+        sweeper = cache._sweeper
+        assert sweeper.is_alive()
+        # Nothing touches the cache: only the sweeper can empty its table
+        deadline = time.monotonic() + 5
+        while len(cache.table) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(cache.table) == 0 and cache.stats()["expirations"] == 100
+    assert not sweeper.is_alive()
+    cache[1] = 1
+    assert cache[1] == 1
+    try:
+        TTLCache(ttl=1, sweep_interval=0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a sweep interval of 0 was accepted")
+
+
+def test_byte_limit_with_deep_sizeof():
+    value = [list(range(100)) for _ in range(10)]
+    assert deep_sizeof(value) >= sys.getsizeof(value) + 10 * sys.getsizeof(value[0])
+    cache = LRUCache(max_entries=None, max_bytes=3 * deep_sizeof(value), sizeof=deep_sizeof)
+    for i in range(5):
+        cache[i] = [list(range(100)) for _ in range(10)]
+    assert len(cache) == 3 and cache.stats()["bytes"] <= cache.max_bytes
+    calls = []
+
+    @cached(LRUCache(max_entries=2))
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert [square(2), square(2), square(3)] == [4, 4, 9] and calls == [2, 3]
+
+
+def test_cached_returns_oversized_results_uncached():
+    calls = []
+
+    @cached(LRUCache(max_bytes=200))
+    def numbers(n):
+        calls.append(n)
+        return list(range(n))
+
+    assert numbers(100) == list(range(100)) and numbers(100) == list(range(100))
+    assert calls == [100, 100] and len(numbers.cache) == 0
+    assert numbers(1) == [0] and numbers(1) == [0] and calls == [100, 100, 1]
+
+
+# ConcurrentHashTable (hash_tables/concurrent_hash_table.py)
+def test_strided_keys_spread_across_shards():
+    for shards in (4, 16, 64):
+        table = ConcurrentHashTable(shards)
+        for stride in (1, shards, 1024):
+            counts = [0] * shards
+            for i in range(10_000):
+                counts[table._shard(i * stride)] += 1
+            assert min(counts) > 10_000 / shards / 2
+
+
+def test_concurrent_updates_are_atomic():
+    table = ConcurrentHashTable(shards=4)
+
+    def work():
+        for i in range(2_000):
+            table.update(i % 50, lambda count: count + 1, 0)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(table) == 50
+    assert all(table[i] == 160 for i in range(50))
+    assert table.compute_if_absent(99, str) == "99"
+    del table[99]
+    assert table.get(99) is None and 99 not in table
+
+
+# DiskHashTable (hash_tables/disk_hash_table.py)
+def test_reader_follows_grow_and_compact():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "table")
+        writer = DiskHashTable(path, "n")
+        writer["a"] = "1"
+        reader = DiskHashTable(path, "r")
+        assert len(reader) == 1 and reader.capacity == 8
+        for i in range(1_000):
+            writer[f"key{i}"] = str(i)
+        assert len(reader) == 1_001
+        assert reader.capacity == writer.capacity > 8
+        assert reader["key999"] == b"999"
+        for i in range(500):
+            del writer[f"key{i}"]
+        writer.compact()
+        assert len(reader) == 501
+        assert reader.get("key10") is None and reader["key600"] == b"600"
+        assert sorted(reader.keys()) == sorted(writer.keys())
+        try:
+            reader["b"] = "2"
+        except PermissionError:
+            pass
+        else:
+            raise AssertionError("read-only table accepted a write")
+        reader.close()
+        writer.close()
+        with DiskHashTable(path, "r") as reopened:
+            assert dict(reopened.items()) == {k.encode(): v.encode() for k, v in
+                                              [("a", "1")] + [(f"key{i}", str(i)) for i in range(500, 1_000)]}
+
+
+
+def test_disk_hash_table_accepts_only_str_and_bytes():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with DiskHashTable(os.path.join(temp_dir, "table"), "n") as table:
+            table[bytearray(b"ab")] = memoryview(b"cd")
+            assert table["ab"] == b"cd" and table[b"ab"] == b"cd"
+            for key, value in ((5, "a"), ("a", 5), (None, "a"), ([1], "a")):
+                try:
+                    table[key] = value
+                except TypeError:
+                    pass
+                else:
+                    raise AssertionError("accepted a key or value that is not str or bytes")
+            assert len(table) == 1 and b"\x00" * 5 not in table
+
+
+# HashTable (hash_tables/hash_table.py)
+def test_robin_hood_table_matches_dict():
+    table = HashTable()
+    model = {}
+    rng = random.Random(7)
+    for _ in range(20_000):
+        key = rng.randrange(2_000) * 1024
+        if rng.random() < 0.4 and key in model:
+            del table[key]
+            del model[key]
+        else:
+            table[key] = key + 1
+            model[key] = key + 1
+    assert len(table) == len(model)
+    assert list(table.items()) == list(model.items())
+    assert all(table.get(key) == value for key, value in model.items())
+    assert table.get(-1) is None and -1 not in table
+    stats = table.stats()
+    assert stats["load_factor"] <= table.max_load_factor
+    assert sum(stats["probe_histogram"].values()) == len(model)
+    try:
+        table[-1]
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("missing key did not raise KeyError")
+
+
+def test_expected_size_avoids_resizing():
+    table = HashTable(expected_size=10_000)
+    for i in range(10_000):
+        table[str(i)] = i
+    assert table.stats()["resize_count"] == 0
+
+
+def test_hash_table_views_are_dynamic():
+    table = HashTable()
+    keys, values, items = table.keys(), table.values(), table.items()
+    for i in range(10):
+        table[i] = str(i)
+    del table[3]
+    assert len(keys) == len(values) == len(items) == 9
+    assert 4 in keys and 3 not in keys and "5" in values and "3" not in values
+    assert (6, "6") in items and (6, "7") not in items
+    # Views can be iterated more than once
+    assert list(keys) == list(keys) == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    assert list(items)[:2] == [(0, "0"), (1, "1")]
+    assert keys & {1, 3, 5} == {1, 5} and keys == set(range(10)) - {3}
+    assert list(table) == list(keys)
+
+
+# Queue (queues/queue.py)
+def test_queue_wraps_and_resizes_in_fifo_order():
+    queue = Queue()
+    model = []
+    rng = random.Random(6)
+    for _ in range(5_000):
+        if model and rng.random() < 0.45:
+            assert queue.dequeue() == model.pop(0)
+        else:
+            value = rng.random()
+            queue.enqueue(value)
+            model.append(value)
+        assert len(queue) == len(model)
+        assert queue._ordered() == model
+    while model:
+        assert queue.peek() == model[0]
+        assert queue.dequeue() == model.pop(0)
+    assert queue.capacity == 4 and queue.is_empty()
+
+
+def test_bounded_queue_raises_when_full():
+    queue = Queue(max_capacity=5)
+    for i in range(5):
+        queue.enqueue(i)
+    assert queue.is_full()
+    try:
+        queue.enqueue(5)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("enqueue on a full bounded queue did not raise")
+    assert queue.dequeue() == 0
+    queue.enqueue(5)
+    assert queue._ordered() == [1, 2, 3, 4, 5]
+
+
+# Binary search (searching/binary_search.py)
+def test_interpolation_search_on_large_int64_values():
+    values = numpy.sort(numpy.random.default_rng(0).integers(-2 ** 62, 2 ** 62, 10_000))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        for i in range(0, len(values), 97):
+            assert interpolation_search(values, values[i]) == numpy.searchsorted(values, values[i])
+        assert interpolation_search(values, values[0] - 1) == -1
+
+
+def test_searches_find_first_match():
+    data = sorted(random.Random(3).choices(range(500), k=2_000))
+    for x in range(-1, 502):
+        expected = data.index(x) if x in data else -1
+        assert binary_search(data, x) == expected
+        assert interpolation_search(data, x) == expected
+        assert exponential_search(data, x) == expected
+
+
+def test_batched_and_eytzinger_searches():
+    rng = numpy.random.default_rng(19)
+    for size in (1, 1_000, binary_search_module.SORT_QUERIES_ARRAY + 5):
+        values = numpy.sort(rng.integers(0, 3 * size, size))
+        queries = rng.integers(-1, 3 * size + 1, binary_search_module.SORT_QUERIES_COUNT + 3)
+        for side in ("left", "right"):
+            assert numpy.array_equal(search_many(values, queries, side), numpy.searchsorted(values, queries, side))
+        positions = numpy.searchsorted(values, queries)
+        hits = (positions < size) & (values[numpy.minimum(positions, size - 1)] == queries)
+        assert numpy.array_equal(find_many(values, queries), numpy.where(hits, positions, -1))
+        layout = EytzingerArray(values)
+        assert len(layout) == size
+        assert [layout.value_at(i) for i in range(size)] == values.tolist()
+        for query in queries[:200].tolist():
+            assert layout.bisect_left(query) == bisect_left(values.tolist(), query)
+            assert layout.bisect_right(query) == bisect_right(values.tolist(), query)
+            assert (query in layout) == (query in values)
+        assert numpy.array_equal(layout.search_many(queries, "right"), numpy.searchsorted(values, queries, "right"))
+
+
+# Linear search (searching/linear_search.py)
+def test_linear_search_agrees_across_input_types():
+    rng = random.Random(4)
+    values = [rng.randrange(20) for _ in range(300_000)]
+    inputs = [values, numpy.array(values), array.array("q", values), bytes(values)]
+    for data in inputs:
+        for start in (-400_000, -150_000, -1, 0, 7, 299_999):
+            for x in (0, 19, 99):
+                expected = values.index(x, start) if x in values[start:] else -1
+                assert linear_search(data, x, start) == expected
+        assert find_any(data, [99, 5], -10) == next((i for i in range(len(values) - 10, len(values))
+                                                     if values[i] == 5), -1)
+        assert list(find_all(data, 3)) == [i for i, value in enumerate(values) if value == 3]
+        assert find_each(data, [3, 99]) == {3: values.index(3), 99: -1}
+
+
+def test_stream_and_block_searches():
+    stream = (i * i for i in range(1_000))
+    matches = search_stream(stream, lambda value: value % 7 == 1)
+    assert next(matches) == (1, 1) and next(matches) == (6, 36)
+    # The generator was not consumed past the second match
+    assert next(stream) == 49
+    blocks = [numpy.arange(start, start + 100) for start in range(0, 1_000, 100)] + [array.array("q", [5, 600])]
+    assert list(search_blocks(iter(blocks), lambda block: block % 250 == 0)) == [0, 250, 500, 750]
+    assert list(search_blocks(blocks, lambda block: block == 600)) == [600, 1_001]
+
+
+# External sort (sorting/external_sort.py)
+def test_external_sort_merges_only_the_excess_runs():
+    rng = random.Random(5)
+    records = [(rng.randrange(50), i) for i in range(1_000)]
+    expected = sorted(records, key=lambda record: record[0])
+    # 10 records per run (8 bytes each with sizeof 0), so 100 initial runs
+    for fan_in in (64, 8, 3):
+        sorter = ExternalSorter(key=lambda record: record[0], memory_limit=80, fan_in=fan_in, sizeof=lambda record: 0)
+        assert list(sorter.sort(iter(records))) == expected
+        stats = sorter.stats()
+        assert stats["initial_runs"] == 100
+        assert stats["records_out"] == 1_000
+    # 100 runs with fan_in 64: one partial pass rewrites 37 runs, then the final merge
+    sorter = ExternalSorter(memory_limit=80, fan_in=64, sizeof=lambda record: 0)
+    list(sorter.sort(iter(range(1_000, 0, -1))))
+    assert sorter.stats()["runs_written"] == 101
+    assert sorter.stats()["merge_passes"] == 2
+
+
+def test_external_sort_in_memory_and_reverse():
+    sorter = ExternalSorter(reverse=True)
+    assert list(sorter.sort([3, 1, 2])) == [3, 2, 1]
+    assert sorter.stats()["runs_written"] == 0
+    assert list(ExternalSorter().sort([])) == []
+
+
+# Merge sort (sorting/merge_sort.py)
+def _sort_patterns(n, seed):
+    rng = random.Random(seed)
+    return {
+        "random": [rng.randrange(n) for _ in range(n)],
+        "few distinct": [rng.randrange(4) for _ in range(n)],
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "runs": [i % 97 for i in range(n)],
+        "sawtooth": sorted(rng.sample(range(10 * n), n // 2)) + sorted(rng.sample(range(10 * n), n - n // 2)),
+    }
+
+
+def test_merge_sort_is_stable():
+    # Sizes around MIN_MERGE cover the insertion-only, natural-run and galloping merge paths
+    for n in (0, 1, 2, MIN_MERGE - 1, MIN_MERGE + 1, 5_000):
+        for name, keys in _sort_patterns(n, n).items():
+            records = [(key, i) for i, key in enumerate(keys)]
+            for reverse in (False, True):
+                result = merge_sort(list(records), key=lambda record: record[0], reverse=reverse)
+                assert result == sorted(records, key=lambda record: record[0], reverse=reverse), (n, name)
+            assert merge_sort(list(keys)) == sorted(keys)
+    # Two natural runs whose blocks each win far more than MIN_GALLOP times in a row
+    block = 100 * MIN_GALLOP
+    runs = [*range(block), *range(2 * block, 3 * block), *range(block, 2 * block)]
+    records = [(key // 2, i) for i, key in enumerate(runs)]
+    assert merge_sort(list(runs)) == list(range(3 * block))
+    assert merge_sort(list(records), key=lambda record: record[0]) == sorted(records, key=lambda record: record[0])
+
+
+def test_merge_sort_dynamic_arrays():
+    arr = DynamicArrays("q")
+    arr.extend([5, 3, 9, 1, 3])
+    assert list(merge_sort(arr).view()) == [1, 3, 3, 5, 9]
+    try:
+        merge_sort((3, 1))
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("merge_sort accepted a tuple")
+
+
+# Introsort and selection (sorting/quick_sort.py)
+def test_quick_sort_patterns_and_selection():
+    for n in (0, 1, quick_sort_module.INSERTION_CUTOFF, quick_sort_module.NINTHER_THRESHOLD + 1, 5_000):
+        for name, keys in _sort_patterns(n, n + 1).items():
+            assert quick_sort(list(keys)) == sorted(keys), (n, name)
+            assert quick_sort(list(keys), key=lambda key: -key, reverse=True) == sorted(keys), (n, name)
+            if keys:
+                for k in (0, n // 2, -1):
+                    assert quickselect(keys, k) == sorted(keys)[k]
+                    partitioned = nth_element(list(keys), k)
+                    pivot = partitioned[k]
+                    assert pivot == sorted(keys)[k]
+                    k %= n
+                    assert max(partitioned[:k], default=pivot) <= pivot <= min(partitioned[k + 1:], default=pivot)
+
+
+def test_introsort_switches_to_heapsort(monkeypatch):
+    heapsorted = []
+    heapsort = quick_sort_module._heapsort
+
+    def counting_heapsort(keys, values, lo, hi):
+        heapsorted.append(hi - lo)
+        heapsort(keys, values, lo, hi)
+
+    # Always choosing the smallest key as pivot peels off one item per partition
+    monkeypatch.setattr(quick_sort_module, "_choose_pivot", lambda keys, lo, hi: min(keys[lo:hi]))
+    monkeypatch.setattr(quick_sort_module, "_heapsort", counting_heapsort)
+    keys = random.Random(14).sample(range(10_000), 2_000)
+    records = [(key, str(key)) for key in keys]
+    assert quick_sort(list(records), key=lambda record: record[0]) == sorted(records)
+    assert heapsorted and quickselect(keys, 1_000) == sorted(keys)[1_000]
+    try:
+        quickselect(keys, 2_000)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("quickselect accepted an out-of-range k")
+
+
+# Radix and counting sort (sorting/radix_sort.py, sorting/counting_sort.py)
+def test_radix_sort_numeric_types():
+    rng = numpy.random.default_rng(16)
+    inputs = [
+        rng.integers(-2 ** 63, 2 ** 63 - 1, 5_000, dtype=numpy.int64),
+        rng.integers(0, 2 ** 64 - 1, 5_000, dtype=numpy.uint64),
+        rng.integers(-100, 100, 5_000).astype(numpy.int8),
+        numpy.concatenate([rng.standard_normal(5_000) * 1e6, [0.0, -0.0, numpy.inf, -numpy.inf]]),
+        rng.standard_normal(5_000).astype(numpy.float32),
+        # High digits equal for every key: those passes are skipped
+        rng.integers(1_700_000_000, 1_700_086_400, 5_000),
+    ]
+    for keys in inputs:
+        expected = numpy.sort(keys, kind="stable")
+        assert numpy.array_equal(radix_sort(keys.copy()), expected)
+        order = radix_argsort(keys)
+        if keys.dtype.kind == "f":
+            # -0.0 sorts before 0.0 here, while argsort treats them as equal
+            assert numpy.array_equal(keys[order], expected)
+        else:
+            assert numpy.array_equal(order, numpy.argsort(keys, kind="stable"))
+    values = [int(x) for x in rng.integers(-1_000, 1_000, 1_000)]
+    assert radix_sort(list(values)) == sorted(values)
+    typed = array.array("d", [3.5, -1.0, 2.0])
+    assert list(radix_sort(typed)) == [-1.0, 2.0, 3.5]
+
+
+def test_radix_sort_strings_and_counting_sort():
+    rng = random.Random(16)
+    words = ["".join(rng.choice("abc") for _ in range(rng.randrange(6))) for _ in range(2_000)] + ["é", "z", "ab"]
+    assert radix_sort(list(words)) == sorted(words)
+    blobs = [word.encode() for word in words]
+    assert radix_sort(list(blobs)) == sorted(blobs)
+    small_range = numpy.random.default_rng(17).integers(-50, 50, 3_000)
+    for layout in (None, "dense", "sparse"):
+        assert numpy.array_equal(counting_sort(small_range.copy(), layout), numpy.sort(small_range))
+    assert counting_sort([10 ** 12, -5, 3, 10 ** 12, 0]) == [-5, 0, 3, 10 ** 12, 10 ** 12]
+    assert choose_layout(numpy.array([0, 10 ** 9])) == "sparse"
+    try:
+        counting_sort(numpy.array([1.5, 0.5]))
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("counting_sort accepted float keys")
+
+
+# Parallel sample sort (sorting/parallel_sort.py)
+def test_parallel_sort_paths(monkeypatch):
+    monkeypatch.setattr(parallel_sort_module, "PARALLEL_THRESHOLD", 1_000)
+    rng = random.Random(18)
+    floats = numpy.random.default_rng(18).standard_normal(5_000)
+    assert numpy.array_equal(parallel_sort(floats.copy(), workers=3), numpy.sort(floats))
+    assert numpy.array_equal(parallel_sort(floats.copy(), workers=2, reverse=True), numpy.sort(floats)[::-1])
+    records = [(rng.randrange(30), i) for i in range(5_000)]
+    for reverse in (False, True):
+        expected = sorted(records, key=lambda record: record[0], reverse=reverse)
+        assert parallel_sort(list(records), workers=3, key=lambda record: record[0], reverse=reverse) == expected
+    words = [str(rng.randrange(10 ** 6)) for _ in range(5_000)]
+    assert parallel_sort(list(words), workers=2) == sorted(words)
+    assert parallel_sort(list(words[:10]), workers=4) == sorted(words[:10])
+    try:
+        parallel_sort(words, workers=0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("parallel_sort accepted workers=0")
+
+
+# SortedMap / SortedSet (trees/avl_tree.py)
+def test_packed_from_sorted_then_insert():
+    tree = PackedAVLTree.from_sorted((i, i) for i in range(10))
+    assert len(tree.left) == len(tree.right) == len(tree.sizes) == len(tree.heights) == 11
+    tree.insert(100)
+    tree.insert(101)
+    assert len(tree) == 12
+    assert tree.rank(101) == 11
+    assert tree.select(-1) == 101
+    assert list(tree) == [*range(10), 100, 101]
+
+
+def test_sorted_containers_bulk_load_then_mutate():
+    for packed in (False, True):
+        random.seed(1)
+        keys = random.sample(range(10_000), 500)
+        board = SortedMap({key: -key for key in keys}, packed=packed)
+        model = sorted(keys)
+        for _ in range(1_000):
+            key = random.randrange(10_000)
+            if key in board:
+                assert board.pop(key) == -key
+                model.remove(key)
+            else:
+                board[key] = -key
+                model.append(key)
+                model.sort()
+        assert len(board) == len(model)
+        assert list(board) == model
+        for k in range(0, len(model), 37):
+            assert board.select(k) == model[k]
+            assert board.rank(model[k]) == k
+        members = SortedSet(range(0, 100, 2), packed=packed)
+        members.add(51)
+        members.discard(50)
+        assert len(members) == 50
+        assert members.select(members.rank(51)) == 51
+        assert list(members.range(48, 56)) == [48, 51, 52, 54]
+
+
+def test_order_queries_and_balance():
+    rng = random.Random(21)
+    keys = rng.sample(range(0, 20_000, 2), 3_000)
+    for tree in (BinarySearchTree(), AVLTree(), PackedAVLTree()):
+        for key in keys:
+            tree.insert(key, -key)
+        for key in keys[:1_000]:
+            assert tree.delete(key) == -key
+        model = sorted(keys[1_000:])
+        assert list(tree) == model and len(tree) == len(model)
+        for probe in range(-1, 20_001, 97):
+            i = bisect.bisect_left(model, probe)
+            j = bisect.bisect_right(model, probe)
+            assert tree.floor(probe) == (model[j - 1] if j else None)
+            assert tree.ceiling(probe) == (model[i] if i < len(model) else None)
+            assert tree.predecessor(probe) == (model[i - 1] if i else None)
+            assert tree.successor(probe) == (model[j] if j < len(model) else None)
+            assert tree.rank(probe) == i
+        assert [key for key, _ in tree.range(500, 900, reverse=True)] == [k for k in reversed(model) if 500 <= k < 900]
+        if type(tree) is not BinarySearchTree:
+            assert tree.height() <= 1.45 * math.log2(len(model) + 2)
+    # Sorted inserts make a degenerate BST, which must not hit the recursion limit
+    chain = BinarySearchTree()
+    for key in range(2_000):
+        chain.insert(key)
+    assert chain.height() == 2_000 and chain.select(1_999) == 1_999 and list(chain) == list(range(2_000))
+
+
+# B+tree (trees/b_plus_tree.py)
+def _check_b_plus_tree(tree, model):
+    ordered = sorted(model.items())
+    assert len(tree) == len(model)
+    assert list(tree.items()) == ordered
+    rng = random.Random(len(model))
+    for _ in range(50):
+        lo, hi = sorted(rng.randrange(-10, 10_010) for _ in range(2))
+        assert list(tree.range(lo, hi)) == [(k, v) for k, v in ordered if lo <= k < hi]
+    assert all(tree.get(key) == value for key, value in ordered[::37])
+    assert tree.get(-5) is None and -5 not in tree
+
+
+def test_b_plus_tree_splits_merges_and_bulk_loads():
+    rng = random.Random(22)
+    loaded = BPlusTree.from_sorted([(key, key) for key in range(0, 3_000, 3)], fill=0.5, order=8)
+    for tree in (BPlusTree(order=4), BPlusTree(order=16), loaded):
+        model = dict(tree.items())
+        for _ in range(6_000):
+            key = rng.randrange(10_000)
+            if key in model and rng.random() < 0.5:
+                assert tree.delete(key) == model.pop(key)
+            else:
+                tree[key] = key * 2
+                model[key] = key * 2
+        _check_b_plus_tree(tree, model)
+        for key in list(model):
+            del tree[key]
+        assert len(tree) == 0 and tree.height() == 1 and list(tree) == []
+    try:
+        BPlusTree().bulk_load([(2, 0), (1, 0)])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("bulk_load accepted unsorted keys")
+
+
+def test_disk_b_plus_tree_persists():
+    rng = random.Random(23)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "index.bpt")
+        model = {key: key + 1 for key in range(0, 5_000, 2)}
+        # A small page cache forces evictions and write-backs
+        with DiskBPlusTree.from_sorted(sorted(model.items()), fill=0.7, path=path, mode="n", page_size=256,
+                                       cache_pages=8) as tree:
+            for _ in range(3_000):
+                key = rng.randrange(10_000)
+                if key in model and rng.random() < 0.5:
+                    assert tree.delete(key) == model.pop(key)
+                else:
+                    tree[key] = -key
+                    model[key] = -key
+            _check_b_plus_tree(tree, model)
+            assert tree.stats()["size"] == len(model)
+        with DiskBPlusTree(path) as reopened:
+            _check_b_plus_tree(reopened, model)
+            try:
+                reopened[1] = 1
+            except PermissionError:
+                pass
+            else:
+                raise AssertionError("read-only tree accepted a write")
+        with DiskBPlusTree(path, "w") as tree:
+            try:
+                tree[1] = 2 ** 70
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("value outside the int64 format accepted")
+
+
+# Range aggregates (trees/binary_tree.py)
+def test_fenwick_trees_match_a_list():
+    rng = random.Random(24)
+    values = [rng.randrange(-50, 50) for _ in range(300)]
+    packed = DynamicArrays("q")
+    packed.extend(values)
+    # A list, a NumPy array, a DynamicArrays, and values too large for int64
+    for data in (values, numpy.array(values), packed, [v * 2 ** 70 for v in values]):
+        points, ranges = [int(v) for v in data], [int(v) for v in data]
+        point, ranged = FenwickTree(data), RangeFenwickTree(data)
+        for _ in range(500):
+            lo, hi = sorted(rng.randrange(len(values) + 1) for _ in range(2))
+            i, delta = rng.randrange(len(values)), rng.randrange(-9, 10)
+            point.add(i, delta)
+            points[i] += delta
+            ranged.add(lo, hi, delta)
+            for j in range(lo, hi):
+                ranges[j] += delta
+            assert point.range_sum(lo, hi) == sum(points[lo:hi])
+            assert ranged.range_sum(lo, hi) == sum(ranges[lo:hi])
+            assert ranged.prefix_sum(hi) == sum(ranges[:hi])
+        point[-1] = ranged[-1] = points[-1] = ranges[-1] = 7
+        assert [point[j] for j in range(len(values))] == points
+        assert [ranged[j] for j in range(len(values))] == ranges
+    try:
+        FenwickTree([1, 2]).range_sum(1, 3)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("range past the end accepted")
+
+
+def test_segment_trees_match_a_list():
+    rng = random.Random(25)
+    values = [rng.randrange(-1_000, 1_000) for _ in range(257)]
+    for data in (values, numpy.array(values)):
+        for op, identity in ((operator.add, 0), (min, math.inf), (max, -math.inf)):
+            model = list(values)
+            tree = SegmentTree(data, op=op, identity=identity)
+            for _ in range(300):
+                i, value = rng.randrange(len(model)), rng.randrange(-1_000, 1_000)
+                tree[i] = model[i] = value
+                lo, hi = sorted(rng.randrange(len(model) + 1) for _ in range(2))
+                expected = identity
+                for x in model[lo:hi]:
+                    expected = op(expected, x)
+                assert tree.query(lo, hi) == expected
+            assert tree.query() == functools.reduce(op, model)
+    # A non-commutative op keeps the order of the values
+    words = SegmentTree(list("segment"), op=operator.add, identity="")
+    words[0] = "S"
+    assert words.query() == "Segment" and words.query(2, 5) == "gme" and words.query(3, 3) == ""
+
+
+def test_lazy_segment_tree_matches_a_list():
+    rng = random.Random(26)
+    values = [rng.randrange(-100, 100) for _ in range(100)]
+    add_sum = LazySegmentTree(numpy.array(values))
+    add_min = LazySegmentTree(values, op=min, identity=math.inf, mapping=lambda f, x, length: x + f)
+    assign_sum = LazySegmentTree(values, mapping=lambda f, x, length: f * length, composition=lambda f, g: f)
+    sums, lows, assigned = list(values), list(values), list(values)
+    for _ in range(1_000):
+        lo, hi = sorted(rng.randrange(len(values) + 1) for _ in range(2))
+        f = rng.randrange(-20, 20)
+        kind = rng.randrange(3)
+        if kind == 0:
+            add_sum.apply(lo, hi, f)
+            add_min.apply(lo, hi, f)
+            assign_sum.apply(lo, hi, f)
+            for j in range(lo, hi):
+                sums[j] += f
+                lows[j] += f
+                assigned[j] = f
+        elif kind == 1:
+            i = rng.randrange(len(values))
+            add_sum[i] = add_min[i] = assign_sum[i] = sums[i] = lows[i] = assigned[i] = f
+        else:
+            assert add_sum.query(lo, hi) == sum(sums[lo:hi])
+            assert add_min.query(lo, hi) == min(lows[lo:hi], default=math.inf)
+            assert assign_sum.query(lo, hi) == sum(assigned[lo:hi])
+    assert [add_sum[j] for j in range(len(values))] == sums
+    assert [add_min[j] for j in range(len(values))] == lows
+    assert [assign_sum[j] for j in range(len(values))] == assigned
+
+
+# Radix tree (trees/radix_tree.py)
+def _check_radix_tree(tree, model, probes):
+    assert len(tree) == len(model)
+    assert list(tree) == sorted(model)
+    assert list(tree.items()) == sorted(model.items())
+    for probe in probes:
+        assert tree.get(probe, "missing") == model.get(probe, "missing")
+        assert (probe in tree) == (probe in model)
+        assert list(tree.keys_with_prefix(probe)) == sorted(key for key in model if key.startswith(probe))
+        matches = [key for key in model if probe.startswith(key)]
+        best = max(matches, key=len) if matches else None
+        assert tree.longest_prefix(probe) == ((best, model[best]) if matches else None)
+    stats = tree.stats()
+    assert stats["keys"] == len(model) and stats["nodes"] <= 2 * len(model) + 1
+
+
+def test_radix_tree_matches_a_dict():
+    rng = random.Random(27)
+    for alphabet, to_key in (("ab", str), ("abc", str), ("xyz", str.encode)):
+        def word():
+            return to_key("".join(rng.choices(alphabet, k=rng.randrange(9))))
+        tree, model = RadixTree(), {}
+        for _ in range(2_000):
+            key = word()
+            if key in model and rng.random() < 0.5:
+                assert tree.delete(key) == model.pop(key)
+            else:
+                value = rng.randrange(100)
+                assert tree.insert(key, value) == (key not in model)
+                model[key] = value
+        _check_radix_tree(tree, model, [word() for _ in range(200)])
+        # Deleting everything merges the tree back to a bare root
+        for key in list(model):
+            del tree[key]
+            del model[key]
+            if len(model) % 97 == 0:
+                _check_radix_tree(tree, model, [word() for _ in range(20)])
+        assert len(tree) == 0 and tree.stats()["nodes"] == 1
+        try:
+            tree.delete(word())
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("deleted a key from an empty tree")
+
+
+def test_radix_tree_prefix_queries():
+    routes = RadixTree({"": "default", "10.": "private", "10.1.": "lab", "192.168.": "home", "10.1.2.3": "host"})
+    assert routes.longest_prefix("10.1.2.3") == ("10.1.2.3", "host")
+    assert routes.longest_prefix("10.1.9.9") == ("10.1.", "lab")
+    assert routes.longest_prefix("10.2.0.1") == ("10.", "private")
+    assert routes.longest_prefix("8.8.8.8") == ("", "default")
+    assert list(routes.keys_with_prefix("10.1")) == ["10.1.", "10.1.2.3"]
+    assert list(routes.keys_with_prefix("10.1.2.30")) == []
+    # Values may be None, and a key can sit in the middle of an edge
+    words = RadixTree(["tea", "team", "ten"])
+    assert "te" not in words and words["tea"] is None and words.get("te", 0) == 0
+    words.insert("te")
+    assert list(words) == ["te", "tea", "team", "ten"]
+    words.delete("tea")
+    assert list(words.keys_with_prefix("tea")) == ["team"]
+    assert words.stats()["label_chars"] == len("te") + len("am") + len("n")
+
+
+# Tree traversals (trees/traversals.py)
+def _random_search_tree(rng, n):
+    root = None
+    for key in rng.sample(range(10 * n), n):
+        if root is None:
+            root = Node(key)
+            continue
+        node = root
+        while True:
+            side = "left" if key < node.key else "right"
+            child = getattr(node, side)
+            if child is None:
+                setattr(node, side, Node(key))
+                break
+            node = child
+    return root
+
+
+def _recursive_orders(node, orders):
+    if node is None:
+        return
+    orders["pre"].append(node.key)
+    _recursive_orders(node.left, orders)
+    orders["in"].append(node.key)
+    _recursive_orders(node.right, orders)
+    orders["post"].append(node.key)
+
+
+def test_traversals_match_recursive_orders():
+    rng = random.Random(23)
+    for n in (0, 1, 2, 50, 500):
+        root = _random_search_tree(rng, n)
+        orders = {"pre": [], "in": [], "post": []}
+        _recursive_orders(root, orders)
+        assert [node.key for node in preorder(root)] == orders["pre"]
+        assert [node.key for node in inorder(root)] == orders["in"] == sorted(orders["in"])
+        assert [node.key for node in postorder(root)] == orders["post"]
+        assert [node.key for node in inorder(root, reverse=True)] == orders["in"][::-1]
+        assert [node.key for node in morris_inorder(root)] == orders["in"]
+        assert [node.key for node in morris_inorder(root, reverse=True)] == orders["in"][::-1]
+        assert sorted(node.key for node in level_order(root)) == orders["in"]
+        for start in (rng.randrange(-1, 10 * n + 2) for _ in range(10)):
+            assert [node.key for node in inorder(root, start=start)] == [k for k in orders["in"] if k >= start]
+            assert ([node.key for node in inorder(root, start=start, reverse=True)]
+                    == [k for k in reversed(orders["in"]) if k <= start])
+        # Stopping a Morris walk early must remove every thread
+        walk = morris_inorder(root)
+        for _ in zip(range(n // 2), walk):
+            pass
+        walk.close()
+        again = {"pre": [], "in": [], "post": []}
+        _recursive_orders(root, again)
+        assert again == orders
+
+
+def test_traversals_level_order_and_deep_trees():
+    #       1
+    #     2   3
+    #    4   5 6
+    root = Node(1, left=Node(2, left=Node(4)), right=Node(3, left=Node(5), right=Node(6)))
+    assert [node.key for node in level_order(root)] == [1, 2, 3, 4, 5, 6]
+    assert [node.key for node in preorder(root)] == [1, 2, 4, 3, 5, 6]
+    assert [node.key for node in postorder(root)] == [4, 2, 5, 6, 3, 1]
+    # A chain far deeper than the recursion limit
+    depth = sys.getrecursionlimit() * 3
+    chain = None
+    for key in range(depth):
+        chain = Node(key, right=chain)
+    assert sum(1 for _ in inorder(chain)) == depth
+    assert sum(1 for _ in postorder(chain)) == depth
+    assert next(iter(morris_inorder(chain))).key == depth - 1
@@ -0,0 +1,535 @@
+# AVL Tree
+# Self-balancing binary search tree: at every node the heights of the two subtrees
+# differ by at most one, so the height stays below 1.44 * log2(n) and insert,
+# delete, lookups, floor/ceiling, rank and select are all O(log n).
+#   AVLTree       > BinarySearchTree with rotations, one __slots__ Node per key
+#   PackedAVLTree > the same tree in a node pool: parallel arrays indexed by node id
+#   SortedMap     > sorted dict built on either tree
+#   SortedSet     > sorted set built on either tree
+#
+# Node pool layout (PackedAVLTree): node i is keys[i], values[i], left[i], right[i],
+# heights[i] and sizes[i]. Links are ints in array.array columns instead of object
+# references, so a node costs about 29 bytes instead of an 80-byte object.
+# Node 0 is a shared empty node (height 0, size 0) that stands for "no child".
+# Deleted ids go on a free list and are reused by later inserts.
+import array
+import operator
+
+from trees.bst import BinarySearchTree, _height, _update
+
+# Marks a missing key (None is a valid value)
+_MISSING = object()
+
+
+class AVLTree(BinarySearchTree):
+    # Restores the AVL balance at a node after one of its subtrees changed height.
+    # Returns the root of the (possibly rotated) subtree.
+    def _rebalance(self, node):
+        _update(node)
+        balance = _height(node.left) - _height(node.right)
+        if balance > 1:
+            # Left-right case: rotate the left child first
+            if _height(node.left.left) < _height(node.left.right):
+                node.left = _rotate_left(node.left)
+            return _rotate_right(node)
+        if balance < -1:
+            # Right-left case: rotate the right child first
+            if _height(node.right.right) < _height(node.right.left):
+                node.right = _rotate_right(node.right)
+            return _rotate_left(node)
+        return node
+
+
+# Rotates a subtree right (its left child becomes the root) and returns the new root.
+def _rotate_right(node):
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+# Rotates a subtree left (its right child becomes the root) and returns the new root.
+def _rotate_left(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+# AVL tree stored in a node pool (see the layout at the top of the file).
+# Same methods as AVLTree.
+class PackedAVLTree:
+    # Initializes an empty pool holding only the empty node 0.
+    def __init__(self):
+        self.keys = [None]
+        self.values = [None]
+        self.left = array.array("i", [0])
+        self.right = array.array("i", [0])
+        self.heights = array.array("b", [0])
+        self.sizes = array.array("i", [0])
+        self.free = []
+        self.root = 0
+
+    # Builds a balanced tree from (key, value) pairs sorted by strictly increasing key, in O(n).
+    # Raises ValueError if the keys are not strictly increasing.
+    @classmethod
+    def from_sorted(cls, items):
+        items = list(items)
+        for i in range(1, len(items)):
+            if not items[i - 1][0] < items[i][0]:
+                raise ValueError("Keys must be sorted and unique.")
+        tree = cls()
+        n = len(items)
+        # Node ids 1..n follow the sorted order, so only the links have to be computed
+        tree.keys.extend(item[0] for item in items)
+        tree.values.extend(item[1] for item in items)
+        # frombytes adds n zeroed items (extend(bytes(...)) would add one per byte)
+        for column in (tree.left, tree.right, tree.heights, tree.sizes):
+            column.frombytes(bytes(column.itemsize * n))
+        tree.root = tree._build(1, n + 1)
+        return tree
+
+    # Links ids lo..hi-1 into a balanced subtree and returns its root id.
+    # Recursion depth is log2(n).
+    def _build(self, lo, hi):
+        if lo >= hi:
+            return 0
+        mid = (lo + hi) // 2
+        self.left[mid] = self._build(lo, mid)
+        self.right[mid] = self._build(mid + 1, hi)
+        self._update(mid)
+        return mid
+
+    # Returns the number of keys.
+    def __len__(self):
+        return self.sizes[self.root]
+
+    # Returns True if the key is in the tree.
+    def __contains__(self, key):
+        return self._find(key) != 0
+
+    # Iterates over the keys in ascending order.
+    def __iter__(self):
+        for key, _ in self.range():
+            yield key
+
+    # Returns the height of the tree (0 when empty).
+    def height(self):
+        return self.heights[self.root]
+
+    # Returns the id of the node holding a key, or 0.
+    def _find(self, key):
+        keys, left, right = self.keys, self.left, self.right
+        node = self.root
+        while node:
+            if key < keys[node]:
+                node = left[node]
+            elif keys[node] < key:
+                node = right[node]
+            else:
+                return node
+        return 0
+
+    # Returns the value stored for a key, or default if the key is missing.
+    def get(self, key, default=None):
+        node = self._find(key)
+        return default if node == 0 else self.values[node]
+
+    # Takes a node id from the free list, or appends a new one to the pool.
+    def _new_node(self, key, value):
+        if self.free:
+            node = self.free.pop()
+            self.keys[node] = key
+            self.values[node] = value
+            self.left[node] = self.right[node] = 0
+            self.heights[node] = self.sizes[node] = 1
+            return node
+        self.keys.append(key)
+        self.values.append(value)
+        self.left.append(0)
+        self.right.append(0)
+        self.heights.append(1)
+        self.sizes.append(1)
+        return len(self.keys) - 1
+
+    # Adds a key with a value, or replaces the value of an existing key.
+    # Returns True if the key was new.
+    def insert(self, key, value=None):
+        keys = self.keys
+        path = []
+        node = self.root
+        while node:
+            if key < keys[node]:
+                path.append((node, True))
+                node = self.left[node]
+            elif keys[node] < key:
+                path.append((node, False))
+                node = self.right[node]
+            else:
+                self.values[node] = value
+                return False
+        self._relink(path, self._new_node(key, value))
+        return True
+
+    # Removes a key and returns its value. Raises KeyError if the key is missing.
+    def delete(self, key):
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        node = self.root
+        while node and (key < keys[node] or keys[node] < key):
+            went_left = key < keys[node]
+            path.append((node, went_left))
+            node = left[node] if went_left else right[node]
+        if node == 0:
+            raise KeyError(key)
+        value = self.values[node]
+        if left[node] and right[node]:
+            # Two children: move the successor (leftmost node on the right) up into this node
+            path.append((node, False))
+            successor = right[node]
+            while left[successor]:
+                path.append((successor, True))
+                successor = left[successor]
+            keys[node], self.values[node] = keys[successor], self.values[successor]
+            removed, replacement = successor, right[successor]
+        else:
+            removed, replacement = node, left[node] or right[node]
+        # Release the slot (drop references so keys and values can be freed)
+        keys[removed] = self.values[removed] = None
+        self.free.append(removed)
+        self._relink(path, replacement)
+        return value
+
+    # Hangs child under the last node of the path, then rebalances the path bottom-up.
+    def _relink(self, path, child):
+        for node, went_left in reversed(path):
+            if went_left:
+                self.left[node] = child
+            else:
+                self.right[node] = child
+            child = self._rebalance(node)
+        self.root = child
+
+    # Recomputes a node's height and size from its children.
+    def _update(self, node):
+        left, right, heights = self.left[node], self.right[node], self.heights
+        heights[node] = max(heights[left], heights[right]) + 1
+        self.sizes[node] = self.sizes[left] + self.sizes[right] + 1
+
+    # Restores the AVL balance at a node; returns the root id of the subtree.
+    def _rebalance(self, node):
+        left, right, height = self.left, self.right, self.heights
+        self._update(node)
+        balance = height[left[node]] - height[right[node]]
+        if balance > 1:
+            if height[left[left[node]]] < height[right[left[node]]]:
+                left[node] = self._rotate_left(left[node])
+            return self._rotate_right(node)
+        if balance < -1:
+            if height[right[right[node]]] < height[left[right[node]]]:
+                right[node] = self._rotate_right(right[node])
+            return self._rotate_left(node)
+        return node
+
+    def _rotate_right(self, node):
+        pivot = self.left[node]
+        self.left[node] = self.right[pivot]
+        self.right[pivot] = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_left(self, node):
+        pivot = self.right[node]
+        self.right[node] = self.left[pivot]
+        self.left[pivot] = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    # Removes every key and releases the pool.
+    def reset(self):
+        self.__init__()
+
+    # Returns the largest key <= key, or None.
+    def floor(self, key):
+        keys, best, node = self.keys, 0, self.root
+        while node:
+            if key < keys[node]:
+                node = self.left[node]
+            else:
+                best, node = node, self.right[node]
+        return keys[best]
+
+    # Returns the smallest key >= key, or None.
+    def ceiling(self, key):
+        keys, best, node = self.keys, 0, self.root
+        while node:
+            if keys[node] < key:
+                node = self.right[node]
+            else:
+                best, node = node, self.left[node]
+        return keys[best]
+
+    # Returns the largest key < key, or None.
+    def predecessor(self, key):
+        keys, best, node = self.keys, 0, self.root
+        while node:
+            if keys[node] < key:
+                best, node = node, self.right[node]
+            else:
+                node = self.left[node]
+        return keys[best]
+
+    # Returns the smallest key > key, or None.
+    def successor(self, key):
+        keys, best, node = self.keys, 0, self.root
+        while node:
+            if key < keys[node]:
+                best, node = node, self.left[node]
+            else:
+                node = self.right[node]
+        return keys[best]
+
+    # Returns the number of keys < key.
+    def rank(self, key):
+        keys, size = self.keys, self.sizes
+        rank, node = 0, self.root
+        while node:
+            if key < keys[node]:
+                node = self.left[node]
+            elif keys[node] < key:
+                rank += size[self.left[node]] + 1
+                node = self.right[node]
+            else:
+                return rank + size[self.left[node]]
+        return rank
+
+    # Returns the k-th smallest key (0-based; negative k counts from the end).
+    # Raises IndexError if k is out of range.
+    def select(self, k):
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("Index entered is out of bounds.")
+        node = self.root
+        while True:
+            left_size = self.sizes[self.left[node]]
+            if k < left_size:
+                node = self.left[node]
+            elif k > left_size:
+                k -= left_size + 1
+                node = self.right[node]
+            else:
+                return self.keys[node]
+
+    # Yields (key, value) for every key with lo <= key < hi, ascending (descending if reverse).
+    # Same pruning as BinarySearchTree.range. The tree must not be modified during iteration.
+    def range(self, lo=None, hi=None, reverse=False):
+        keys = self.keys
+        # Walk down the "near" side first: left when ascending, right when descending
+        near, far = (self.left, self.right) if not reverse else (self.right, self.left)
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                key = keys[node]
+                outside = (lo is not None and key < lo) if not reverse else (hi is not None and not key < hi)
+                if outside:
+                    node = far[node]
+                else:
+                    stack.append(node)
+                    node = near[node]
+            if not stack:
+                return
+            node = stack.pop()
+            key = keys[node]
+            if (not reverse and hi is not None and not key < hi) or (reverse and lo is not None and key < lo):
+                return
+            yield key, self.values[node]
+            node = far[node]
+
+
+# Sorted dict: keys are kept in order, and every update is O(log n).
+# packed=True stores the tree in a node pool (PackedAVLTree) to save memory.
+class SortedMap:
+    # Initializes the map, optionally from a mapping or (key, value) pairs (in any order;
+    # for duplicate keys the last value wins).
+    def __init__(self, items=None, packed=False):
+        self.tree = PackedAVLTree() if packed else AVLTree()
+        if items:
+            if hasattr(items, "items"):
+                items = items.items()
+            ordered = sorted(items, key=operator.itemgetter(0))
+            unique = []
+            for item in ordered:
+                if unique and not unique[-1][0] < item[0]:
+                    unique[-1] = item
+                else:
+                    unique.append(item)
+            self.tree = type(self.tree).from_sorted(unique)
+
+    # Builds a map from (key, value) pairs already sorted by strictly increasing key, in O(n).
+    @classmethod
+    def from_sorted(cls, items, packed=False):
+        sorted_map = cls(packed=packed)
+        sorted_map.tree = type(sorted_map.tree).from_sorted(items)
+        return sorted_map
+
+    def __len__(self):
+        return len(self.tree)
+
+    def __contains__(self, key):
+        return key in self.tree
+
+    # Returns the value for a key. Raises KeyError if the key is missing.
+    def __getitem__(self, key):
+        value = self.tree.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.tree.insert(key, value)
+
+    # Removes a key. Raises KeyError if the key is missing.
+    def __delitem__(self, key):
+        self.tree.delete(key)
+
+    # Iterates over the keys in ascending order.
+    def __iter__(self):
+        return iter(self.tree)
+
+    # Iterates over the keys in descending order.
+    def __reversed__(self):
+        for key, _ in self.tree.range(reverse=True):
+            yield key
+
+    # Returns a readable string representation of the map.
+    def __str__(self):
+        return "SortedMap: {" + ", ".join(f"{key!r}: {value!r}" for key, value in self.items()) + "}"
+
+    def get(self, key, default=None):
+        return self.tree.get(key, default)
+
+    # Removes a key and returns its value, or default if given and the key is missing.
+    def pop(self, key, default=_MISSING):
+        try:
+            return self.tree.delete(key)
+        except KeyError:
+            if default is _MISSING:
+                raise
+            return default
+
+    def keys(self):
+        return iter(self.tree)
+
+    def values(self):
+        for _, value in self.tree.range():
+            yield value
+
+    def items(self):
+        return self.tree.range()
+
+    # Yields (key, value) for lo <= key < hi, ascending (descending if reverse).
+    # lo or hi may be None for no bound.
+    def range(self, lo=None, hi=None, reverse=False):
+        return self.tree.range(lo, hi, reverse)
+
+    # Largest key <= key, smallest key >= key, largest key < key, smallest key > key.
+    # Each returns None if there is no such key.
+    def floor(self, key):
+        return self.tree.floor(key)
+
+    def ceiling(self, key):
+        return self.tree.ceiling(key)
+
+    def predecessor(self, key):
+        return self.tree.predecessor(key)
+
+    def successor(self, key):
+        return self.tree.successor(key)
+
+    # Returns the number of keys < key.
+    def rank(self, key):
+        return self.tree.rank(key)
+
+    # Returns the k-th smallest key (negative k counts from the end).
+    def select(self, k):
+        return self.tree.select(k)
+
+    # Removes every entry.
+    def reset(self):
+        self.tree.reset()
+
+
+# Sorted set: a SortedMap whose values are unused.
+class SortedSet:
+    # Initializes the set, optionally from an iterable of keys (in any order).
+    def __init__(self, iterable=None, packed=False):
+        self.map = SortedMap(((key, None) for key in iterable) if iterable is not None else None, packed)
+
+    # Builds a set from keys already sorted in strictly increasing order, in O(n).
+    @classmethod
+    def from_sorted(cls, keys, packed=False):
+        sorted_set = cls(packed=packed)
+        sorted_set.map = SortedMap.from_sorted(((key, None) for key in keys), packed)
+        return sorted_set
+
+    def __len__(self):
+        return len(self.map)
+
+    def __contains__(self, key):
+        return key in self.map
+
+    def __iter__(self):
+        return iter(self.map)
+
+    def __reversed__(self):
+        return reversed(self.map)
+
+    # Returns a readable string representation of the set.
+    def __str__(self):
+        return "SortedSet: {" + ", ".join(repr(key) for key in self) + "}"
+
+    # Adds a key. Returns True if it was not already in the set.
+    def add(self, key):
+        return self.map.tree.insert(key)
+
+    # Removes a key. Raises KeyError if it is missing.
+    def remove(self, key):
+        del self.map[key]
+
+    # Removes a key if it is present.
+    def discard(self, key):
+        self.map.pop(key, None)
+
+    # Yields the keys with lo <= key < hi, ascending (descending if reverse).
+    def range(self, lo=None, hi=None, reverse=False):
+        for key, _ in self.map.range(lo, hi, reverse):
+            yield key
+
+    def floor(self, key):
+        return self.map.floor(key)
+
+    def ceiling(self, key):
+        return self.map.ceiling(key)
+
+    def predecessor(self, key):
+        return self.map.predecessor(key)
+
+    def successor(self, key):
+        return self.map.successor(key)
+
+    def rank(self, key):
+        return self.map.rank(key)
+
+    def select(self, k):
+        return self.map.select(k)
+
+    def reset(self):
+        self.map.reset()
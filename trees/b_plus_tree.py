@@ -0,0 +1,644 @@
+# B+ Tree
+# Ordered index with a high fanout: a node holds up to `order` keys in a sorted Python
+# list searched with bisect, so 100M keys are only 4-5 levels deep.
+# Every (key, value) pair lives in a leaf, and each leaf links to the next one, so a
+# range scan looks up its first key once and then walks the leaves in order.
+#   BPlusTree     > in memory; keys are any comparable objects, values any objects
+#   DiskBPlusTree > the same tree stored in fixed-size pages of a file, through mmap
+#
+# Page file layout (DiskBPlusTree): page 0 is the file header, every other page is a
+# leaf, an internal node or a free page. Keys and values have fixed-size struct formats
+# (e.g. "q" for int64, "16s" for 16-byte strings), so every page type has a fixed capacity:
+#   leaf     > page header, then capacity keys, then capacity values
+#   internal > page header, then capacity - 1 keys, then capacity child page numbers
+#   free     > page header whose link is the next free page
+# Pages are decoded into node objects on first use and kept in an LRU page cache.
+# Changes are made to the cached nodes and written back to the map when a dirty page
+# is evicted, on flush() and on close(). Deleted pages are reused by later splits.
+import array
+import bisect
+import itertools
+import mmap
+import os
+import struct
+import sys
+from collections import OrderedDict
+
+_MAGIC = b"BPTREE01"
+# magic, page size, key format, value format, root page, count, page count, first free page
+_HEADER = struct.Struct("<8sI16s16sQQQQ")
+# page type, count, link (next leaf, or next free page)
+_PAGE_HEADER = struct.Struct("<BxxxIQ")
+_CHILD = struct.Struct("<Q")
+_FREE, _LEAF, _INTERNAL = 0, 1, 2
+# Size of a newly created file, in pages (the file doubles when it is full)
+INITIAL_PAGES = 16
+# Marks a missing key (None is a valid value)
+_MISSING = object()
+
+
+# Leaf node: sorted keys, their values, and a reference to the next leaf (or None).
+class _Leaf:
+    __slots__ = ("keys", "values", "next", "page", "dirty")
+    is_leaf = True
+
+    def __init__(self, keys=None, values=None, next=None):
+        self.keys = keys if keys is not None else []
+        self.values = values if values is not None else []
+        self.next = next
+        self.page = 0
+        self.dirty = False
+
+
+# Internal node: children[i] holds the keys < keys[i], children[i + 1] the keys >= keys[i].
+class _Internal:
+    __slots__ = ("keys", "children", "page", "dirty")
+    is_leaf = False
+
+    def __init__(self, keys, children):
+        self.keys = keys
+        self.children = children
+        self.page = 0
+        self.dirty = False
+
+
+class BPlusTree:
+    # Initializes an empty tree whose nodes hold at most `order` keys (order >= 4).
+    def __init__(self, order=128):
+        if order < 4:
+            raise ValueError("Order must be at least 4.")
+        # Max keys per leaf, and max children per internal node
+        self.leaf_capacity = order
+        self.internal_capacity = order
+        self.count = 0
+        self.root = self._allocate(_Leaf())
+
+    # Builds a tree from (key, value) pairs sorted by strictly increasing key.
+    # Extra keyword arguments go to the constructor (e.g. order, or path for DiskBPlusTree).
+    @classmethod
+    def from_sorted(cls, items, fill=1.0, **kwargs):
+        tree = cls(**kwargs)
+        tree.bulk_load(items, fill)
+        return tree
+
+    # Storage hooks. In memory a node reference is the node itself; DiskBPlusTree
+    # overrides these to use page numbers and the page cache.
+    # _load: node for a reference; _allocate: stores a new node, returns its reference;
+    # _ref: reference of a stored node; _touch: marks a node as changed;
+    # _release: frees a node; _key: normalizes a key.
+    def _load(self, ref):
+        return ref
+
+    def _ref(self, node):
+        return node
+
+    def _allocate(self, node):
+        return node
+
+    def _touch(self, node):
+        pass
+
+    def _release(self, node):
+        pass
+
+    def _key(self, key):
+        return key
+
+    # Returns the number of keys.
+    def __len__(self):
+        return self.count
+
+    # Returns True if the key is in the tree.
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    # Returns the value for a key. Raises KeyError if the key is missing.
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    # Removes a key. Raises KeyError if the key is missing.
+    def __delitem__(self, key):
+        self.delete(key)
+
+    # Iterates over the keys in ascending order.
+    def __iter__(self):
+        for key, _ in self.range():
+            yield key
+
+    # Returns the number of levels (1 for a single leaf).
+    def height(self):
+        levels = 1
+        node = self._load(self.root)
+        while not node.is_leaf:
+            node = self._load(node.children[0])
+            levels += 1
+        return levels
+
+    # Returns the leaf that would hold a key. If path is given, every internal node on
+    # the way down is appended to it as (node, index of the child taken).
+    def _find_leaf(self, key, path=None):
+        node = self._load(self.root)
+        while not node.is_leaf:
+            i = bisect.bisect_right(node.keys, key)
+            if path is not None:
+                path.append((node, i))
+            node = self._load(node.children[i])
+        return node
+
+    # Returns the value stored for a key, or default if the key is missing.
+    def get(self, key, default=None):
+        key = self._key(key)
+        leaf = self._find_leaf(key)
+        keys = leaf.keys
+        i = bisect.bisect_left(keys, key)
+        if i < len(keys) and not key < keys[i]:
+            return leaf.values[i]
+        return default
+
+    # Adds a key with a value, or replaces the value of an existing key.
+    # Returns True if the key was new.
+    def insert(self, key, value=None):
+        key = self._key(key)
+        path = []
+        leaf = self._find_leaf(key, path)
+        i = bisect.bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and not key < leaf.keys[i]:
+            leaf.values[i] = value
+            self._touch(leaf)
+            return False
+        leaf.keys.insert(i, key)
+        leaf.values.insert(i, value)
+        self.count += 1
+        self._touch(leaf)
+        # Split full nodes from the leaf upwards
+        node = leaf
+        while self._overflows(node):
+            separator, right = self._split(node)
+            if not path:
+                self.root = self._allocate(_Internal([separator], [self._ref(node), right]))
+                break
+            node, i = path.pop()
+            node.keys.insert(i, separator)
+            node.children.insert(i + 1, right)
+            self._touch(node)
+        return True
+
+    def _overflows(self, node):
+        if node.is_leaf:
+            return len(node.keys) > self.leaf_capacity
+        return len(node.children) > self.internal_capacity
+
+    def _underflows(self, node):
+        if node.is_leaf:
+            return len(node.keys) < self.leaf_capacity // 2
+        return len(node.children) < self.internal_capacity // 2
+
+    # Moves the upper half of a full node into a new right sibling.
+    # Returns (separator key for the parent, reference of the new node).
+    def _split(self, node):
+        mid = len(node.keys) // 2
+        if node.is_leaf:
+            right = _Leaf(node.keys[mid:], node.values[mid:], node.next)
+            del node.keys[mid:], node.values[mid:]
+            separator = right.keys[0]
+            ref = self._allocate(right)
+            node.next = ref
+        else:
+            # The middle key moves up to the parent
+            separator = node.keys[mid]
+            right = _Internal(node.keys[mid + 1:], node.children[mid + 1:])
+            del node.keys[mid:], node.children[mid + 1:]
+            ref = self._allocate(right)
+        self._touch(node)
+        return separator, ref
+
+    # Removes a key and returns its value. Raises KeyError if the key is missing.
+    def delete(self, key):
+        key = self._key(key)
+        path = []
+        leaf = self._find_leaf(key, path)
+        i = bisect.bisect_left(leaf.keys, key)
+        if i == len(leaf.keys) or key < leaf.keys[i]:
+            raise KeyError(key)
+        del leaf.keys[i]
+        value = leaf.values.pop(i)
+        self.count -= 1
+        self._touch(leaf)
+        # Refill nodes that fell below half full, from the leaf upwards
+        node = leaf
+        while path and self._underflows(node):
+            parent, i = path.pop()
+            self._refill(parent, i, node)
+            node = parent
+        root = self._load(self.root)
+        if not root.is_leaf and len(root.children) == 1:
+            self.root = root.children[0]
+            self._release(root)
+        return value
+
+    # Fixes an underfull child (parent.children[i]) by merging it with a sibling,
+    # or, if both do not fit in one node, by sharing the sibling's entries evenly.
+    def _refill(self, parent, i, node):
+        if i > 0:
+            sep = i - 1
+            left, right = self._load(parent.children[sep]), node
+        else:
+            sep = 0
+            left, right = node, self._load(parent.children[1])
+        if node.is_leaf:
+            keys = [*left.keys, *right.keys]
+            values = [*left.values, *right.values]
+            merged = len(keys) <= self.leaf_capacity
+            if merged:
+                left.keys, left.values, left.next = keys, values, right.next
+            else:
+                half = len(keys) // 2
+                left.keys, right.keys = keys[:half], keys[half:]
+                left.values, right.values = values[:half], values[half:]
+                parent.keys[sep] = right.keys[0]
+        else:
+            # The separator moves down between the two halves
+            keys = [*left.keys, parent.keys[sep], *right.keys]
+            children = [*left.children, *right.children]
+            merged = len(children) <= self.internal_capacity
+            if merged:
+                left.keys, left.children = keys, children
+            else:
+                half = len(children) // 2
+                left.keys, left.children = keys[:half - 1], children[:half]
+                parent.keys[sep] = keys[half - 1]
+                right.keys, right.children = keys[half:], children[half:]
+        if merged:
+            del parent.keys[sep], parent.children[sep + 1]
+            self._release(right)
+        else:
+            self._touch(right)
+        self._touch(left)
+        self._touch(parent)
+
+    # Yields (key, value) for every key with lo <= key < hi, in ascending order.
+    # lo or hi may be None for no bound. The tree must not be modified during iteration.
+    def range(self, lo=None, hi=None):
+        if lo is None:
+            leaf = self._load(self.root)
+            while not leaf.is_leaf:
+                leaf = self._load(leaf.children[0])
+            i = 0
+        else:
+            lo = self._key(lo)
+            leaf = self._find_leaf(lo)
+            i = bisect.bisect_left(leaf.keys, lo)
+        if hi is not None:
+            hi = self._key(hi)
+        # Whole leaves are sliced at once, so the scan runs at list-slicing speed
+        while True:
+            keys = leaf.keys
+            if hi is not None and keys and not keys[-1] < hi:
+                j = bisect.bisect_left(keys, hi, i)
+                yield from zip(keys[i:j], leaf.values[i:j])
+                return
+            yield from zip(keys[i:], leaf.values[i:])
+            if leaf.next is None:
+                return
+            leaf = self._load(leaf.next)
+            i = 0
+
+    # Returns an iterator over all (key, value) pairs in key order.
+    def items(self):
+        return self.range()
+
+    # Fills an empty tree from (key, value) pairs sorted by strictly increasing key, in O(n).
+    # Leaves are filled to `fill` of their capacity (1.0 packs them full, best for
+    # read-mostly indexes; lower values leave room for inserts without splits).
+    # items may be any iterable, e.g. a generator over a file larger than memory.
+    # Raises ValueError if the tree is not empty or the keys are not strictly increasing.
+    def bulk_load(self, items, fill=1.0):
+        if self.count:
+            raise ValueError("Tree must be empty.")
+        if not 0 < fill <= 1:
+            raise ValueError("Fill must be between 0 and 1.")
+        leaf_size = max(self.leaf_capacity // 2, int(self.leaf_capacity * fill))
+        items = iter(items)
+        # (first key, reference) of every node on the level being built
+        level = []
+        previous = before = None
+        # The empty root leaf becomes the first leaf
+        leaf = self._load(self.root)
+        while True:
+            chunk = list(itertools.islice(items, leaf_size))
+            if not chunk:
+                break
+            keys = [self._key(key) for key, _ in chunk]
+            if not all(map(_less, keys, itertools.islice(keys, 1, None))) or (
+                    previous is not None and not previous.keys[-1] < keys[0]):
+                raise ValueError("Keys must be sorted and unique.")
+            if previous is not None:
+                leaf = _Leaf()
+                previous.next = self._allocate(leaf)
+                self._touch(previous)
+            leaf.keys = keys
+            leaf.values = [value for _, value in chunk]
+            self._touch(leaf)
+            level.append((keys[0], self._ref(leaf)))
+            self.count += len(keys)
+            previous, before = leaf, previous
+        # The last leaf may be underfull: merge it into the one before, or share evenly
+        if previous is not None and before is not None and self._underflows(previous):
+            keys = [*before.keys, *previous.keys]
+            values = [*before.values, *previous.values]
+            if len(keys) <= self.leaf_capacity:
+                before.keys, before.values, before.next = keys, values, None
+                level.pop()
+                self._release(previous)
+            else:
+                half = len(keys) // 2
+                before.keys, previous.keys = keys[:half], keys[half:]
+                before.values, previous.values = values[:half], values[half:]
+                level[-1] = (previous.keys[0], level[-1][1])
+                self._touch(previous)
+            self._touch(before)
+        # Build the internal levels bottom-up
+        group = max(self.internal_capacity // 2, int(self.internal_capacity * fill))
+        while len(level) > 1:
+            sizes = [group] * (len(level) // group)
+            if len(level) % group:
+                sizes.append(len(level) % group)
+            if len(sizes) > 1 and sizes[-1] < self.internal_capacity // 2:
+                total = sizes[-2] + sizes[-1]
+                sizes[-2:] = [total] if total <= self.internal_capacity else [total // 2, total - total // 2]
+            upper = []
+            start = 0
+            for size in sizes:
+                children = level[start:start + size]
+                node = _Internal([key for key, _ in children[1:]], [ref for _, ref in children])
+                upper.append((children[0][0], self._allocate(node)))
+                start += size
+            level = upper
+        if level:
+            self.root = level[0][1]
+
+
+def _less(a, b):
+    return a < b
+
+
+# Packs and unpacks runs of one fixed-size struct format.
+# Single numeric codes use array.array: a page is converted in one C call, and the
+# cached node keeps the array, so no Python objects are created for entries never read.
+class _Codec:
+    __slots__ = ("format", "size", "struct", "typecode")
+
+    def __init__(self, fmt):
+        try:
+            self.struct = struct.Struct("<" + fmt)
+        except struct.error:
+            raise ValueError(f"Invalid struct format: {fmt!r}.")
+        if len(self.struct.unpack(bytes(self.struct.size))) != 1:
+            raise ValueError("Formats must describe a single field.")
+        self.format = fmt
+        self.size = self.struct.size
+        self.typecode = None
+        if len(fmt) == 1 and fmt in "bBhHiIlLqQfd" and sys.byteorder == "little" and array.array(fmt).itemsize == self.size:
+            self.typecode = fmt
+
+    def pack(self, items):
+        if self.typecode is not None:
+            return array.array(self.typecode, items).tobytes()
+        return b"".join(map(self.struct.pack, items))
+
+    def unpack(self, data):
+        if self.typecode is not None:
+            return array.array(self.typecode, data)
+        return [item for (item,) in self.struct.iter_unpack(data)]
+
+    # Returns an item as it will be read back (e.g. bytes padded to their width).
+    # Raises ValueError if it does not fit the format.
+    def normalize(self, item):
+        try:
+            return self.struct.unpack(self.struct.pack(item))[0]
+        except struct.error:
+            raise ValueError(f"{item!r} does not fit format {self.format!r}.")
+
+
+# B+ tree stored in a page file (see the layout at the top of the file).
+# Same methods as BPlusTree, plus flush, close, stats and context manager support.
+class DiskBPlusTree(BPlusTree):
+    # Open or create a tree.
+    # mode: "r" read-only (file must exist), "w" read-write (created if missing),
+    #       "n" read-write, always starting from an empty tree.
+    # page_size, key_format and value_format are only used when a file is created;
+    # an existing file keeps its own. cache_pages bounds the page cache (at least 8).
+    def __init__(self, path, mode="r", page_size=4096, key_format="q", value_format="q", cache_pages=4096):
+        if mode not in ("r", "w", "n"):
+            raise ValueError("Mode must be 'r', 'w' or 'n'.")
+        if cache_pages < 8:
+            raise ValueError("cache_pages must be at least 8.")
+        self.path = path
+        self.mode = mode
+        self.cache_pages = cache_pages
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if mode == "n" or (mode == "w" and not os.path.exists(path)):
+            self._create_file(page_size, key_format, value_format)
+        self._file = open(path, "rb" if mode == "r" else "r+b")
+        self.map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ if mode == "r" else mmap.ACCESS_WRITE)
+        magic, self.page_size, key_format, value_format, self.root, self.count, self.page_count, self.free_page = (
+            _HEADER.unpack_from(self.map, 0))
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a DiskBPlusTree file.")
+        self.keys_codec = _Codec(key_format.rstrip(b"\0").decode("ascii"))
+        self.values_codec = _Codec(value_format.rstrip(b"\0").decode("ascii"))
+        self._set_capacities()
+
+    # Write the header and an empty root leaf (page 1) to a new file.
+    def _create_file(self, page_size, key_format, value_format):
+        keys_codec, values_codec = _Codec(key_format), _Codec(value_format)
+        entry = keys_codec.size + values_codec.size
+        if (page_size - _PAGE_HEADER.size) // entry < 4 or (page_size - _PAGE_HEADER.size) // (entry + 8) < 4:
+            raise ValueError("Page size is too small for the key and value formats.")
+        with open(self.path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, page_size, key_format.encode("ascii"), value_format.encode("ascii"),
+                                 1, 0, 2, 0))
+            f.seek(page_size)
+            f.write(_PAGE_HEADER.pack(_LEAF, 0, 0))
+            f.truncate(INITIAL_PAGES * page_size)
+
+    # Page capacities follow from the page size and the key and value sizes.
+    def _set_capacities(self):
+        space = self.page_size - _PAGE_HEADER.size
+        self.leaf_capacity = space // (self.keys_codec.size + self.values_codec.size)
+        # children * 8 + (children - 1) * key size must fit
+        self.internal_capacity = (space + self.keys_codec.size) // (self.keys_codec.size + _CHILD.size)
+        self.values_offset = _PAGE_HEADER.size + self.leaf_capacity * self.keys_codec.size
+        self.children_offset = _PAGE_HEADER.size + (self.internal_capacity - 1) * self.keys_codec.size
+
+    # Write dirty pages and the header, then flush the map to disk.
+    def flush(self):
+        if self.mode == "r":
+            return
+        for node in self.cache.values():
+            if node.dirty:
+                self._write_page(node)
+        self._write_header()
+        self.map.flush()
+
+    # Flush (if writable), unmap and close the file.
+    def close(self):
+        if self.map is None:
+            return
+        self.flush()
+        self.cache.clear()
+        self.map.close()
+        self._file.close()
+        self.map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Return an unambiguous string representation of the DiskBPlusTree object.
+    def __repr__(self):
+        return f"DiskBPlusTree({self.path!r}, mode={self.mode!r}, {self.count} entries)"
+
+    def insert(self, key, value=None):
+        self._check_writable()
+        return super().insert(key, self.values_codec.normalize(value))
+
+    def delete(self, key):
+        self._check_writable()
+        return super().delete(key)
+
+    def bulk_load(self, items, fill=1.0):
+        self._check_writable()
+        normalize = self.values_codec.normalize
+        super().bulk_load(((key, normalize(value)) for key, value in items), fill)
+
+    # Return diagnostics: size, height, pages, file_bytes, leaf/internal capacity and
+    # page cache counters. A low cache hit rate means cache_pages is too small for the workload.
+    def stats(self):
+        return {
+            "size": self.count,
+            "height": self.height(),
+            "pages": self.page_count,
+            "page_size": self.page_size,
+            "file_bytes": len(self.map),
+            "leaf_capacity": self.leaf_capacity,
+            "internal_capacity": self.internal_capacity,
+            "cached_pages": len(self.cache),
+            "dirty_pages": sum(node.dirty for node in self.cache.values()),
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+        }
+
+    # Raise an error if the tree was opened read-only.
+    def _check_writable(self):
+        if self.mode == "r":
+            raise PermissionError("DiskBPlusTree was opened read-only.")
+
+    def _write_header(self):
+        _HEADER.pack_into(self.map, 0, _MAGIC, self.page_size, self.keys_codec.format.encode("ascii"),
+                          self.values_codec.format.encode("ascii"), self.root, self.count, self.page_count,
+                          self.free_page)
+
+    def _key(self, key):
+        return self.keys_codec.normalize(key)
+
+    def _ref(self, node):
+        return node.page
+
+    # Return the node stored in a page, from the cache or decoded from the map.
+    def _load(self, page):
+        node = self.cache.get(page)
+        if node is not None:
+            self.cache.move_to_end(page)
+            self.hits += 1
+            return node
+        self.misses += 1
+        node = self._read_page(page)
+        self._cache_node(node)
+        return node
+
+    # Put a node in the cache as the most recently used, evicting (and writing back
+    # if dirty) the least recently used pages while the cache is over its limit.
+    def _cache_node(self, node):
+        self.cache[node.page] = node
+        self.cache.move_to_end(node.page)
+        while len(self.cache) > self.cache_pages:
+            _, evicted = self.cache.popitem(last=False)
+            if evicted.dirty:
+                self._write_page(evicted)
+
+    # Mark a node as changed. It is put back in the cache if it was evicted meanwhile.
+    def _touch(self, node):
+        node.dirty = True
+        if node.page not in self.cache:
+            self._cache_node(node)
+
+    # Give a new node a page (a free one if there is any) and cache it as dirty.
+    def _allocate(self, node):
+        if self.free_page:
+            node.page = self.free_page
+            self.free_page = _PAGE_HEADER.unpack_from(self.map, self.free_page * self.page_size)[2]
+        else:
+            node.page = self.page_count
+            self.page_count += 1
+            if self.page_count * self.page_size > len(self.map):
+                self._grow()
+        self._touch(node)
+        return node.page
+
+    # Drop a node from the cache and put its page on the free list.
+    def _release(self, node):
+        self.cache.pop(node.page, None)
+        _PAGE_HEADER.pack_into(self.map, node.page * self.page_size, _FREE, 0, self.free_page)
+        self.free_page = node.page
+
+    # Double the file and map it again. Cached nodes are decoded copies, so they stay valid.
+    def _grow(self):
+        size = max(2 * len(self.map), self.page_count * self.page_size)
+        self.map.close()
+        self._file.truncate(size)
+        self.map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE)
+
+    # Decode a page into a node.
+    def _read_page(self, page):
+        start = page * self.page_size
+        page_type, count, link = _PAGE_HEADER.unpack_from(self.map, start)
+        keys_start = start + _PAGE_HEADER.size
+        keys = self.keys_codec.unpack(self.map[keys_start:keys_start + count * self.keys_codec.size])
+        if page_type == _LEAF:
+            values_start = start + self.values_offset
+            values = self.values_codec.unpack(self.map[values_start:values_start + count * self.values_codec.size])
+            node = _Leaf(keys, values, link or None)
+        elif page_type == _INTERNAL:
+            children_start = start + self.children_offset
+            node = _Internal(keys, array.array("Q", self.map[children_start:children_start + (count + 1) * 8]))
+        else:
+            raise ValueError(f"Page {page} of {self.path} is not a tree node.")
+        node.page = page
+        return node
+
+    # Encode a node into its page.
+    def _write_page(self, node):
+        start = node.page * self.page_size
+        count = len(node.keys)
+        keys_start = start + _PAGE_HEADER.size
+        self.map[keys_start:keys_start + count * self.keys_codec.size] = self.keys_codec.pack(node.keys)
+        if node.is_leaf:
+            _PAGE_HEADER.pack_into(self.map, start, _LEAF, count, node.next or 0)
+            values_start = start + self.values_offset
+            self.map[values_start:values_start + count * self.values_codec.size] = self.values_codec.pack(node.values)
+        else:
+            _PAGE_HEADER.pack_into(self.map, start, _INTERNAL, count, 0)
+            children_start = start + self.children_offset
+            self.map[children_start:children_start + (count + 1) * 8] = array.array("Q", node.children).tobytes()
+        node.dirty = False
@@ -0,0 +1,232 @@
+# Trees Benchmark
+# Run from the repository root: python -m trees.benchmark
+import bisect
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy
+
+from trees.avl_tree import AVLTree, SortedMap
+from trees.b_plus_tree import BPlusTree, DiskBPlusTree
+from trees.binary_tree import FenwickTree, LazySegmentTree, SegmentTree
+from trees.radix_tree import RadixTree
+
+N = 200_000
+# Re-sorting on every insert is quadratic, so it runs on fewer inserts and is scaled up
+RESORT_N = 5_000
+MEMORY_N = 200_000
+INDEX_N = 10_000_000
+DISK_N = 100_000_000
+LOOKUPS = 200_000
+SCANS = 1_000
+SCAN_LENGTH = 10_000
+SERIES_N = 10_000_000
+SERIES_OPS = 100_000
+# Rescanning slices is slow, so it runs on fewer operations and is scaled up
+RESCAN_OPS = 200
+TRIE_N = 10_000_000
+PREFIX_QUERIES = 1_000
+# A full scan of TRIE_N keys takes seconds, so it runs on fewer prefixes and is scaled up
+SCAN_PREFIXES = 3
+LONGEST_QUERIES = 100_000
+
+random.seed(0)
+scores = [(random.random(), i) for i in range(N)]
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+# Leaderboard: insert a score, then ask for its rank and the current top 10
+def resort_leaderboard(count):
+    board = []
+    for score in scores[:count]:
+        board.append(score)
+        board.sort()
+        board.index(score)
+        board[-10:]
+
+
+def insort_leaderboard():
+    board = []
+    for score in scores:
+        bisect.insort(board, score)
+        bisect.bisect_left(board, score)
+        board[-10:]
+
+
+def sorted_map_leaderboard(packed):
+    board = SortedMap(packed=packed)
+    for score in scores:
+        board[score] = None
+        board.rank(score)
+        list(board.range(board.select(-min(10, len(board))), None))
+
+
+print(f"# Leaderboard: {N:,} inserts, each followed by a rank and a top-10 query")
+resort_time = timed(lambda: resort_leaderboard(RESORT_N)) * (N / RESORT_N) ** 2
+print(f"append + sort:               {resort_time:8.3f}s  (estimated from {RESORT_N:,} inserts)")
+print(f"bisect.insort:               {timed(insort_leaderboard):8.3f}s")
+print(f"SortedMap:                   {timed(lambda: sorted_map_leaderboard(False)):8.3f}s")
+print(f"SortedMap(packed=True):      {timed(lambda: sorted_map_leaderboard(True)):8.3f}s")
+
+print()
+print(f"# Memory for {MEMORY_N:,} int keys (keys and values themselves excluded)")
+keys = list(range(MEMORY_N))
+for packed in (False, True):
+    tracemalloc.start()
+    sorted_map = SortedMap(packed=packed)
+    for key in keys:
+        sorted_map[key] = None
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    label = "SortedMap(packed=True):" if packed else "SortedMap:"
+    print(f"{label:<29}{used / MEMORY_N:8.1f} bytes per key")
+    del sorted_map
+
+print()
+print(f"# Ordered index: {LOOKUPS:,} random lookups, then {SCANS:,} range scans of {SCAN_LENGTH:,} keys")
+temp_dir = tempfile.mkdtemp()
+path = os.path.join(temp_dir, "index.bpt")
+
+
+# Keys are the even numbers below 2n, so half of the lookups miss
+def index_benchmark(label, n, build):
+    lookups = [random.randrange(2 * n) for _ in range(LOOKUPS)]
+    scan_starts = [random.randrange(2 * n) for _ in range(SCANS)]
+    start = time.perf_counter()
+    tree = build()
+    build_time = time.perf_counter() - start
+
+    def lookup_all():
+        for key in lookups:
+            tree.get(key)
+
+    def scan_all():
+        for lo in scan_starts:
+            for _ in tree.range(lo, lo + 2 * SCAN_LENGTH):
+                pass
+
+    print(f"{label:<29}build {build_time:7.2f}s   lookups {timed(lookup_all):6.2f}s   scans {timed(scan_all):6.2f}s")
+    return tree
+
+
+def open_read_only():
+    DiskBPlusTree.from_sorted(zip(range(0, 2 * DISK_N, 2), range(DISK_N)), path=path, mode="n").close()
+    return DiskBPlusTree(path, "r")
+
+
+items = list(zip(range(0, 2 * INDEX_N, 2), range(INDEX_N)))
+print(f"{INDEX_N:,} keys:")
+index_benchmark("AVLTree:", INDEX_N, lambda: AVLTree.from_sorted(items))
+index_benchmark("BPlusTree:", INDEX_N, lambda: BPlusTree.from_sorted(items))
+index_benchmark("DiskBPlusTree:", INDEX_N, lambda: DiskBPlusTree.from_sorted(items, path=path, mode="n")).close()
+del items
+print(f"{DISK_N:,} keys (page file only):")
+index = index_benchmark("DiskBPlusTree:", DISK_N, open_read_only)
+print(f"{'':<29}{index.stats()['file_bytes'] / 1e9:.1f} GB file, height {index.height()}")
+index.close()
+shutil.rmtree(temp_dir)
+
+print()
+print(f"# Range aggregates over {SERIES_N:,} float64 values: {SERIES_OPS:,} x (point update + range query)")
+series = numpy.random.default_rng(0).random(SERIES_N)
+series_list = series.tolist()
+updates = [(random.randrange(SERIES_N), random.random()) for _ in range(SERIES_OPS)]
+ranges = [sorted((random.randrange(SERIES_N + 1), random.randrange(SERIES_N + 1))) for _ in range(SERIES_OPS)]
+
+
+def rescan_list():
+    for (i, value), (lo, hi) in zip(updates[:RESCAN_OPS], ranges):
+        series_list[i] = value
+        sum(series_list[lo:hi])
+
+
+def rescan_numpy():
+    for (i, value), (lo, hi) in zip(updates[:RESCAN_OPS], ranges):
+        series[i] = value
+        series[lo:hi].sum()
+
+
+def aggregate(tree, query):
+    for (i, value), (lo, hi) in zip(updates, ranges):
+        tree[i] = value
+        query(lo, hi)
+
+
+def range_add(tree):
+    for (i, value), (lo, hi) in zip(updates, ranges):
+        tree.apply(lo, hi, value)
+        tree.query(lo, hi)
+
+
+def build(label, make):
+    start = time.perf_counter()
+    tree = make()
+    print(f"{label:<29}built in {time.perf_counter() - start:6.2f}s")
+    return tree
+
+
+scale = SERIES_OPS / RESCAN_OPS
+print(f"list slice + sum:            {timed(rescan_list) * scale:8.3f}s  (estimated from {RESCAN_OPS:,} operations)")
+print(f"NumPy slice + sum:           {timed(rescan_numpy) * scale:8.3f}s  (estimated from {RESCAN_OPS:,} operations)")
+fenwick = build("FenwickTree:", lambda: FenwickTree(series))
+print(f"FenwickTree:                 {timed(lambda: aggregate(fenwick, fenwick.range_sum)):8.3f}s")
+del fenwick
+segment = build("SegmentTree(min):", lambda: SegmentTree(series, min, float("inf")))
+print(f"SegmentTree(min):            {timed(lambda: aggregate(segment, segment.query)):8.3f}s")
+del segment
+lazy = build("LazySegmentTree:", lambda: LazySegmentTree(series))
+print(f"LazySegmentTree (range add): {timed(lambda: range_add(lazy)):8.3f}s")
+del lazy, series, series_list
+
+print()
+print(f"# Prefix lookups over {TRIE_N:,} string keys")
+words = [f"user:{random.getrandbits(40):010x}" for _ in range(TRIE_N)]
+table = dict.fromkeys(words)
+start = time.perf_counter()
+trie = RadixTree(words)
+print(f"RadixTree:                   built in {time.perf_counter() - start:6.2f}s, "
+      f"{trie.stats()['bytes_per_key']:.0f} bytes per key")
+# About 150 keys share each 4-digit prefix
+prefixes = [f"user:{random.getrandbits(16):04x}" for _ in range(PREFIX_QUERIES)]
+queries = [f"{word}:{random.getrandbits(16)}" for word in random.sample(words, LONGEST_QUERIES)]
+
+
+def scan_prefixes():
+    for prefix in prefixes[:SCAN_PREFIXES]:
+        [key for key in table if key.startswith(prefix)]
+
+
+def trie_prefixes():
+    for prefix in prefixes:
+        list(trie.keys_with_prefix(prefix))
+
+
+# Longest stored key that is a prefix of the query: a dict has to try every length
+def probe_longest():
+    for query in queries:
+        for end in range(len(query), -1, -1):
+            if query[:end] in table:
+                break
+
+
+def trie_longest():
+    for query in queries:
+        trie.longest_prefix(query)
+
+
+print(f"{PREFIX_QUERIES:,} keys_with_prefix queries:")
+print(f"dict + full scan:            {timed(scan_prefixes) * PREFIX_QUERIES / SCAN_PREFIXES:8.3f}s  "
+      f"(estimated from {SCAN_PREFIXES} prefixes)")
+print(f"RadixTree.keys_with_prefix:  {timed(trie_prefixes):8.3f}s")
+print(f"{LONGEST_QUERIES:,} longest-prefix matches:")
+print(f"dict, every prefix length:   {timed(probe_longest):8.3f}s")
+print(f"RadixTree.longest_prefix:    {timed(trie_longest):8.3f}s")
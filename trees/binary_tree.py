@@ -0,0 +1,389 @@
+# Binary Tree
+# Linked binary tree node. The generators in trees/traversals.py walk these nodes,
+# and any other node with left and right attributes (e.g. the nodes of trees/bst.py).
+# Also array-backed binary trees for range aggregates (Fenwick and segment trees, below).
+import operator
+
+from arrays_lists.dynamic_arrays import DynamicArrays
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Operators the vectorized segment tree build can run as NumPy ufuncs
+_UFUNCS = {operator.add: numpy.add, min: numpy.minimum, max: numpy.maximum} if numpy is not None else {}
+
+
+# One tree node: a key, an optional value, and up to two children.
+class Node:
+    __slots__ = ("key", "value", "left", "right")
+
+    def __init__(self, key, value=None, left=None, right=None):
+        self.key = key
+        self.value = value
+        self.left = left
+        self.right = right
+
+    # Return an unambiguous string representation of the node (children are not expanded).
+    def __repr__(self):
+        return f"Node({self.key!r})"
+
+
+# Range aggregates over an indexed series (0-based, half-open ranges [lo, hi)).
+#   FenwickTree      > point add, prefix and range sums
+#   RangeFenwickTree > add to a whole range, prefix and range sums
+#   SegmentTree      > point set, range fold with any associative operator (sum, min, max, gcd, ...)
+#   LazySegmentTree  > SegmentTree that can also update a whole range at once
+# All of them are O(log n) per update or query and are built in O(n) from a list,
+# a DynamicArrays or a NumPy buffer. With NumPy installed, numeric input is built one
+# tree level at a time with vectorized operations. Nodes are kept in Python lists,
+# which are the fastest to index one item at a time.
+
+
+# Fenwick tree (binary indexed tree): tree[i] (1-based) holds the sum of the
+# lowbit(i) = i & -i values that end at i, so a prefix sum adds up at most log2(n)
+# entries, and a point update touches at most log2(n) entries.
+class FenwickTree:
+    # Builds the tree from the initial values.
+    def __init__(self, data=()):
+        values = _prepare(data)
+        self.n = len(values)
+        self.tree = _fenwick_build(values)
+
+    # Returns the number of values.
+    def __len__(self):
+        return self.n
+
+    # Returns the value at index i. O(log n)
+    def __getitem__(self, i):
+        i = _index(i, self.n)
+        return self.range_sum(i, i + 1)
+
+    # Replaces the value at index i. O(log n)
+    def __setitem__(self, i, value):
+        i = _index(i, self.n)
+        self.add(i, value - self.range_sum(i, i + 1))
+
+    # Adds delta to the value at index i.
+    def add(self, i, delta):
+        i = _index(i, self.n) + 1
+        tree, n = self.tree, self.n
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    # Returns the sum of the first i values (values[0:i]).
+    def prefix_sum(self, i):
+        if not 0 <= i <= self.n:
+            raise IndexError("Index entered is out of bounds.")
+        tree = self.tree
+        total = 0
+        while i:
+            total += tree[i]
+            # Drop the lowest set bit
+            i &= i - 1
+        return total
+
+    # Returns the sum of values[lo:hi].
+    def range_sum(self, lo, hi):
+        _check_range(lo, hi, self.n)
+        return self.prefix_sum(hi) - self.prefix_sum(lo)
+
+
+# Fenwick tree with range updates: add(lo, hi, delta) adds delta to every value in [lo, hi).
+# Two Fenwick trees over the differences d[i] = values[i] - values[i - 1] give
+# sum(values[0:p]) = p * sum(d[0:p]) - sum(i * d[i] for i < p).
+# Exact for ints; with floats the subtraction can lose some precision on long ranges.
+class RangeFenwickTree:
+    # Builds the tree from the initial values.
+    def __init__(self, data=()):
+        values = _prepare(data)
+        self.n = len(values)
+        if not isinstance(values, list) and values.dtype.kind != "f" and len(values) and (
+                numpy.abs(values.astype(numpy.float64)).sum() * 2 * self.n >= 2.0 ** 62):
+            # i * d[i] could overflow int64
+            values = values.tolist()
+        if not isinstance(values, list):
+            differences = numpy.diff(values, prepend=values.dtype.type(0))
+            weighted = differences * numpy.arange(self.n, dtype=differences.dtype)
+        else:
+            differences = [values[i] - values[i - 1] if i else values[0] for i in range(self.n)]
+            weighted = [i * d for i, d in enumerate(differences)]
+        self.differences = FenwickTree(differences)
+        self.weighted = FenwickTree(weighted)
+
+    def __len__(self):
+        return self.n
+
+    # Returns the value at index i. O(log n)
+    def __getitem__(self, i):
+        i = _index(i, self.n)
+        return self.differences.prefix_sum(i + 1)
+
+    # Replaces the value at index i. O(log n)
+    def __setitem__(self, i, value):
+        i = _index(i, self.n)
+        self.add(i, i + 1, value - self[i])
+
+    # Adds delta to every value in values[lo:hi].
+    def add(self, lo, hi, delta):
+        _check_range(lo, hi, self.n)
+        if lo == hi:
+            return
+        self.differences.add(lo, delta)
+        self.weighted.add(lo, lo * delta)
+        if hi < self.n:
+            self.differences.add(hi, -delta)
+            self.weighted.add(hi, -hi * delta)
+
+    # Returns the sum of the first i values.
+    def prefix_sum(self, i):
+        return i * self.differences.prefix_sum(i) - self.weighted.prefix_sum(i)
+
+    # Returns the sum of values[lo:hi].
+    def range_sum(self, lo, hi):
+        _check_range(lo, hi, self.n)
+        return self.prefix_sum(hi) - self.prefix_sum(lo)
+
+
+# Iterative (bottom-up) segment tree over a power-of-two number of leaves:
+# tree[size + i] holds values[i], tree[k] = op(tree[2k], tree[2k + 1]), and tree[1]
+# holds the fold of everything. Leaves past the end hold identity.
+# op must be associative (it does not need to be commutative: queries keep the order),
+# and op(identity, x) == op(x, identity) == x. For example:
+#   sum > op=operator.add, identity=0
+#   min > op=min, identity=float("inf")
+#   max > op=max, identity=float("-inf")
+class SegmentTree:
+    # Builds the tree from the initial values.
+    def __init__(self, data=(), op=operator.add, identity=0):
+        values = _prepare(data)
+        self.n = len(values)
+        self.op = op
+        self.identity = identity
+        self.size = 1 << max(0, (self.n - 1).bit_length())
+        self.log = self.size.bit_length() - 1
+        self.tree = _segment_build(values, self.size, op, identity)
+
+    def __len__(self):
+        return self.n
+
+    # Returns the value at index i.
+    def __getitem__(self, i):
+        return self.tree[self.size + _index(i, self.n)]
+
+    # Replaces the value at index i and refolds its ancestors.
+    def __setitem__(self, i, value):
+        k = self.size + _index(i, self.n)
+        tree, op = self.tree, self.op
+        tree[k] = value
+        k >>= 1
+        while k:
+            tree[k] = op(tree[2 * k], tree[2 * k + 1])
+            k >>= 1
+
+    # Returns op folded over values[lo:hi] (identity for an empty range).
+    def query(self, lo=0, hi=None):
+        if hi is None:
+            hi = self.n
+        _check_range(lo, hi, self.n)
+        return self._fold(lo + self.size, hi + self.size)
+
+    # Folds the nodes that exactly cover leaves [lo, hi), from the bottom up.
+    # Left and right parts are kept apart so the order of op is preserved.
+    def _fold(self, lo, hi):
+        tree, op = self.tree, self.op
+        left = right = self.identity
+        while lo < hi:
+            if lo & 1:
+                left = op(left, tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right = op(tree[hi], right)
+            lo >>= 1
+            hi >>= 1
+        return op(left, right)
+
+
+# Segment tree with range updates: apply(lo, hi, f) updates every value in [lo, hi).
+# An update is stored on the O(log n) nodes that cover the range (lazy[k]) and pushed
+# down to the children only when a later operation needs to go below that node.
+#   mapping(f, x, length) > new fold of a node after applying f to its `length` values
+#   composition(f, g)     > one update equal to applying g, then f
+# The defaults are range add with range sum. Other common choices:
+#   add to min/max   > op=min (or max), identity=inf (or -inf), mapping=lambda f, x, length: x + f,
+#                      composition=operator.add
+#   assign with sum  > mapping=lambda f, x, length: f * length, composition=lambda f, g: f
+#   assign with min  > op=min, identity=inf, mapping=lambda f, x, length: f, composition=lambda f, g: f
+class LazySegmentTree(SegmentTree):
+    def __init__(self, data=(), op=operator.add, identity=0, mapping=None, composition=operator.add):
+        super().__init__(data, op, identity)
+        self.mapping = mapping if mapping is not None else _add_to_sum
+        self.composition = composition
+        # Pending update of each internal node, or None
+        self.lazy = [None] * self.size
+
+    # Returns the value at index i.
+    def __getitem__(self, i):
+        k = self.size + _index(i, self.n)
+        for shift in range(self.log, 0, -1):
+            self._push(k >> shift)
+        return self.tree[k]
+
+    # Replaces the value at index i.
+    def __setitem__(self, i, value):
+        k = self.size + _index(i, self.n)
+        for shift in range(self.log, 0, -1):
+            self._push(k >> shift)
+        self.tree[k] = value
+        for shift in range(1, self.log + 1):
+            self._pull(k >> shift)
+
+    # Returns op folded over values[lo:hi] (identity for an empty range).
+    def query(self, lo=0, hi=None):
+        if hi is None:
+            hi = self.n
+        _check_range(lo, hi, self.n)
+        if lo == hi:
+            return self.identity
+        lo += self.size
+        hi += self.size
+        self._push_bounds(lo, hi)
+        return self._fold(lo, hi)
+
+    # Applies the update f to every value in values[lo:hi].
+    def apply(self, lo, hi, f):
+        _check_range(lo, hi, self.n)
+        if lo == hi:
+            return
+        lo += self.size
+        hi += self.size
+        self._push_bounds(lo, hi)
+        left, right = lo, hi
+        while left < right:
+            if left & 1:
+                self._apply_node(left, f)
+                left += 1
+            if right & 1:
+                right -= 1
+                self._apply_node(right, f)
+            left >>= 1
+            right >>= 1
+        # Refold the ancestors of the two boundary leaves
+        tree, op = self.tree, self.op
+        for shift in range(1, self.log + 1):
+            if (lo >> shift) << shift != lo:
+                k = lo >> shift
+                tree[k] = op(tree[2 * k], tree[2 * k + 1])
+            if (hi >> shift) << shift != hi:
+                k = (hi - 1) >> shift
+                tree[k] = op(tree[2 * k], tree[2 * k + 1])
+
+    # Pushes pending updates down the paths to the two ends of [lo, hi), top-down,
+    # so every node the fold or the update reads is up to date.
+    def _push_bounds(self, lo, hi):
+        lazy = self.lazy
+        for shift in range(self.log, 0, -1):
+            if (lo >> shift) << shift != lo and lazy[lo >> shift] is not None:
+                self._push(lo >> shift)
+            if (hi >> shift) << shift != hi and lazy[(hi - 1) >> shift] is not None:
+                self._push((hi - 1) >> shift)
+
+    # Applies f to node k and, for an internal node, records it as pending.
+    def _apply_node(self, k, f):
+        # A node at depth d covers size >> d leaves
+        self.tree[k] = self.mapping(f, self.tree[k], self.size >> (k.bit_length() - 1))
+        if k < self.size:
+            pending = self.lazy[k]
+            self.lazy[k] = f if pending is None else self.composition(f, pending)
+
+    # Moves the pending update of node k to its two children.
+    def _push(self, k):
+        f = self.lazy[k]
+        if f is not None:
+            self._apply_node(2 * k, f)
+            self._apply_node(2 * k + 1, f)
+            self.lazy[k] = None
+
+    # Recomputes node k from its children.
+    def _pull(self, k):
+        self.tree[k] = self.op(self.tree[2 * k], self.tree[2 * k + 1])
+
+
+def _add_to_sum(f, x, length):
+    return x + f * length
+
+
+def _index(i, n):
+    if i < 0:
+        i += n
+    if not 0 <= i < n:
+        raise IndexError("Index entered is out of bounds.")
+    return i
+
+
+def _check_range(lo, hi, n):
+    if not 0 <= lo <= hi <= n:
+        raise IndexError("Range entered is out of bounds.")
+
+
+# Returns the input values as a 1-D numeric NumPy array when the vectorized builds
+# can use it, or as a list otherwise.
+def _prepare(data):
+    if isinstance(data, DynamicArrays):
+        data = data.view() if data.typecode is not None else data.arr[:data.length]
+    if numpy is not None:
+        try:
+            values = numpy.asarray(data)
+        except (TypeError, ValueError):
+            values = None
+        if values is not None and values.ndim == 1 and values.dtype.kind in "biuf":
+            if values.dtype.kind != "f":
+                # Sums must not overflow int64 while the tree is built
+                if len(values) and numpy.abs(values.astype(numpy.float64)).sum() >= 2.0 ** 62:
+                    return values.tolist()
+                values = values.astype(numpy.int64)
+            return values
+    return list(data)
+
+
+def _fenwick_build(values):
+    n = len(values)
+    if not isinstance(values, list):
+        tree = numpy.zeros(n + 1, dtype=values.dtype)
+        tree[1:] = values
+        # Each entry i is added into i + lowbit(i), once it is complete itself:
+        # first every i with lowbit 1, then 2, then 4, ...
+        step = 1
+        while 2 * step <= n:
+            sources = tree[step:n + 1 - step:2 * step]
+            tree[2 * step::2 * step][:len(sources)] += sources
+            step *= 2
+        return tree.tolist()
+    tree = [0] + values
+    for i in range(1, n + 1):
+        j = i + (i & -i)
+        if j <= n:
+            tree[j] += tree[i]
+    return tree
+
+
+def _segment_build(values, size, op, identity):
+    ufunc = _UFUNCS.get(op) if numpy is not None else None
+    if ufunc is not None and not isinstance(values, list) and isinstance(identity, (int, float)) and (
+            numpy.result_type(values, identity) == values.dtype):
+        tree = numpy.full(2 * size, identity, dtype=values.dtype)
+        tree[size:size + len(values)] = values
+        # One level at a time: the parents of level [2h, 4h) are [h, 2h)
+        half = size // 2
+        while half:
+            tree[half:2 * half] = ufunc(tree[2 * half:4 * half:2], tree[2 * half + 1:4 * half:2])
+            half //= 2
+        return tree.tolist()
+    tree = [identity] * (2 * size)
+    tree[size:size + len(values)] = values if isinstance(values, list) else values.tolist()
+    for k in range(size - 1, 0, -1):
+        tree[k] = op(tree[2 * k], tree[2 * k + 1])
+    return tree
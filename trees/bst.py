@@ -0,0 +1,286 @@
+# Binary Search Tree
+# Unbalanced binary search tree, and the base of AVLTree.
+# Every node also stores the height and the size (number of nodes) of its subtree.
+# Sizes give rank and select in O(height): the size of a left subtree is exactly
+# how many keys in that subtree are smaller.
+#
+# Insert and delete walk down iteratively and remember the path, then re-link it
+# from the bottom up, calling _rebalance on every node of the path. Here that only
+# updates heights and sizes; AVLTree overrides it to rotate.
+# Nothing recurses on the tree height, so even a degenerate tree (keys inserted in
+# sorted order) never hits the recursion limit.
+
+
+# One key/value entry with its subtree height and size.
+class Node:
+    __slots__ = ("key", "value", "left", "right", "height", "size")
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+
+
+def _height(node):
+    return node.height if node is not None else 0
+
+
+def _size(node):
+    return node.size if node is not None else 0
+
+
+# Recomputes a node's height and size from its children.
+def _update(node):
+    left, right = node.left, node.right
+    left_height = left.height if left is not None else 0
+    right_height = right.height if right is not None else 0
+    node.height = (left_height if left_height > right_height else right_height) + 1
+    node.size = (left.size if left is not None else 0) + (right.size if right is not None else 0) + 1
+
+
+class BinarySearchTree:
+    # Initializes an empty tree.
+    def __init__(self):
+        self.root = None
+
+    # Builds a balanced tree from (key, value) pairs sorted by strictly increasing key, in O(n).
+    # Raises ValueError if the keys are not strictly increasing.
+    @classmethod
+    def from_sorted(cls, items):
+        items = list(items)
+        for i in range(1, len(items)):
+            if not items[i - 1][0] < items[i][0]:
+                raise ValueError("Keys must be sorted and unique.")
+        tree = cls()
+        tree.root = _build(items, 0, len(items))
+        return tree
+
+    # Returns the number of keys.
+    def __len__(self):
+        return _size(self.root)
+
+    # Returns True if the key is in the tree.
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    # Iterates over the keys in ascending order.
+    def __iter__(self):
+        for key, _ in self.range():
+            yield key
+
+    # Returns the height of the tree (0 when empty).
+    def height(self):
+        return _height(self.root)
+
+    # Returns the node holding a key, or None.
+    def _find(self, key):
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    # Returns the value stored for a key, or default if the key is missing.
+    def get(self, key, default=None):
+        node = self._find(key)
+        return default if node is None else node.value
+
+    # Adds a key with a value, or replaces the value of an existing key.
+    # Returns True if the key was new.
+    def insert(self, key, value=None):
+        # Path entries are (node, True if we went left)
+        path = []
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                path.append((node, True))
+                node = node.left
+            elif node.key < key:
+                path.append((node, False))
+                node = node.right
+            else:
+                node.value = value
+                return False
+        self._relink(path, Node(key, value))
+        return True
+
+    # Removes a key and returns its value. Raises KeyError if the key is missing.
+    def delete(self, key):
+        path = []
+        node = self.root
+        while node is not None and (key < node.key or node.key < key):
+            went_left = key < node.key
+            path.append((node, went_left))
+            node = node.left if went_left else node.right
+        if node is None:
+            raise KeyError(key)
+        value = node.value
+        if node.left is not None and node.right is not None:
+            # Two children: move the successor (leftmost node on the right) up into this node
+            path.append((node, False))
+            successor = node.right
+            while successor.left is not None:
+                path.append((successor, True))
+                successor = successor.left
+            node.key, node.value = successor.key, successor.value
+            replacement = successor.right
+        else:
+            replacement = node.left if node.left is not None else node.right
+        self._relink(path, replacement)
+        return value
+
+    # Hangs child under the last node of the path, then fixes every node on the
+    # path from the bottom up, re-linking whatever subtree root _rebalance returns.
+    def _relink(self, path, child):
+        for node, went_left in reversed(path):
+            if went_left:
+                node.left = child
+            else:
+                node.right = child
+            child = self._rebalance(node)
+        self.root = child
+
+    # Fixes a node after one of its subtrees changed and returns the subtree's new root.
+    def _rebalance(self, node):
+        _update(node)
+        return node
+
+    # Removes every key.
+    def reset(self):
+        self.root = None
+
+    # Returns the largest key <= key, or None.
+    def floor(self, key):
+        best = None
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            else:
+                best = node
+                node = node.right
+        return None if best is None else best.key
+
+    # Returns the smallest key >= key, or None.
+    def ceiling(self, key):
+        best = None
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                node = node.right
+            else:
+                best = node
+                node = node.left
+        return None if best is None else best.key
+
+    # Returns the largest key < key, or None.
+    def predecessor(self, key):
+        best = None
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                best = node
+                node = node.right
+            else:
+                node = node.left
+        return None if best is None else best.key
+
+    # Returns the smallest key > key, or None.
+    def successor(self, key):
+        best = None
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                best = node
+                node = node.left
+            else:
+                node = node.right
+        return None if best is None else best.key
+
+    # Returns the number of keys < key.
+    def rank(self, key):
+        rank = 0
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                rank += _size(node.left) + 1
+                node = node.right
+            else:
+                return rank + _size(node.left)
+        return rank
+
+    # Returns the k-th smallest key (0-based; negative k counts from the end).
+    # Raises IndexError if k is out of range.
+    def select(self, k):
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("Index entered is out of bounds.")
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k > left_size:
+                k -= left_size + 1
+                node = node.right
+            else:
+                return node.key
+
+    # Yields (key, value) for every key with lo <= key < hi, in ascending order
+    # (descending if reverse). lo or hi may be None for no bound.
+    # Subtrees entirely outside the range are never visited, so a range of m keys
+    # costs O(height + m). The tree must not be modified during iteration.
+    def range(self, lo=None, hi=None, reverse=False):
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            if not reverse:
+                while node is not None:
+                    if lo is not None and node.key < lo:
+                        node = node.right
+                    else:
+                        stack.append(node)
+                        node = node.left
+                if not stack:
+                    return
+                node = stack.pop()
+                if hi is not None and not node.key < hi:
+                    return
+                yield node.key, node.value
+                node = node.right
+            else:
+                while node is not None:
+                    if hi is not None and not node.key < hi:
+                        node = node.left
+                    else:
+                        stack.append(node)
+                        node = node.right
+                if not stack:
+                    return
+                node = stack.pop()
+                if lo is not None and node.key < lo:
+                    return
+                yield node.key, node.value
+                node = node.left
+
+
+# Builds a balanced subtree from items[lo:hi]. Recursion depth is log2(n).
+def _build(items, lo, hi):
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    node = Node(*items[mid])
+    node.left = _build(items, lo, mid)
+    node.right = _build(items, mid + 1, hi)
+    _update(node)
+    return node
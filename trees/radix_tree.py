@@ -0,0 +1,295 @@
+# Radix Tree
+# Compressed trie for str or bytes keys: every edge is labelled with a whole run of
+# characters, so a chain of single-child nodes is stored as one node, and a tree of
+# n keys has at most 2n nodes. Prefix queries walk down the tree once, O(len(prefix)),
+# however many keys are stored, instead of checking every key.
+#
+# Each node keeps the label of the edge that leads to it, its value (or _NO_VALUE if
+# no key ends there), and its children packed in two parallel sequences:
+#   firsts   > the first character of every child's label, in sorted order (a str or bytes)
+#   children > the child nodes, in the same order (a list)
+# Finding a child is a firsts.find() in C, and the children are always in order, so
+# iteration yields keys in sorted order without sorting. Leaves have no firsts/children.
+import bisect
+import sys
+
+# Marks a node where no key ends (None is a valid value)
+_NO_VALUE = object()
+
+
+# One node: the label of its incoming edge, its value, and its packed children.
+class _Node:
+    __slots__ = ("label", "value", "firsts", "children")
+
+    def __init__(self, label, value=_NO_VALUE):
+        self.label = label
+        self.value = value
+        self.firsts = None
+        self.children = None
+
+    # Returns the child whose label starts with character c (a 1-item slice), or None.
+    def child(self, c):
+        if self.firsts:
+            i = self.firsts.find(c)
+            if i >= 0:
+                return self.children[i]
+        return None
+
+    # Adds a child, keeping firsts and children sorted.
+    def add_child(self, child):
+        c = child.label[:1]
+        if not self.firsts:
+            self.firsts = c
+            self.children = [child]
+            return
+        i = bisect.bisect_left(self.firsts, child.label[0])
+        self.firsts = self.firsts[:i] + c + self.firsts[i:]
+        self.children.insert(i, child)
+
+    # Removes the child at position i.
+    def remove_child(self, i):
+        del self.children[i]
+        if self.children:
+            self.firsts = self.firsts[:i] + self.firsts[i + 1:]
+        else:
+            self.firsts = self.children = None
+
+
+class RadixTree:
+    # Initializes the tree, optionally from a mapping (anything with items(), e.g. a dict
+    # or a HashTable) or from an iterable of keys (stored with the value None).
+    def __init__(self, items=None):
+        self.root = _Node(None)
+        self.count = 0
+        if items is not None:
+            pairs = items.items() if hasattr(items, "items") else ((key, None) for key in items)
+            for key, value in pairs:
+                self.insert(key, value)
+
+    # Returns the number of keys.
+    def __len__(self):
+        return self.count
+
+    # Returns True if the key is in the tree.
+    def __contains__(self, key):
+        node = self._find(key)
+        return node is not None and node.value is not _NO_VALUE
+
+    # Returns the value for a key. Raises KeyError if the key is missing.
+    def __getitem__(self, key):
+        node = self._find(key)
+        if node is None or node.value is _NO_VALUE:
+            raise KeyError(key)
+        return node.value
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    # Removes a key. Raises KeyError if the key is missing.
+    def __delitem__(self, key):
+        self.delete(key)
+
+    # Iterates over the keys in sorted order.
+    def __iter__(self):
+        return self.keys_with_prefix(self._empty())
+
+    # Return an unambiguous string representation of the RadixTree object.
+    def __repr__(self):
+        return f"RadixTree({self.count} keys)"
+
+    # Returns the value stored for a key, or default if the key is missing.
+    def get(self, key, default=None):
+        node = self._find(key)
+        if node is None or node.value is _NO_VALUE:
+            return default
+        return node.value
+
+    # Returns the node where key ends exactly, or None.
+    def _find(self, key):
+        node = self.root
+        pos = 0
+        while pos < len(key):
+            firsts = node.firsts
+            i = firsts.find(key[pos:pos + 1]) if firsts else -1
+            if i < 0:
+                return None
+            node = node.children[i]
+            if not key.startswith(node.label, pos):
+                return None
+            pos += len(node.label)
+        return node
+
+    # Adds a key with a value, or replaces the value of an existing key.
+    # Returns True if the key was new.
+    def insert(self, key, value=None):
+        node = self.root
+        pos = 0
+        while pos < len(key):
+            c = key[pos:pos + 1]
+            i = node.firsts.find(c) if node.firsts else -1
+            if i < 0:
+                node.add_child(_Node(key[pos:], value))
+                self.count += 1
+                return True
+            child = node.children[i]
+            label = child.label
+            if key.startswith(label, pos):
+                node = child
+                pos += len(label)
+                continue
+            # The key leaves the edge part-way: split it with a new node at the fork
+            common = _common_length(label, key, pos)
+            middle = _Node(label[:common])
+            child.label = label[common:]
+            middle.add_child(child)
+            node.children[i] = middle
+            node = middle
+            pos += common
+        is_new = node.value is _NO_VALUE
+        node.value = value
+        self.count += is_new
+        return is_new
+
+    # Removes a key and returns its value. Raises KeyError if the key is missing.
+    # Nodes left without a key and with a single child are merged back into one edge.
+    def delete(self, key):
+        # (parent, position of the child taken) for every step down
+        path = []
+        node = self.root
+        pos = 0
+        while pos < len(key):
+            c = key[pos:pos + 1]
+            child = node.child(c)
+            if child is None or not key.startswith(child.label, pos):
+                raise KeyError(key)
+            path.append((node, node.firsts.find(c)))
+            node = child
+            pos += len(child.label)
+        if node.value is _NO_VALUE:
+            raise KeyError(key)
+        value = node.value
+        node.value = _NO_VALUE
+        self.count -= 1
+        if path:
+            parent, i = path.pop()
+            if node.children is None:
+                parent.remove_child(i)
+                # The parent may now be a keyless node with one child
+                if path:
+                    self._merge(*path[-1])
+            else:
+                self._merge(parent, i)
+        return value
+
+    # Merges parent.children[i] with its only child if it has no key of its own.
+    def _merge(self, parent, i):
+        node = parent.children[i]
+        if node.value is _NO_VALUE and node.children is not None and len(node.children) == 1:
+            child = node.children[0]
+            child.label = node.label + child.label
+            parent.children[i] = child
+
+    # Yields (key, value) for every key that starts with prefix, in sorted order.
+    def items(self, prefix=None):
+        if prefix is None:
+            prefix = self._empty()
+        node = self.root
+        pos = 0
+        while pos < len(prefix):
+            node = node.child(prefix[pos:pos + 1])
+            if node is None:
+                return
+            label = node.label
+            if len(prefix) - pos <= len(label):
+                # The prefix ends inside (or at the end of) this edge
+                if not label.startswith(prefix[pos:]):
+                    return
+                yield from _walk(node, prefix[:pos] + label)
+                return
+            if not prefix.startswith(label, pos):
+                return
+            pos += len(label)
+        yield from _walk(node, prefix)
+
+    # Yields every key that starts with prefix, in sorted order.
+    def keys_with_prefix(self, prefix):
+        for key, _ in self.items(prefix):
+            yield key
+
+    # Returns (key, value) for the longest stored key that is a prefix of key
+    # (e.g. the most specific route for an address), or None.
+    def longest_prefix(self, key):
+        node = self.root
+        best = (key[:0], node.value) if node.value is not _NO_VALUE else None
+        pos = 0
+        while pos < len(key):
+            firsts = node.firsts
+            i = firsts.find(key[pos:pos + 1]) if firsts else -1
+            if i < 0:
+                break
+            node = node.children[i]
+            if not key.startswith(node.label, pos):
+                break
+            pos += len(node.label)
+            if node.value is not _NO_VALUE:
+                best = (key[:pos], node.value)
+        return best
+
+    # Return memory diagnostics: keys, nodes, label_chars, max_depth (in nodes below the root),
+    # bytes (nodes, labels and child arrays, without the stored values) and bytes_per_key.
+    def stats(self):
+        nodes = label_chars = max_depth = 0
+        size = 0
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            nodes += 1
+            max_depth = max(max_depth, depth)
+            size += sys.getsizeof(node)
+            if node.label is not None:
+                label_chars += len(node.label)
+                size += sys.getsizeof(node.label)
+            if node.children is not None:
+                size += sys.getsizeof(node.firsts) + sys.getsizeof(node.children)
+                stack.extend((child, depth + 1) for child in node.children)
+        return {
+            "keys": self.count,
+            "nodes": nodes,
+            "label_chars": label_chars,
+            "max_depth": max_depth,
+            "bytes": size,
+            "bytes_per_key": size / self.count if self.count else 0.0,
+        }
+
+    # Removes every key.
+    def reset(self):
+        self.root = _Node(None)
+        self.count = 0
+
+    # Empty key of the type stored in the tree ("" unless the keys are bytes).
+    def _empty(self):
+        if self.root.firsts is not None:
+            return self.root.firsts[:0]
+        return ""
+
+
+# Number of leading characters label shares with key[pos:]. The first one is known to match.
+def _common_length(label, key, pos):
+    limit = min(len(label), len(key) - pos)
+    i = 1
+    while i < limit and label[i] == key[pos + i]:
+        i += 1
+    return i
+
+
+# Yields (key, value) for every key in the subtree of node, in sorted order.
+# key is the full key that ends at node. Uses an explicit stack (depth-first, pre-order).
+def _walk(node, key):
+    stack = [(node, key)]
+    while stack:
+        node, key = stack.pop()
+        if node.value is not _NO_VALUE:
+            yield key, node.value
+        if node.children is not None:
+            for child in reversed(node.children):
+                stack.append((child, key + child.label))
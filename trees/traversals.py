@@ -0,0 +1,121 @@
+# Tree Traversals
+# Lazy, recursion-free traversals of binary trees (trees/binary_tree.py nodes, or any
+# node with left and right attributes). Every function is a generator that yields nodes.
+#   inorder        > left, node, right (sorted order in a search tree); reverse and start options
+#   preorder       > node, left, right
+#   postorder      > left, right, node
+#   level_order    > top to bottom, left to right
+#   morris_inorder > in-order with O(1) extra memory
+#
+# The depth-first traversals keep an explicit stack of at most height nodes, so deep or
+# degenerate trees never hit Python's recursion limit, and nothing is collected up front:
+# the caller can stop at any point. level_order holds at most two levels of the tree.
+
+
+def inorder(root, start=None, reverse=False):
+    # Yields nodes in in-order (ascending keys in a search tree), or the mirror order if reverse.
+    # start: only for search trees. Begin at the first node with key >= start
+    # (key <= start when reverse), skipping everything before it in O(height).
+    near, far = ("left", "right") if not reverse else ("right", "left")
+    stack = []
+    node = root
+    if start is not None:
+        # Keep only the ancestors whose own key is still inside the bound: they are
+        # exactly the nodes that come after the starting point
+        while node is not None:
+            if (node.key < start) if not reverse else (start < node.key):
+                node = getattr(node, far)
+            else:
+                stack.append(node)
+                node = getattr(node, near)
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = getattr(node, near)
+        node = stack.pop()
+        yield node
+        node = getattr(node, far)
+
+
+def preorder(root):
+    # Yields every node before its children (left subtree first).
+    if root is None:
+        return
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        # Right is pushed first so that left comes out first
+        if node.right is not None:
+            stack.append(node.right)
+        if node.left is not None:
+            stack.append(node.left)
+
+
+def postorder(root):
+    # Yields every node after both of its children.
+    stack = []
+    node = root
+    # The node yielded last: when it is the right child of the top of the stack,
+    # the right subtree is finished
+    last = None
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        top = stack[-1]
+        if top.right is not None and top.right is not last:
+            node = top.right
+        else:
+            last = stack.pop()
+            yield last
+
+
+def level_order(root):
+    # Yields nodes level by level from the root, left to right within a level.
+    # Like bfs_layers in graphs/bfs_dfs.py, it keeps one frontier list per level.
+    level = [root] if root is not None else []
+    while level:
+        yield from level
+        level = [child for node in level for child in (node.left, node.right) if child is not None]
+
+
+def morris_inorder(root, reverse=False):
+    # Yields nodes in in-order (mirror order if reverse) using O(1) extra memory.
+    # Instead of a stack, the rightmost node of each left subtree temporarily points back
+    # to the node above it (a thread), and the thread is removed on the second visit.
+    # Each edge is walked at most three times, so the traversal is still O(n).
+    # The tree is modified while the generator runs: it must not be read or changed elsewhere
+    # until the generator finishes. Stopping early (break, close()) finishes the walk
+    # without yielding, so every thread is removed.
+    walk = _morris_walk(root, reverse)
+    try:
+        for node in walk:
+            yield node
+    finally:
+        for _ in walk:
+            pass
+
+
+def _morris_walk(root, reverse):
+    near, far = ("left", "right") if not reverse else ("right", "left")
+    node = root
+    while node is not None:
+        child = getattr(node, near)
+        if child is None:
+            yield node
+            node = getattr(node, far)
+            continue
+        # Rightmost node of the left subtree (leftmost of the right one if reverse)
+        previous = child
+        while getattr(previous, far) is not None and getattr(previous, far) is not node:
+            previous = getattr(previous, far)
+        if getattr(previous, far) is None:
+            # First visit: thread back to node and descend
+            setattr(previous, far, node)
+            node = child
+        else:
+            # Second visit: the left subtree is done, remove the thread
+            setattr(previous, far, None)
+            yield node
+            node = getattr(node, far)